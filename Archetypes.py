@@ -0,0 +1,182 @@
+#librairies
+import json
+import time
+from math import isfinite
+import numpy as np
+
+ARCHETYPES_FILE = "ressources/archetypes.json" # types de monstres et d'armes du jeu
+MONSTER_STATS = { # statistiques d'un type de monstre et leur contrainte
+    'health': lambda value: value > 0,
+    'speed': lambda value: value >= 0,
+    'attack_power': lambda value: value >= 0,
+    'attack_range': lambda value: value > 0,
+    'xp_value': lambda value: value >= 0,
+    'reload': lambda value: value > 0,
+    'size': lambda value: value > 0,
+    'gravity': lambda value: value <= 0,
+}
+WEAPON_STATS = { # statistiques d'un type d'arme et leur contrainte
+    'degats': lambda value: value >= 0,
+    'range': lambda value: value > 0,
+    'cooldown': lambda value: value > 0,
+}
+WEAPON_TEXTS = ('name', 'description') # textes d'un type d'arme
+
+
+class ArchetypeError(ValueError):
+    """Fichier des types invalide : toutes les erreurs trouvées, une par ligne."""
+
+
+class MonsterArchetype():
+    """Statistiques d'un type de monstre, partagées par tous ses monstres (un monstre n'en garde qu'une référence)."""
+    __slots__ = ('name', 'index') + tuple(MONSTER_STATS)
+
+    def __init__(self, name, index, stats):
+        """Initialisation du type.
+        Args:
+            name (str): nom du type
+            index (int): ligne du type dans la table compilée (Registry.table)
+            stats (dict): statistiques validées (MONSTER_STATS)
+        Returns:
+            None
+        """
+        self.name = name # nom du type
+        self.index = index # ligne dans la table compilée
+        for stat in MONSTER_STATS:
+            setattr(self, stat, stats[stat])
+
+
+class WeaponArchetype():
+    """Statistiques d'un type d'arme, partagées par toutes les armes de ce type."""
+    __slots__ = ('key',) + WEAPON_TEXTS + tuple(WEAPON_STATS)
+
+    def __init__(self, key, stats):
+        """Initialisation du type.
+        Args:
+            key (str): identifiant du type dans le fichier
+            stats (dict): nom, description et statistiques validés
+        Returns:
+            None
+        """
+        self.key = key # identifiant du type
+        for stat in WEAPON_TEXTS + tuple(WEAPON_STATS):
+            setattr(self, stat, stats[stat])
+
+
+class ArchetypeField():
+    """Statistique d'un monstre lue dans son type (monster.archetype), en lecture seule."""
+    def __init__(self, name):
+        self.name = name # nom de la statistique dans le type
+
+    def __get__(self, monster, owner=None):
+        if monster is None:
+            return self
+        return getattr(monster.archetype, self.name)
+
+    def __set__(self, monster, value):
+        raise AttributeError(f"{self.name} est une statistique du type {monster.archetype.name}, partagée par ses monstres")
+
+
+class Registry():
+    """Types de monstres et d'armes lus dans un fichier JSON au lancement, validés une seule fois.
+    Chaque type devient un enregistrement partagé (__slots__) ; les statistiques des monstres sont aussi compilées
+    dans une table numpy (une ligne par type) lue par MonsterHorde avec le numéro de type de chaque monstre.
+    """
+    def __init__(self, path=ARCHETYPES_FILE):
+        """Chargement et validation du fichier.
+        Args:
+            path (str): fichier JSON {"monsters": {nom: statistiques}, "weapons": {identifiant: statistiques}}
+        Returns:
+            None
+        """
+        start = time.perf_counter()
+        with open(path, encoding='utf-8') as file:
+            data = json.load(file)
+        self.load(data)
+        self.parse_time = time.perf_counter() - start # lecture, validation et compilation (s)
+
+    def load(self, data):
+        """Valide tous les types puis les compile ; une seule ArchetypeError liste toutes les erreurs.
+        Args:
+            data (dict): contenu du fichier
+        Returns:
+            None
+        """
+        errors = []
+        if not isinstance(data, dict) or set(data) - {'monsters', 'weapons'}:
+            raise ArchetypeError("le fichier doit contenir seulement les sections 'monsters' et 'weapons'")
+        monsters = self.validate(data.get('monsters', {}), MONSTER_STATS, (), 'monstre', errors)
+        weapons = self.validate(data.get('weapons', {}), WEAPON_STATS, WEAPON_TEXTS, 'arme', errors)
+        if not monsters and not errors:
+            errors.append("aucun type de monstre")
+        if errors:
+            raise ArchetypeError("\n".join(errors))
+        self.monsters = {name: MonsterArchetype(name, index, stats) for index, (name, stats) in enumerate(monsters.items())}
+        self.weapons = {key: WeaponArchetype(key, stats) for key, stats in weapons.items()}
+        self.table = np.zeros(len(self.monsters), dtype=[(stat, np.float64) for stat in MONSTER_STATS]) # une ligne par type
+        for archetype in self.monsters.values():
+            self.table[archetype.index] = tuple(getattr(archetype, stat) for stat in MONSTER_STATS)
+
+    def validate(self, section, stats, texts, kind, errors):
+        """Vérifie les types d'une section : champs connus, tous présents, nombres finis dans leurs limites.
+        Args:
+            section (dict): types de la section, par nom
+            stats (dict): statistiques numériques et leur contrainte
+            texts (tuple): champs texte
+            kind (str): 'monstre' ou 'arme', pour les messages
+            errors (list): erreurs trouvées, complétée
+        Returns:
+            dict: types sans erreur, par nom
+        """
+        if not isinstance(section, dict):
+            errors.append(f"les types de {kind} doivent être un objet {{nom: statistiques}}")
+            return {}
+        valid = {}
+        for name, fields in section.items():
+            if not isinstance(fields, dict):
+                errors.append(f"{kind} {name} : les statistiques doivent être un objet")
+                continue
+            found = len(errors)
+            for field in sorted(set(fields) - set(stats) - set(texts)):
+                errors.append(f"{kind} {name} : champ inconnu {field}")
+            for field in texts + tuple(stats):
+                if field not in fields:
+                    errors.append(f"{kind} {name} : {field} manquant")
+            for field in texts:
+                if field in fields and not isinstance(fields[field], str):
+                    errors.append(f"{kind} {name} : {field} doit être un texte")
+            for field, allowed in stats.items():
+                if field not in fields:
+                    continue
+                value = fields[field]
+                if isinstance(value, bool) or not isinstance(value, (int, float)) or not isfinite(value):
+                    errors.append(f"{kind} {name} : {field} doit être un nombre, pas {value!r}")
+                elif not allowed(value):
+                    errors.append(f"{kind} {name} : {field} = {value} hors des valeurs permises")
+            if len(errors) == found:
+                valid[name] = fields
+        return valid
+
+    def monster(self, name):
+        """Type de monstre par son nom.
+        Args:
+            name (str): nom du type
+        Returns:
+            MonsterArchetype: type partagé
+        """
+        try:
+            return self.monsters[name]
+        except KeyError:
+            raise KeyError(f"type de monstre inconnu : {name} (types : {', '.join(self.monsters)})") from None
+
+    def weapon(self, key):
+        """Type d'arme par son identifiant.
+        Args:
+            key (str): identifiant du type
+        Returns:
+            WeaponArchetype: type partagé
+        """
+        try:
+            return self.weapons[key]
+        except KeyError:
+            raise KeyError(f"type d'arme inconnu : {key} (types : {', '.join(self.weapons)})") from None
@@ -0,0 +1,227 @@
+#librairies
+import hashlib
+import json
+import os
+
+#librairies panda3d
+from panda3d.core import Filename, NodePath, BamFile, BamWriter, PandaSystem
+
+FORMAT_VERSION = 1 # à incrémenter quand le format des fichiers du cache change
+
+ASSETS = { # modèles du jeu, préchargés avant la partie
+    'grassBlock': 'model3d/grass-block.glb',
+    'dirtBlock': 'model3d/dirt-block.glb',
+    'stoneBlock': 'model3d/stone-block.glb',
+    'sandBlock': 'model3d/sand-block.glb',
+    'monster': 'model3d/monsterCarton.glb',
+    'skybox': 'skybox/skybox.egg',
+}
+
+
+class AssetManager():
+    """Chargement des modèles du jeu : préchargement asynchrone, cache .bam sur disque et copies partagées.
+    Chaque modèle (.glb, .egg) est converti une fois en .bam avec ses textures ; l'entrée du cache est
+    périmée quand le modèle ou une de ses textures change (date de modification, puis contenu).
+    """
+    def __init__(self, loader, directory="ressources/cache/models"):
+        """Initialisation du gestionnaire.
+        Args:
+            loader (Loader): loader de Panda3D
+            directory (str): dossier du cache
+        Returns:
+            None
+        """
+        self.loader = loader # loader de Panda3D
+        self.directory = directory # dossier du cache
+        self.models = {} # modèles chargés, par nom
+        self.pending = {} # modèles en cours de chargement asynchrone, par nom
+        self.failed = {} # modèles qui n'ont pas pu être chargés au dernier préchargement, fichier par nom
+        self.hits = 0 # modèles lus depuis le cache
+        self.misses = 0 # modèles convertis depuis le fichier source
+
+    def key(self, path):
+        """Clé d'un modèle dans le cache (chemin source, version du cache et de Panda3D)."""
+        text = f"{path}|{FORMAT_VERSION}|{PandaSystem.getVersionString()}"
+        return hashlib.sha1(text.encode()).hexdigest()[:20]
+
+    def cachePath(self, path, extension):
+        """Chemin d'un fichier du cache pour un modèle."""
+        return os.path.join(self.directory, f"{self.key(path)}.{extension}")
+
+    def isCached(self, path):
+        """Vérifie qu'un modèle a une entrée valide dans le cache.
+        Les fichiers dont la date a changé sont comparés par leur contenu : une date modifiée
+        sans changement de contenu (copie, checkout git) ne force pas une nouvelle conversion.
+        Args:
+            path (str): modèle source
+        Returns:
+            bool: True si le .bam du cache peut être chargé
+        """
+        try:
+            with open(self.cachePath(path, 'json')) as file:
+                meta = json.load(file)
+        except (OSError, ValueError):
+            return False
+        if meta.get('format_version') != FORMAT_VERSION or not os.path.exists(self.cachePath(path, 'bam')):
+            return False
+        changed = False
+        for source in meta['sources']:
+            stamp = fileStamp(source['path'])
+            if stamp is None:
+                return False
+            if stamp != source['stamp']:
+                if stamp[1] != source['stamp'][1] or fileHash(source['path']) != source['sha1']:
+                    return False # contenu modifié
+                source['stamp'] = stamp # même contenu : seule la date a changé
+                changed = True
+        if changed:
+            self.writeMeta(path, meta)
+        return True
+
+    def load(self, name):
+        """Charge un modèle tout de suite (depuis le cache si possible).
+        Args:
+            name (str): nom du modèle dans ASSETS
+        Returns:
+            NodePath: modèle partagé
+        """
+        if name not in self.models:
+            path = ASSETS[name]
+            if self.isCached(path):
+                self.store(name, self.loader.loadModel(self.bamFilename(path), noCache=True), False)
+            else:
+                self.store(name, self.loader.loadModel(path, noCache=True), True)
+        return self.models[name]
+
+    def preload(self, names=None, callback=None, progress=None):
+        """Charge des modèles en arrière-plan (thread de chargement de Panda3D).
+        Args:
+            names (list): noms des modèles, tous ceux de ASSETS par défaut
+            callback (function): appelée quand tous les chargements sont terminés, avec self.failed
+                (modèles qui n'ont pas pu être chargés, vide si tout est chargé) ; c'est elle qui décide d'abandonner
+            progress (function): appelée avec (chargés, total) après chaque modèle
+        Returns:
+            None
+        """
+        names = [name for name in (names or ASSETS) if name not in self.models]
+        total = len(names)
+        self.failed = {}
+        if total == 0:
+            if callback is not None:
+                callback(self.failed)
+            return
+
+        def request(name, convert):
+            """Lance le chargement asynchrone d'un modèle, depuis le cache ou depuis son fichier source."""
+            path = ASSETS[name]
+            source = path if convert else self.bamFilename(path)
+            self.pending[name] = self.loader.loadModel(source, noCache=True,
+                                                       callback=lambda model: done(name, convert, model))
+
+        def done(name, convert, model):
+            """Fin du chargement d'un modèle (appelée dans le thread principal) : une erreur est notée, pas levée."""
+            del self.pending[name]
+            if model is None and not convert:
+                request(name, True) # .bam du cache illisible : on repart du fichier source
+                return
+            if model is None:
+                self.failed[name] = ASSETS[name]
+            else:
+                self.store(name, model, convert)
+            if progress is not None:
+                progress(total - len(self.pending), total)
+            if not self.pending and callback is not None:
+                callback(self.failed)
+
+        for name in names:
+            request(name, not self.isCached(ASSETS[name]))
+
+    def store(self, name, model, convert):
+        """Garde un modèle chargé et l'écrit dans le cache s'il vient du fichier source.
+        Args:
+            name (str): nom du modèle
+            model (NodePath): modèle chargé
+            convert (bool): True si le modèle vient du fichier source
+        Returns:
+            None
+        """
+        path = ASSETS[name]
+        if convert:
+            self.misses += 1
+            self.save(path, model)
+        else:
+            self.hits += 1
+        model.node().setFullpath(Filename(path)) # chemin du modèle source, pas du .bam
+        self.models[name] = model
+
+    def save(self, path, model):
+        """Écrit un modèle et ses textures (données brutes) dans le cache.
+        Args:
+            path (str): modèle source
+            model (NodePath): modèle chargé depuis le fichier source
+        Returns:
+            None
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        temporary = self.cachePath(path, 'tmp.bam') # l'extension .bam est nécessaire à BamFile
+        bam = BamFile()
+        if not bam.openWrite(Filename.fromOsSpecific(os.path.abspath(temporary))):
+            return
+        bam.getWriter().setFileTextureMode(BamWriter.BTM_rawdata) # textures décodées : plus de PNG à relire
+        bam.writeObject(model.node())
+        bam.close()
+        os.replace(temporary, self.cachePath(path, 'bam')) # écriture atomique
+
+        sources = [path] + sorted({texture.getFullpath().toOsSpecific() for texture in model.findAllTextures()
+                                   if not texture.getFullpath().empty()}) # le modèle et ses textures
+        self.writeMeta(path, {
+            'format_version': FORMAT_VERSION,
+            'sources': [{'path': source, 'stamp': fileStamp(source), 'sha1': fileHash(source)} for source in sources],
+        })
+
+    def writeMeta(self, path, meta):
+        """Écrit la description d'une entrée à côté de son .bam."""
+        with open(self.cachePath(path, 'json'), 'w') as file:
+            json.dump(meta, file)
+
+    def bamFilename(self, path):
+        """Filename Panda3D du .bam d'un modèle."""
+        return Filename.fromOsSpecific(os.path.abspath(self.cachePath(path, 'bam')))
+
+    def get(self, name):
+        """Copie d'un modèle, qui partage ses Geoms et textures avec l'original.
+        Args:
+            name (str): nom du modèle dans ASSETS
+        Returns:
+            NodePath: copie du modèle, sans parent
+        """
+        copy = self.load(name).copyTo(NodePath('assets'))
+        copy.detachNode()
+        return copy
+
+    def shared(self, name):
+        """Modèle partagé lui-même, à ne pas modifier (Actor en fait sa propre copie).
+        Args:
+            name (str): nom du modèle dans ASSETS
+        Returns:
+            NodePath: modèle partagé
+        """
+        return self.load(name)
+
+
+def fileStamp(path):
+    """Date de modification et taille d'un fichier, None s'il n'existe pas."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def fileHash(path):
+    """Empreinte sha1 du contenu d'un fichier."""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
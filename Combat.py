@@ -0,0 +1,145 @@
+#librairies
+from collections import deque
+
+import Scheduler
+
+EVENTS = ('attack', 'hit', 'damage', 'death', 'score', 'despawn') # types d'événements du combat
+
+
+class Combat():
+    """Résolution du combat par événements plutôt qu'en regardant chaque frame l'état de tout le monde.
+    Pendant le pas, joueur, monstres et vagues postent des événements (attaque, coup, dégâts, mort, score, disparition) ;
+    flush les traite à la fin du pas, puis retire et ajoute les monstres de game.monsters en une seule fois.
+    Recharges et cooldowns sont des minuteries de l'ordonnanceur.
+    """
+    def __init__(self, game):
+        """Initialisation du combat.
+        Args:
+            game (Game): reference vers la classe principale
+        Returns:
+            None
+        """
+        self.game = game # référence vers la partie
+        self.scheduler = Scheduler.Scheduler() # minuteries
+        self.events = deque() # événements pas encore traités : (type, arguments)
+        self.handlers = {'attack': self.onAttack, 'hit': self.onHit, 'damage': self.onDamage, 'death': self.onDeath,
+                         'score': self.onScore, 'despawn': self.onDespawn} # traitement de chaque type
+        self.counts = dict.fromkeys(EVENTS, 0) # événements traités par type
+        self.spawned = [] # monstres à ajouter à game.monsters à la fin du pas
+        self.despawned = [] # monstres à retirer de game.monsters à la fin du pas
+
+    def post(self, kind, *args):
+        """Ajoute un événement, traité à la fin du pas.
+        Args:
+            kind (str): type d'événement (EVENTS)
+            *args: arguments de l'événement
+        Returns:
+            None
+        """
+        self.events.append((kind, args))
+
+    def advance(self, dt):
+        """Début d'un pas : avance les minuteries.
+        Args:
+            dt (float): durée du pas de simulation
+        Returns:
+            None
+        """
+        self.scheduler.advance(dt)
+
+    def spawn(self, monster):
+        """Ajoute un monstre à game.monsters à la fin du pas.
+        Args:
+            monster (Monster): monstre déjà placé (MonsterPool.acquire)
+        Returns:
+            None
+        """
+        self.spawned.append(monster)
+
+    def flush(self):
+        """Fin d'un pas : traite tous les événements (y compris ceux qu'ils postent), puis met à jour game.monsters.
+        Args:
+            None
+        Returns:
+            None
+        """
+        events, handlers, counts = self.events, self.handlers, self.counts
+        while events:
+            kind, args = events.popleft()
+            counts[kind] += 1
+            handlers[kind](*args)
+        if self.despawned:
+            removed = set(self.despawned)
+            self.game.monsters[:] = [monster for monster in self.game.monsters if monster not in removed]
+            for monster in sorted(self.despawned, key=lambda monster: monster.slot): # ordre fixe, pour des parties identiques
+                self.game.monsterPool.release(monster) # ranger le monstre pour un prochain spawn
+            self.despawned.clear()
+        if self.spawned:
+            self.game.monsters.extend(self.spawned)
+            self.spawned.clear()
+        self.game.hud.set('monsters', len(self.game.monsters)) # ignoré par le HUD si le nombre n'a pas changé
+
+    def startReload(self, monster):
+        """Le monstre vient d'attaquer : il pourra réattaquer après sa recharge.
+        Args:
+            monster (Monster): monstre
+        Returns:
+            None
+        """
+        monster.is_attacking = True
+        monster.reloadTimer = self.scheduler.schedule(monster.initialTimeToReload, self.reloaded, monster)
+
+    def reloaded(self, monster):
+        """Fin de la recharge d'un monstre."""
+        monster.reloadTimer = None
+        monster.is_attacking = False
+
+    def cancelTimers(self, monster):
+        """Annule la recharge d'un monstre qui quitte le jeu (il peut revenir du MonsterPool avant l'échéance)."""
+        if monster.reloadTimer is not None:
+            self.scheduler.cancel(monster.reloadTimer)
+            monster.reloadTimer = None
+
+    def onAttack(self, player):
+        """Le joueur frappe : un coup pour chaque monstre à portée, puis cooldown de l'arme."""
+        targets = player.getTargets()
+        for monster in targets:
+            self.post('hit', player, monster)
+        if targets:
+            player.is_attacking = True
+            self.scheduler.schedule(player.getCooldown(), player.endAttack)
+
+    def onHit(self, attacker, target):
+        """Un coup touche sa cible : dégâts du joueur (son arme) ou du monstre."""
+        if target is self.game.player:
+            self.post('damage', target, attacker.attack_power)
+        elif target in self.game.monsterGrid: # monstre toujours en jeu
+            self.post('damage', target, attacker.getDamage())
+
+    def onDamage(self, target, amount):
+        """Dégâts sur le joueur ou un monstre ; mort quand la vie tombe à 0."""
+        if target is self.game.player:
+            target.health -= amount
+            self.game.hud.set('health', target.health) # barre de vie redimensionnée à la fin de la frame
+            if target.health <= 0 and not target.is_dead:
+                target.died()
+        elif target.is_alive:
+            target.changeHealth(amount)
+            if target.isDead():
+                target.is_alive = False # plus mis à jour par la horde
+                self.post('death', target)
+
+    def onDeath(self, monster):
+        """Mort d'un monstre : points pour le joueur et retrait du jeu."""
+        self.game.hud.set('kills', self.counts['death'])
+        self.post('score', 100)
+        self.post('despawn', monster)
+
+    def onScore(self, points):
+        """Points gagnés par le joueur."""
+        self.game.GameManager.score += points
+        self.game.hud.set('score', self.game.GameManager.score)
+
+    def onDespawn(self, monster):
+        """Retrait d'un monstre du jeu, appliqué avec les autres à la fin de flush."""
+        self.despawned.append(monster)
@@ -0,0 +1,165 @@
+#librairies
+from math import ceil, degrees, atan2, sqrt
+import numpy as np
+
+DIRECTIONS = ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1)) # 8 voisins d'une cellule
+
+
+class FlowField():
+    """Champ de directions vers le joueur sur la grille des hauteurs du terrain, partagé par tous les monstres.
+    Le coût de chaque cellule jusqu'à la cellule du joueur (Dijkstra sur la grille, par relaxations successives
+    de toute la grille avec numpy) n'est recalculé que quand le joueur change de cellule, quelques relaxations
+    par pas de simulation : le champ précédent sert en attendant. Un monstre lit sa direction dans la grille (O(1)).
+    Un déplacement vers une cellule voisine n'est possible que si elle est au plus step_limit blocs plus haut.
+    """
+    def __init__(self, terrain, step_limit=1, iterations=20):
+        """Initialisation du champ.
+        Args:
+            terrain (Terrain): terrain (grille surfaceGrid, hors monde infini)
+            step_limit (int): hauteur maximale (en blocs) d'une marche qu'un monstre peut monter
+            iterations (int): relaxations au plus par pas de simulation
+        Returns:
+            None
+        """
+        self.terrain = terrain # référence vers le terrain
+        self.block_size = terrain.block_size # côté d'une cellule
+        self.iterations = iterations # relaxations au plus par pas
+        self.direct_radius = 2 * self.block_size # plus près du joueur, les monstres vont tout droit vers lui
+        levels = terrain.surfaceGrid # niveaux de surface, indexés par [x, y] de cellule
+        width, length = levels.shape
+        self.shape = levels.shape # taille de la grille
+
+        # coût de chaque déplacement d'une cellule vers son voisin, infini si la marche est trop haute
+        padded = np.full((width + 2, length + 2), np.iinfo(np.int32).max // 2, dtype=np.int64) # bord infranchissable
+        padded[1:-1, 1:-1] = levels
+        step = step_limit * self.block_size
+        allowed = [padded[1 + dx:width + 1 + dx, 1 + dy:length + 1 + dy] - levels <= step for dx, dy in DIRECTIONS]
+        for i, (dx, dy) in enumerate(DIRECTIONS):
+            if dx and dy: # en diagonale, pas de coin coupé : les deux voisins droits doivent être accessibles
+                allowed[i] = allowed[i] & allowed[DIRECTIONS.index((dx, 0))] & allowed[DIRECTIONS.index((0, dy))]
+        self.weights = [np.where(ok, sqrt(dx * dx + dy * dy), np.inf).astype(np.float32)
+                        for ok, (dx, dy) in zip(allowed, DIRECTIONS)]
+        self.angles = np.array([degrees(atan2(dy, dx)) for dx, dy in DIRECTIONS]) # direction de chaque voisin
+
+        # calcul en cours : coûts avec une bordure infinie, vues décalées vers chaque voisin
+        self.cost = np.full((width + 2, length + 2), np.inf, dtype=np.float32)
+        self.inner = self.cost[1:-1, 1:-1]
+        self.views = [self.cost[1 + dx:width + 1 + dx, 1 + dy:length + 1 + dy] for dx, dy in DIRECTIONS]
+        self.best = np.empty(self.shape, dtype=np.float32)
+        self.candidate = np.empty(self.shape, dtype=np.float32)
+        self.target = None # cellule du joueur du calcul en cours
+        self.converged = True # calcul en cours terminé
+
+        # dernier champ terminé, lu par les monstres
+        self.goal = None # cellule du joueur
+        self.distance = np.full(self.shape, np.inf, dtype=np.float32) # coût de chaque cellule jusqu'au joueur
+        self.heading = np.full(self.shape, np.nan) # direction de chaque cellule (degrés), NaN : aller tout droit
+        self.recomputes = 0 # champs terminés
+        self.relaxations = 0 # relaxations de la grille depuis le début
+
+    def cellAt(self, x, y):
+        """Cellule de la grille contenant une position (comme Terrain.getSurfaceLevel)."""
+        return (ceil(x / self.block_size), ceil(y / self.block_size))
+
+    def isInside(self, cell):
+        """La cellule est-elle dans la grille ?"""
+        return 0 <= cell[0] < self.shape[0] and 0 <= cell[1] < self.shape[1]
+
+    def update(self, x, y):
+        """Suit le joueur : nouveau calcul quand il change de cellule, puis quelques relaxations par pas.
+        Args:
+            x (float): position x du joueur
+            y (float): position y du joueur
+        Returns:
+            None
+        """
+        cell = self.cellAt(x, y)
+        if cell != self.target and self.isInside(cell):
+            self.retarget(cell)
+        if not self.converged:
+            self.relax()
+
+    def retarget(self, cell):
+        """Démarre le calcul vers une nouvelle cellule du joueur.
+        Les coûts en cours restent des majorants si le joueur est passé à une cellule voisine accessible :
+        aller à l'ancienne cellule puis à la nouvelle. Sinon le calcul repart de zéro.
+        Args:
+            cell (tuple): nouvelle cellule du joueur
+        Returns:
+            None
+        """
+        previous = self.target
+        move = None if previous is None else (cell[0] - previous[0], cell[1] - previous[1])
+        if move in DIRECTIONS and np.isfinite(self.weights[DIRECTIONS.index(move)][previous]):
+            self.inner += self.weights[DIRECTIONS.index(move)][previous]
+        else:
+            self.inner.fill(np.inf)
+        self.inner[cell] = 0
+        self.target = cell
+        self.converged = False
+
+    def relax(self):
+        """Au plus self.iterations relaxations ; le champ des directions est publié quand les coûts ne bougent plus.
+        Args:
+            None
+        Returns:
+            None
+        """
+        best, candidate = self.best, self.candidate
+        for _ in range(self.iterations):
+            best[:] = self.inner
+            for view, weight in zip(self.views, self.weights):
+                np.add(view, weight, out=candidate)
+                np.minimum(best, candidate, out=best)
+            self.relaxations += 1
+            if np.array_equal(best, self.inner):
+                self.converged = True
+                self.publish()
+                return
+            self.inner[:] = best
+
+    def publish(self):
+        """Calcule la direction de chaque cellule (vers le voisin le moins coûteux) à partir des coûts terminés.
+        Args:
+            None
+        Returns:
+            None
+        """
+        through = np.stack([view + weight for view, weight in zip(self.views, self.weights)]) # coût en passant par chaque voisin
+        choice = np.argmin(through, axis=0)
+        heading = self.angles[choice]
+        heading[~np.isfinite(np.min(through, axis=0))] = np.nan # aucun chemin : tout droit vers le joueur
+        heading[self.target] = np.nan # dans la cellule du joueur : tout droit vers lui
+        self.heading = heading
+        self.distance = self.inner.copy()
+        self.goal = self.target
+        self.recomputes += 1
+
+    def headings(self, xs, ys):
+        """Directions des monstres à ces positions, une lecture dans la grille par monstre.
+        Args:
+            xs (np.ndarray): positions x
+            ys (np.ndarray): positions y
+        Returns:
+            np.ndarray: directions en degrés, NaN hors de la grille, sans chemin ou dans la cellule du joueur
+        """
+        cells_x = np.ceil(np.asarray(xs, dtype=np.float64) / self.block_size).astype(np.int64)
+        cells_y = np.ceil(np.asarray(ys, dtype=np.float64) / self.block_size).astype(np.int64)
+        inside = (cells_x >= 0) & (cells_x < self.shape[0]) & (cells_y >= 0) & (cells_y < self.shape[1])
+        result = np.full(cells_x.shape, np.nan)
+        result[inside] = self.heading[cells_x[inside], cells_y[inside]]
+        return result
+
+    def headingAt(self, x, y):
+        """Direction d'un monstre à une position.
+        Args:
+            x (float): position x
+            y (float): position y
+        Returns:
+            float: direction en degrés, None hors de la grille, sans chemin ou dans la cellule du joueur
+        """
+        cell = self.cellAt(x, y)
+        if not self.isInside(cell):
+            return None
+        heading = self.heading[cell]
+        return None if np.isnan(heading) else float(heading)
@@ -2,6 +2,18 @@
 import Player, GameManager
 import Terrain
 import Weapon
+import Archetypes
+import SpatialHash
+import MonsterHorde
+import MonsterRenderer
+import MonsterPool
+import FlowField
+import SimulationClock
+import Combat
+import PlayerPhysics
+import Replay
+import Profiler
+import HUD
 import random
 
 #librairies
@@ -13,10 +25,20 @@ from panda3d.core import DirectionalLight, AmbientLight
 from panda3d.core  import CollisionTraverser, CollisionHandlerQueue
 from panda3d.core  import CollisionHandlerPusher, BitMask32
 from pandac.PandaModules import ClockObject
-FPS = 30
+FPS = 0 # limite du rendu en images par seconde, 0 : pas de limite (ou vsync)
+TICK_RATE = 30 # pas de simulation par seconde, indépendants du rendu
+MAX_CATCH_UP_STEPS = 5 # pas de simulation au plus par frame pour rattraper un ralentissement
+STREAMING_TERRAIN = False # monde infini généré autour du joueur
+INSTANCED_MONSTERS = True # monstres dessinés en instances d'un seul modèle (MonsterRenderer)
+PROFILER = False # temps de chaque étape affichés dès le lancement (F3 pour basculer, F4 pour exporter)
+MONSTER_LOD = ((30, 1), (70, 3), (float('inf'), 10)) # niveaux de détail des monstres : (distance max au joueur, pas entre deux mises à jour)
+MONSTER_SEPARATION = 4 # distance (unités) en dessous de laquelle deux monstres s'écartent, None : ils peuvent se superposer
+ANALYTIC_PLAYER_PHYSICS = True # joueur contre la grille des hauteurs du terrain (PlayerPhysics), False : CollisionTraverser
+RECORD_INPUTS = None # fichier où enregistrer les entrées de la partie pour la rejouer (voir Headless.py), None : pas d'enregistrement
 globalClock = ClockObject.getGlobalClock()
-globalClock.setMode(ClockObject.MLimited)
-globalClock.setFrameRate(FPS)
+if FPS > 0:
+    globalClock.setMode(ClockObject.MLimited)
+    globalClock.setFrameRate(FPS)
 
 loadPrcFile('ressources/settings.prc') # charger les paramètres de configuration
 
@@ -31,17 +53,27 @@ def degToRad(deg):
 
 class MyGame():
     """Classe représentant la partie."""
-    def __init__(self, menu):
+    def __init__(self, menu, seed=None, inputs=None):
         """Initialisation de la partie.
         Args:
-            None
+            menu (Menu): fenêtre du jeu (ShowBase), avec les touches et les modèles
+            seed (int): seed de la partie (random et terrain), tirée au hasard si None
+            inputs (ScriptedInput): entrées scriptées à la place du clavier, None pour jouer
         Returns:
             None
         """
         self.block = {} #dico des differents blocks du jeu
         self.menu = menu
         self.screen = self.menu
+        self.assets = self.menu.assets # modèles préchargés et partagés
+        self.archetypes = Archetypes.Registry() # types de monstres et d'armes (ressources/archetypes.json), validés au lancement
         self.gametime = 0
+        self.seed = seed if seed is not None else random.randrange(2 ** 32) # même seed et mêmes entrées : même partie
+        random.seed(self.seed)
+        self.inputs = inputs # entrées scriptées, lues par le joueur
+        self.profiler = Profiler.Profiler(self.screen) # temps de chaque étape de la frame
+        self.hud = HUD.HUD(self.screen) # barre de vie, score, vague et compteurs, mis à jour une fois par frame
+        self.recorder = Replay.InputRecorder(self.seed) if RECORD_INPUTS else None # enregistrement des entrées
         
         self.worldMask = BitMask32.bit(1) #creation masque 1er etage
         self.cTrav = CollisionTraverser() # gestionnaire de collisions
@@ -51,40 +83,150 @@ class MyGame():
         self.loadModels() # appel methode loadModels
         self.setupLights() # appel methode setupLights
         
-        self.terrain = Terrain.Terrain(self, self.block) # creation terrain
+        self.terrain = Terrain.Terrain(self, self.block, streaming=STREAMING_TERRAIN, seed=random.randint(1, 10000)) # creation terrain
+        self.flowField = None if self.terrain.streaming else FlowField.FlowField(self.terrain) # chemins des monstres vers le joueur
         self.GameManager = GameManager.GameManagement(self)
+        self.playerPhysics = PlayerPhysics.PlayerPhysics(self.terrain) if ANALYTIC_PLAYER_PHYSICS else None # sans collisions du joueur
         self.player = Player.Player(self, [30,30,self.terrain.max_height * self.terrain.block_size]) # creation player
-        self.weapon = Weapon.Weapon("Épée en bois", "Une épée basique en bois.", 100, 4, 1.0) # creation arme
+        self.weapon = Weapon.Weapon(self.archetypes.weapon("epee_bois")) # creation arme
         self.monsters = []
+        self.combat = Combat.Combat(self) # événements du combat et minuteries, appliqués à la fin de chaque pas
+        self.monsterGrid = SpatialHash.SpatialHash() # grille des monstres pour les recherches de proximité
+        self.horde = MonsterHorde.MonsterHorde(self, tiers=MONSTER_LOD, separation=MONSTER_SEPARATION) # état des monstres en tableaux, avancé en une seule étape
+        self.monsterRenderer = MonsterRenderer.MonsterRenderer(self) if INSTANCED_MONSTERS else None # tous les monstres en un seul modèle
+        self.monsterPool = MonsterPool.MonsterPool(self) # monstres réutilisés d'un spawn à l'autre
+        self.GameManager.planVague(0) # première vague programmée, ses monstres (chaque type prévu) créés au chargement
+        self.collisionRoot = self.screen.render.attachNewNode('collisions') # seul sous-graphe parcouru par cTrav
+        self.terrain.collision_root.reparentTo(self.collisionRoot) # chunks proches du joueur
+        self.horde.root.reparentTo(self.collisionRoot) # entités dynamiques : les monstres
         
         self.player.weapon = self.weapon # assigner les degats de l'arme au joueur
         
         self.setupSkybox() # appel methode setupSkybox
 
+        self.clock = SimulationClock.SimulationClock(TICK_RATE, MAX_CATCH_UP_STEPS) # pas de simulation fixes
+        self.cameraPrevious = self.screen.camera.getPos() # position du joueur au pas précédent
+        self.cameraCurrent = self.screen.camera.getPos() # position du joueur au dernier pas
+        self.screen.accept('f3', self.toggleDebug)
+        self.screen.accept('f4', self.exportProfile)
+        if PROFILER:
+            self.profiler.enable()
+        if self.recorder is not None:
+            self.screen.finalExitCallbacks.append(lambda: self.recorder.save(RECORD_INPUTS)) # écrit à la fermeture du jeu
         taskMgr.add(self.update, "update") # mise à jour
 
 
     def update(self, task):
-        """update la partie.
+        """update la partie : pas de simulation fixes, puis affichage interpolé entre les deux derniers pas.
         Args:
             task (Task): tâche en cours
         Returns:
             Task.cont: continuer la tâche
         """
-        dt = globalClock.getDt() # temps entre chaque frame
+        self.step(globalClock.getDt()) # temps entre chaque frame
+        return task.cont
+
+    def step(self, dt):
+        """avance la simulation du temps d'une frame et place l'affichage entre les deux derniers pas.
+        Args:
+            dt (float): temps écoulé depuis la frame précédente
+        Returns:
+            int: nombre de pas de simulation
+        """
+        self.screen.camera.setPos(self.cameraCurrent) # la simulation reprend au dernier pas, pas à la position affichée
+        steps = self.clock.advance(dt, self.tick)
+
+        alpha = self.clock.alpha
+        self.screen.camera.setPos(self.cameraPrevious + (self.cameraCurrent - self.cameraPrevious) * alpha)
+        self.profiler.begin('sync')
+        self.horde.syncNodes(alpha) # placer les monstres
+        if self.monsterRenderer is not None:
+            self.monsterRenderer.update(self.horde)
+        self.profiler.end('sync')
+        self.profiler.begin('hud')
+        rebuilds = self.hud.flush() # changements de tous les pas de la frame, appliqués en une fois
+        self.profiler.end('hud')
+        if self.profiler.enabled:
+            self.profiler.add('hudRebuilds', rebuilds)
+        return steps
+
+    def tick(self, dt):
+        """un pas de simulation de la partie.
+        Args:
+            dt (float): durée d'un pas (1 / TICK_RATE)
+        Returns:
+            None
+        """
+        self.cameraPrevious = self.cameraCurrent
         self.gametime += dt
-        print(self.GameManager.score)
+        self.combat.advance(dt) # recharges et cooldowns échus
+        if self.inputs is not None:
+            self.inputs.advance(self.clock.ticks, self.screen.camera) # entrées scriptées de ce pas
+        if self.recorder is not None:
+            self.recorder.record(self.clock.ticks, self.player.input, self.screen.camera)
         
-        if hasattr(self, "cTrav"): # vérifier si cTrav est défini
-            self.cTrav.traverse(render) 
+        profiler = self.profiler
+        profiler.begin('terrain')
+        self.terrain.update(self.screen.camera.getX(), self.screen.camera.getY()) # chunks et collisions autour du joueur
+        profiler.end('terrain')
+        if self.playerPhysics is None: # les collisions ne servent qu'au joueur
+            profiler.begin('collisions')
+            self.cTrav.traverse(self.collisionRoot) # pas tout render : seulement les collisions actives
+            profiler.end('collisions')
+            if profiler.enabled:
+                profiler.add('solids', self.terrain.active_solids + self.horde.solids) # comptes tenus à jour, sans recherche
         if self.gametime > 3:
+            profiler.begin('player')
             self.player.update(dt) #update le player
+            profiler.end('player')
+            profiler.begin('gameManager')
             self.GameManager.update(dt)
-            for monster in self.monsters:
-                monster.update(dt) #update le monstre
-            
-        return task.cont
+            profiler.end('gameManager')
+            if self.flowField is not None:
+                profiler.begin('flowField')
+                self.flowField.update(self.player.position[0], self.player.position[1]) # chemins vers la cellule du joueur
+                profiler.end('flowField')
+            profiler.begin('monsters')
+            self.horde.update(dt) #update tous les monstres
+            profiler.end('monsters')
+        profiler.begin('combat')
+        self.combat.flush() # coups, morts et score du pas, puis monstres retirés et ajoutés en une fois
+        profiler.end('combat')
+        self.cameraCurrent = self.screen.camera.getPos() # position du joueur à ce pas
         
+    def countCollisionSolids(self, root=None):
+        """nombre de solides de collision que cTrav peut tester dans un sous-graphe (collisions cachées exclues).
+        Recherche dans tout le sous-graphe, pour les benchmarks : en jeu le profileur lit terrain.active_solids
+        et horde.solids.
+        Args:
+            root (NodePath): sous-graphe, None : la racine des collisions
+        Returns:
+            int: nombre de solides
+        """
+        root = self.collisionRoot if root is None else root
+        return sum(collider.node().getNumSolids() for collider in root.findAllMatches('**/+CollisionNode'))
+
+    def toggleDebug(self):
+        """affiche ou cache le debug (touche F3) : temps du profileur et textes régénérés par le HUD.
+        Args:
+            None
+        Returns:
+            None
+        """
+        self.profiler.toggle()
+        if self.profiler.enabled != (self.hud.debug is not None): # le profileur peut être actif dès le lancement (PROFILER)
+            self.hud.toggleDebug()
+
+    def exportProfile(self):
+        """écrit les temps mesurés par le profileur (touche F4) dans profil.csv et profil.json.
+        Args:
+            None
+        Returns:
+            None
+        """
+        self.profiler.export('profil.csv')
+        self.profiler.export('profil.json')
+
     def setupSkybox(self):
         """création ciel en fond.
         Args:
@@ -92,7 +234,7 @@ class MyGame():
         Returns:
             None
         """
-        skybox = loader.loadModel('skybox/skybox.egg')  # charger le modèle de la skybox
+        skybox = self.assets.get('skybox')  # charger le modèle de la skybox
         skybox.setScale(500) # mettre la taille de la skybox a 500
         skybox.setBin('background', 1) # définir la skybox comme arrière-plan
         skybox.setDepthWrite(0) # désactiver l'écriture de la profondeur
@@ -106,10 +248,10 @@ class MyGame():
         Returns:
             None
         """
-        self.block["grassBlock"] = loader.loadModel('model3d/grass-block.glb') # charger le model grass block
-        self.block["dirtBlock"] = loader.loadModel('model3d/dirt-block.glb') # charger le model dirt block
-        self.block["stoneBlock"] = loader.loadModel('model3d/stone-block.glb') # charger le model stone block
-        self.block["sandBlock"] = loader.loadModel('model3d/sand-block.glb') # charger le model sand block
+        self.block["grassBlock"] = self.assets.get('grassBlock') # charger le model grass block
+        self.block["dirtBlock"] = self.assets.get('dirtBlock') # charger le model dirt block
+        self.block["stoneBlock"] = self.assets.get('stoneBlock') # charger le model stone block
+        self.block["sandBlock"] = self.assets.get('sandBlock') # charger le model sand block
 
     def setupLights(self):
         """setup les lumieres.
@@ -1,5 +1,7 @@
-from Monster import Monster
 import random
+from collections import Counter
+
+import SpawnPlanner
 
 class GameManagement():
     def __init__(self, game):
@@ -11,29 +13,60 @@ class GameManagement():
         self.enemyVague = 10
         self.initialEnemyVague = 10
         self.maxMonsters = 5
-        self.timeNextMonster = self.game.gametime
+        self.planner = SpawnPlanner.SpawnPlanner(self.game.terrain, seed=random.randrange(2 ** 32)) # programme des apparitions de chaque vague
+        self.planned = False # première vague programmée par MyGame au chargement, sinon au premier update
 
     def NewVague(self):
         self.vague += 1
-        self.timeNextMonster = 10
         self.enemyVague = int(1.5 * (self.initialEnemyVague + self.difficulte) + self.vague * 10)
         self.initialEnemyVague = self.enemyVague
         self.maxMonsters = int(self.enemyVague //2 + (self.difficulte * 5))
-    
-    def spawn_monster(self):
-        return Monster(self.game, [random.randint(0,self.game.terrain.terrain_width),random.randint(0,self.game.terrain.terrain_length),100], 100, 2, 10, 2, 50)
-    
+        self.planVague(10) # monstres de la vague créés pendant l'attente, sans pic
+        self.game.hud.set('wave', self.vague)
+        self.game.hud.set('remaining', self.enemyVague)
+
+    def planVague(self, delay):
+        """Programme toutes les apparitions de la vague (temps, types, positions) et prépare dans le pool les
+        monstres de chaque type prévu, créés pendant delay (tout de suite si delay vaut 0).
+        Args:
+            delay (float): temps (s) avant la première apparition
+        Returns:
+            list: programme de la vague
+        """
+        self.planned = True
+        schedule = self.planner.plan(self.enemyVague, delay, list(self.game.archetypes.monsters), self.playerPosition())
+        kinds = Counter(kind for _, kind, _ in schedule)
+        self.game.monsterPool.reserve({kind: min(count, self.maxMonsters) for kind, count in kinds.items()}, delay)
+        return schedule
+
+    def playerPosition(self):
+        """Position (x, y) du joueur, None s'il n'existe pas encore."""
+        player = getattr(self.game, 'player', None)
+        return None if player is None else (player.position[0], player.position[1])
+
+    def spawn_monster(self, kind, position=None):
+        if position is None:
+            drawn = self.planner.positions(1, self.playerPosition()) # cellule praticable loin du joueur
+            if len(drawn) == 0:
+                return None # aucune cellule praticable chargée
+            position = drawn[0].tolist()
+        return self.game.monsterPool.acquire(kind, position) # statistiques du type (game.archetypes)
+
     def update(self, dt):
-        self.timeNextMonster -= dt
+        if not self.planned:
+            self.planVague(0)
+        self.planner.advance(dt)
+        self.game.monsterPool.prewarmStep(dt) # quelques monstres de la prochaine vague par pas
         if self.enemyVague == 0 and len(self.game.monsters) == 0:
             self.vague += 1
             self.NewVague()
-        if self.timeNextMonster <= 0 and self.enemyVague > 0 and len(self.game.monsters) < self.maxMonsters:
-            self.game.monsters.append(self.spawn_monster())
+        alive = len(self.game.monsters) + len(self.game.combat.spawned) # avec les monstres apparus pendant ce pas
+        while alive < self.maxMonsters and self.planner.isDue(): # une apparition échue attend qu'une place se libère
+            spawn = self.planner.pop(self.playerPosition())
+            if spawn is None:
+                break # aucune cellule praticable chargée : l'apparition est repoussée
+            kind, position = spawn
+            self.game.combat.spawn(self.spawn_monster(kind, position)) # ajouté à game.monsters à la fin du pas
             self.enemyVague -= 1
-            if self.enemyVague != 0:
-                self.timeNextMonster = 3*random.random()
-
-
-
-        
+            alive += 1
+            self.game.hud.set('remaining', self.enemyVague)
@@ -0,0 +1,110 @@
+#librairies panda3d
+from panda3d.core import CardMaker, TextNode
+from direct.gui.OnscreenText import OnscreenText
+
+TEXTS = { # textes du HUD, en haut à droite : format et ligne
+    'score': ("Score {}", 0),
+    'wave': ("Vague {}", 1),
+    'monsters': ("Monstres {}", 2),
+    'remaining': ("Restants {}", 3),
+    'kills': ("Tués {}", 4),
+}
+DEBUG = "textes régénérés {} (total {})" # ligne de debug sous les textes, affichée avec F3
+
+
+class HUD():
+    """Affichage par-dessus le jeu : barre de vie, score, vague et compteurs de monstres.
+    Le jeu ne touche pas aux noeuds : il donne les nouvelles valeurs (set), gardées comme modifiées jusqu'à flush,
+    appelé une fois par frame. Un texte n'est régénéré que si sa valeur a changé depuis la frame précédente.
+    """
+    def __init__(self, screen, max_health=100):
+        """Initialisation du HUD.
+        Args:
+            screen (ShowBase): fenêtre du jeu
+            max_health (float): vie du joueur quand la barre est pleine
+        Returns:
+            None
+        """
+        self.screen = screen # fenêtre du jeu
+        self.max_health = max_health # vie de la barre pleine
+        self.values = {'health': max_health, **dict.fromkeys(TEXTS, 0)} # valeurs affichées
+        self.dirty = {} # valeurs modifiées depuis le dernier flush, pas encore affichées
+        self.rebuilds = 0 # textes régénérés au dernier flush
+        self.totalRebuilds = 0 # textes régénérés depuis le début
+        self.debug = None # ligne de debug (textes régénérés), créée par toggleDebug
+
+        # Fond de la barre de vie
+        cm = CardMaker("fond")
+        cm.setFrame(0, 1, 0, 0.05)
+        self.fond = screen.aspect2d.attachNewNode(cm.generate())
+        self.fond.setPos(-0.5, 0, -0.9)
+        self.fond.setColor(0.2, 0.2, 0.2, 1)
+
+        # Barre de vie
+        cm2 = CardMaker("barre")
+        cm2.setFrame(0, 1, 0, 0.05)
+        self.barre = screen.aspect2d.attachNewNode(cm2.generate())
+        self.barre.setPos(-0.5, 0, -0.9)
+        self.barre.setColor(1, 0, 0, 1)
+
+        # Textes
+        self.texts = {}
+        for name, (text, line) in TEXTS.items():
+            self.texts[name] = OnscreenText(text=text.format(self.values[name]), parent=screen.a2dTopRight,
+                                            pos=(-0.05, -0.08 - line * 0.07), scale=0.06, fg=(1, 1, 1, 1),
+                                            shadow=(0, 0, 0, 1), align=TextNode.ARight, mayChange=True)
+
+    def set(self, name, value):
+        """Nouvelle valeur d'un élément du HUD, affichée au prochain flush.
+        Args:
+            name (str): 'health' ou un des textes (TEXTS)
+            value: nouvelle valeur
+        Returns:
+            None
+        """
+        if value == self.values[name]:
+            self.dirty.pop(name, None) # revenue à la valeur affichée pendant la frame
+        else:
+            self.dirty[name] = value
+
+    def flush(self):
+        """Applique les valeurs modifiées depuis la frame précédente (une fois par frame).
+        Args:
+            None
+        Returns:
+            int: nombre de textes régénérés
+        """
+        rebuilds = 0
+        for name, value in self.dirty.items():
+            self.values[name] = value
+            if name == 'health':
+                self.barre.setScale(min(max(value, 0), self.max_health) / self.max_health, 1, 1) # une carte redimensionnée, pas de texte
+            else:
+                self.texts[name].setText(TEXTS[name][0].format(value))
+                rebuilds += 1
+        self.dirty.clear()
+        self.rebuilds = rebuilds
+        self.totalRebuilds += rebuilds
+        if self.debug is not None and rebuilds: # pas compté : elle ne change qu'avec les autres textes
+            self.debug.setText(DEBUG.format(rebuilds, self.totalRebuilds))
+        return rebuilds
+
+    def toggleDebug(self):
+        """Affiche ou cache la ligne de debug : textes régénérés au dernier flush qui en a régénéré, et depuis le début.
+        Args:
+            None
+        Returns:
+            None
+        """
+        if self.debug is not None:
+            self.debug.destroy()
+            self.debug = None
+            return
+        self.debug = OnscreenText(text=DEBUG.format(self.rebuilds, self.totalRebuilds), parent=self.screen.a2dTopRight,
+                                  pos=(-0.05, -0.08 - len(TEXTS) * 0.07), scale=0.045, fg=(1, 1, 0, 1),
+                                  shadow=(0, 0, 0, 1), align=TextNode.ARight, mayChange=True)
+
+    def hideHealth(self):
+        """Cache la barre de vie (le joueur est mort), les textes restent affichés."""
+        self.fond.hide()
+        self.barre.hide()
@@ -0,0 +1,187 @@
+"""Partie sans fenêtre ni joueur humain, pour les tests de charge.
+MyGame avance d'un nombre fixe de pas, aussi vite que le processeur le permet, avec des entrées scriptées
+(Replay.patrol) ou enregistrées (Game.RECORD_INPUTS) à la place du clavier. Avec la même seed et les mêmes
+entrées la partie est identique : l'empreinte affichée à la fin permet de le vérifier.
+
+    python main.py --headless [--seed 1] [--ticks 3000] [--monsters 200] [--inputs partie.json]
+                              [--offscreen] [--timings pas.csv] [--profile profil.json] [--collisions] [--json]
+"""
+#librairies
+import argparse
+import csv
+import hashlib
+import json
+import sys
+import time
+from collections import Counter
+from math import ceil
+import numpy as np
+
+#librairies panda3d
+from panda3d.core import loadPrcFileData
+from direct.showbase.ShowBase import ShowBase
+
+import AssetManager
+import Game
+import Menu
+import Replay
+
+
+class HeadlessGame(ShowBase):
+    """Remplace Menu : fenêtre absente (ou rendu hors écran), touches et modèles pour MyGame."""
+    def __init__(self, offscreen=False):
+        """Initialisation sans fenêtre.
+        Args:
+            offscreen (bool): rendre chaque pas dans un tampon hors écran (sinon aucun rendu)
+        Returns:
+            None
+        """
+        loadPrcFileData("", f"window-type {'offscreen' if offscreen else 'none'}\naudio-library-name null\nsync-video false")
+        ShowBase.__init__(self)
+        if self.camera is None: # sans fenêtre, pas de caméra : un simple noeud porte le joueur
+            self.camera = self.render.attachNewNode('camera')
+        self.bindings = dict(Menu.BINDINGS) # touches de contrôle, lues par le joueur
+        self.assets = AssetManager.AssetManager(self.loader) # modèles du jeu (cache .bam)
+
+
+def digest(game):
+    """Empreinte de l'état de la partie : joueur, score et monstres.
+    Args:
+        game (MyGame): partie
+    Returns:
+        str: empreinte sha1
+    """
+    horde = game.horde
+    state = hashlib.sha1()
+    state.update(repr((game.clock.ticks, tuple(game.screen.camera.getPos()), tuple(game.screen.camera.getHpr()),
+                       game.player.health, game.GameManager.score, game.GameManager.vague, len(game.monsters))).encode())
+    for name in ('position', 'heading', 'health', 'is_attacking', 'archetype'):
+        state.update(np.ascontiguousarray(getattr(horde, name)[horde.used]).tobytes())
+    return state.hexdigest()
+
+
+def onTerrain(game):
+    """Le joueur est-il encore au-dessus du terrain (sur la carte et pas sous la surface) ?
+    Un joueur tombé hors du terrain n'est plus atteint par les monstres : la partie mesurée ne se joue plus.
+    Args:
+        game (MyGame): partie
+    Returns:
+        bool: True si le joueur est au-dessus du terrain
+    """
+    x, y, z = game.screen.camera.getPos()
+    terrain = game.terrain
+    if not terrain.streaming: # terrain fini : la cellule du joueur doit être dans la grille
+        cell_x, cell_y = ceil(x / terrain.block_size), ceil(y / terrain.block_size)
+        if not (0 <= cell_x < terrain.surfaceGrid.shape[0] and 0 <= cell_y < terrain.surfaceGrid.shape[1]):
+            return False
+    return z >= terrain.getSurfaceLevel(x, y)
+
+
+def run(base, seed, ticks, inputs=None, monsters=0, profile=False):
+    """Joue une partie de ticks pas, chacun chronométré.
+    Args:
+        base (HeadlessGame): fenêtre du jeu
+        seed (int): seed de la partie
+        ticks (int): nombre de pas de simulation
+        inputs (ScriptedInput): entrées de la partie, Replay.patrol si None
+        monsters (int): monstres apparus dès le départ (en plus des vagues)
+        profile (bool): mesurer chaque étape du pas (game.profiler)
+    Returns:
+        dict: durée de chaque pas (s), monstres à chaque pas, état final (dont on_terrain) et empreinte
+    """
+    game = Game.MyGame(base, seed, inputs if inputs is not None else Replay.ScriptedInput(Replay.patrol(ticks, Game.TICK_RATE)))
+    if monsters:
+        game.GameManager.maxMonsters = max(game.GameManager.maxMonsters, monsters)
+        types = list(game.archetypes.monsters)
+        kinds = [types[index % len(types)] for index in range(monsters)] # tous les types du jeu, à tour de rôle
+        game.monsterPool.reserve(Counter(kinds), 0)
+        for kind in kinds:
+            monster = game.GameManager.spawn_monster(kind)
+            if monster is not None:
+                game.monsters.append(monster)
+    profiler = game.profiler
+    if profile:
+        profiler.enable(overlay=False)
+        base.taskMgr.remove('profilerRenderStart') # le rendu est appelé ici, pas par les tâches de ShowBase
+        base.taskMgr.remove('profilerRenderEnd')
+
+    durations = []
+    counts = []
+    render = base.win is not None
+    for _ in range(ticks):
+        start = time.perf_counter()
+        game.step(game.clock.step) # exactement un pas
+        if render:
+            profiler.begin('render')
+            base.graphicsEngine.renderFrame()
+            profiler.end('render')
+        if profile:
+            profiler.endFrame()
+        durations.append(time.perf_counter() - start)
+        counts.append(len(game.monsters))
+    return {'seed': game.seed, 'ticks': ticks, 'durations': durations, 'monsters': counts,
+            'score': game.GameManager.score, 'health': game.player.health, 'player': list(game.screen.camera.getPos()),
+            'on_terrain': onTerrain(game), 'digest': digest(game), 'game': game}
+
+
+def summary(result):
+    """Débit et répartition des durées de pas.
+    Args:
+        result (dict): résultat de run
+    Returns:
+        dict: pas par seconde et percentiles (ms)
+    """
+    durations = np.array(result['durations']) * 1000
+    return {'ticks/s': len(durations) / durations.sum() * 1000, 'mean': durations.mean(),
+            'p50': np.percentile(durations, 50), 'p95': np.percentile(durations, 95),
+            'p99': np.percentile(durations, 99), 'max': durations.max()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--headless", action="store_true", help=argparse.SUPPRESS) # option de main.py
+    parser.add_argument("--seed", type=int, default=None, help="seed de la partie (par défaut celle de --inputs, sinon 1)")
+    parser.add_argument("--ticks", type=int, default=3000)
+    parser.add_argument("--monsters", type=int, default=0, help="monstres apparus dès le départ")
+    parser.add_argument("--inputs", help="entrées enregistrées (Game.RECORD_INPUTS) ou scriptées, JSON")
+    parser.add_argument("--offscreen", action="store_true", help="rendre chaque pas hors écran")
+    parser.add_argument("--timings", help="fichier CSV des durées de chaque pas")
+    parser.add_argument("--profile", help="temps de chaque étape (Profiler), fichier .csv ou .json")
+    parser.add_argument("--collisions", action="store_true", help="joueur contre le terrain par le CollisionTraverser")
+    parser.add_argument("--json", action="store_true", help="résultat en une ligne JSON")
+    args = parser.parse_args(argv)
+
+    inputs, seed = None, args.seed
+    if args.inputs:
+        inputs, recorded = Replay.ScriptedInput.load(args.inputs)
+        seed = seed if seed is not None else recorded
+    if args.collisions:
+        Game.ANALYTIC_PLAYER_PHYSICS = False
+    base = HeadlessGame(args.offscreen)
+    result = run(base, seed if seed is not None else 1, args.ticks, inputs, args.monsters, args.profile is not None)
+    stats = summary(result)
+
+    if args.timings:
+        with open(args.timings, 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(['pas', 'monstres', 'durée (ms)'])
+            for tick, (duration, count) in enumerate(zip(result['durations'], result['monsters'])):
+                writer.writerow([tick, count, f"{duration * 1000:.4f}"])
+    if args.profile:
+        result['game'].profiler.export(args.profile)
+    if args.json:
+        print(json.dumps({'seed': result['seed'], 'ticks': result['ticks'], 'monsters': result['monsters'][-1],
+                          'score': result['score'], 'health': result['health'], 'player': result['player'],
+                          'on_terrain': result['on_terrain'], 'digest': result['digest'], **stats}))
+    else:
+        print(f"seed {result['seed']}, {result['ticks']} pas, {result['monsters'][-1]} monstres à la fin")
+        print(f"débit : {stats['ticks/s']:.0f} pas/s")
+        print(f"pas (ms) : moyenne {stats['mean']:.2f}, p50 {stats['p50']:.2f}, p95 {stats['p95']:.2f}, "
+              f"p99 {stats['p99']:.2f}, max {stats['max']:.2f}")
+        print(f"score {result['score']}, vie du joueur {result['health']}")
+        if args.profile:
+            print(result['game'].profiler.report())
+        print(f"empreinte : {result['digest']}")
+    if not result['on_terrain']:
+        x, y, z = result['player']
+        sys.exit(f"erreur : le joueur a quitté le terrain ({x:.1f}, {y:.1f}, {z:.1f}), les mesures ne sont pas celles d'une partie")
@@ -3,26 +3,30 @@ from direct.gui.DirectGui import DirectButton, DirectOptionMenu
 from panda3d.core import Vec4, loadPrcFileData, TextNode, WindowProperties
 from direct.gui.OnscreenText import OnscreenText
 import Game
+import AssetManager
 
 loadPrcFileData("", "win-size 1280 720")
 
+BINDINGS = { # touches de contrôle par défaut
+    "Sortir": "escape", 
+    "Avancer": "z",
+    "Reculer": "s",
+    "Gauche": "q",
+    "Droite": "d",
+    "Saut": "space",
+    "Accroupir": "lcontrol",
+    "Sprint": "shift",
+    "Attaque": "mouse3",
+    "mouse1": "mouse1"
+}
+
 class Menu(ShowBase):
     def __init__(self):
         ShowBase.__init__(self) # initialisation classe parent
+        self.assets = AssetManager.AssetManager(self.loader) # modèles du jeu (cache .bam)
         self.create_menu() # appel methode create_menu
 
-        self.bindings = { # dictionnaire des touches de contrôle
-            "Sortir": "escape", 
-            "Avancer": "z",
-            "Reculer": "s",
-            "Gauche": "q",
-            "Droite": "d",
-            "Saut": "space",
-            "Accroupir": "lcontrol",
-            "Sprint": "shift",
-            "Attaque": "mouse3",
-            "mouse1": "mouse1"
-        }
+        self.bindings = dict(BINDINGS) # dictionnaire des touches de contrôle
         
     
     def create_menu(self):
@@ -109,8 +113,49 @@ class Menu(ShowBase):
         
 
     def lancer_partie(self):
-        """ Lance la partie."""
+        """ Lance la partie une fois les modèles chargés, derrière un écran de chargement."""
         self.supprimer_boutons()
+
+        #écran de chargement
+        self.message = OnscreenText(
+            text="Chargement...",
+            pos=(0, 0),
+            scale=0.07,
+            fg=(1, 1, 1, 1),
+            align=TextNode.ACenter
+        )
+        self.assets.preload(callback=self.demarrer_partie, progress=self.afficher_chargement)
+
+    def afficher_chargement(self, charges, total):
+        """ Met à jour l'écran de chargement.
+        Args:
+            charges (int): modèles chargés
+            total (int): modèles à charger
+        Returns:
+            None
+        """
+        self.message.setText(f"Chargement... {charges}/{total}")
+
+    def demarrer_partie(self, echecs=None):
+        """ Crée la partie quand tous les modèles sont chargés, sinon affiche ceux qui manquent.
+        Args:
+            echecs (dict): modèles qui n'ont pas pu être chargés, fichier par nom
+        Returns:
+            None
+        """
+        if echecs:
+            #partie abandonnée : retour au menu depuis l'écran de chargement
+            self.message.setText("Impossible de charger :\n" + "\n".join(echecs.values()))
+            self.retour_bouton = DirectButton(
+                text="Retour",
+                scale=0.07,
+                pos=(-1.6,0, 0.9),
+                command=self.fermer_settings,
+                frameColor=(0.2, 0.4, 0.8, 1),
+                text_fg=(1, 1, 1, 1)
+            )
+            return
+        self.message.destroy()
         game = Game.MyGame(self)
 
     def credit(self):
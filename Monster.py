@@ -1,98 +1,94 @@
-#librairies
-from math import sin, cos, pi, atan2, degrees
-
 #librairies panda3d
 from panda3d.core import Vec3
 from panda3d.core  import CollisionNode, CollisionBox
 from direct.actor.Actor import Actor
 
+from MonsterHorde import HordeField
+from Archetypes import ArchetypeField
 
-def degToRad(deg):
-    """Convertir des degrés en radiants.
-    Args:
-        deg (float): angle en degrés
-    Returns:
-        float: angle en radiants
-    """
-    return deg * (pi / 180)
 
 class Monster:
-    """Classe représentant un monstre."""
-    def __init__(self, game, position, health, speed, attack_power, attack_range, xp_value, monster_type="normal"):
+    """Classe représentant un monstre.
+    L'état numérique est rangé dans les tableaux de game.horde (MonsterHorde), le monstre n'en garde que son emplacement.
+    Ses statistiques fixes (vitesse, attaque, taille...) sont celles de son type (Archetypes), partagées par ses semblables.
+    Toute la horde est déplacée en une seule étape par MonsterHorde.update ; le monstre ne garde que ses noeuds
+    (modèle, collision, animations) et son entrée dans le pool et la grille de proximité.
+    """
+    position = HordeField('position')
+    health = HordeField('health')
+    is_alive = HordeField('is_alive')
+    is_attacking = HordeField('is_attacking')
+    is_walking = HordeField('is_walking')
+    lod_tier = HordeField('tier')
+    speed = ArchetypeField('speed')
+    attack_power = ArchetypeField('attack_power')
+    attack_range = ArchetypeField('attack_range')
+    xp_value = ArchetypeField('xp_value')
+    initialTimeToReload = ArchetypeField('reload')
+    gravity = ArchetypeField('gravity')
+    size = ArchetypeField('size')
+
+    def __init__(self, game, position, archetype):
         """Initialisation du monstre.
         Args:
             game (Game): reference vers la classe principale
             position (list): position initiale du monstre [x, y, z]
-            health (int): points de vie du monstre
-            speed (float): vitesse de déplacement du monstre
-            attack_power (int): puissance d'attaque du monstre
-            attack_range (float): portée d'attaque du monstre
-            xp_value (int): points d'expérience donnés à la mort du monstre
-            monster_type (str): type de monstre
+            archetype (MonsterArchetype): type du monstre (game.archetypes)
         Returns:
             None
         """
         self.screen = game.screen # référence vers l'écran de jeu
         self.game = game  # référence vers la partie
-        self.position = position # position du monstre
-        self.type = monster_type # type du monstre
-        self.health = health # santé du monstre
-        self.speed = speed # vitesse du monstre
-        self.attack_power = attack_power # nombre de degats
-        self.attack_range = attack_range # range de l'attaque
-        self.xp_value = xp_value # gain d'xp
-
-        # État
-        self.is_alive = True # etat du moponstre
-        self.is_attacking = False # etat de son attaque
-        self.initialTimeToReload = 3 # temps initial pour que le monstre reattaque
-        self.timeToReload = self.initialTimeToReload # temps avant que le monstre reattaque
-        self.gravity = -20  # accélération due à la gravité
-        self.size = 3.5
-        
+        self.horde = game.horde # tableaux de l'état des monstres
+        self.type = archetype.name # type du monstre
+        self.archetype = archetype # statistiques du type
 
         self.loadMonster() # chargement du monstre
         # - Configuration des collisions
         # - Animation du monstre
         # - Sons du monstre
+        self.reset(position)
 
-    def update(self, dt):
-        """update les actions du monstre.
+    def reset(self, position):
+        """(Ré)initialise l'état du monstre et le remet en jeu, à sa création ou quand il sort du MonsterPool.
         Args:
-            dt (float): temps qui c passer depuis la derniere update
+            position (list): position initiale du monstre [x, y, z]
         Returns:
             None
         """
-        self.is_alive = not self.isDead() # on regarde s'il est toujours en vie
-        if self.is_alive: 
-            self.nextAction(dt) # effectuer la prochaine action
-            if self.is_attacking: 
-                self.timeToReload -= dt # diminuer le temps avant la prochaine attaque
-            if self.timeToReload <= 0: 
-                self.timeToReload = self.initialTimeToReload # reinitialiser le temps avant la prochaine attaque
-                self.is_attacking = False # le monstre n'attaque plus
-        else:
-            self.unloadMonster() # supprimer le monstre
+        self.slot = self.horde.allocate(self) # emplacement du monstre dans les tableaux de la horde
+        self.horde.archetype[self.slot] = self.archetype.index # ligne de son type dans la table des statistiques
+        self.position = position # position du monstre
+        self.health = self.archetype.health # santé du monstre
 
-    def gravityEffect(self, dt, x, y):
-        """appliquer la gravité au monstre.
+        # État
+        self.is_alive = True # etat du moponstre
+        self.is_attacking = False # etat de son attaque
+        self.is_walking = False # etat de l'animation de marche
+        self.reloadTimer = None # minuterie de la recharge en cours (Combat)
+
+        # remettre dans la scène
+        self.horde.heading[self.slot] = 0
+        self.horde.snap(self.slot) # pas d'interpolation depuis la position d'un ancien monstre
+        self.monster.unstash()
+        self.collider.unstash() # retiré au niveau de détail le plus loin
+        self.monster.setPosHpr(self.position[0], self.position[1], self.position[2], 0, 0, 0)
+        self.game.monsterGrid.insert(self, self.position[0], self.position[1], self.size) # recherche de proximité
+
+    def stash(self):
+        """Retire le monstre du jeu sans le détruire, pour le réutiliser (MonsterPool).
         Args:
-            dt (float): temps qui c passer depuis la derniere update
+            None
         Returns:
             None
         """
-        terrain_level = self.game.terrain.getSurfaceLevel(x ,y) # obtenir le niveau du terrain aux coordonnées (x, y)
-        if self.position[2] > terrain_level + self.size: # si le monstre est au-dessus du sol
-            if self.position[2] + self.gravity * dt < terrain_level + self.size: # si le monstre va toucher le sol
-                self.position[2] = terrain_level + self.size # placer le monstre au niveau du sol
-            else:
-                self.position[2] += self.gravity * dt # appliquer la gravité
-        #ajouter le fait de sauter un block de hauteur maximum
-        if self.position[2] <= terrain_level + self.size: # si le monstre est au niveau du sol
-            self.position[2] = terrain_level + self.size # placer le monstre au niveau du sol
-        self.monster.setZ(self.position[2]) # mettre à jour la position en Z du monstre
-        
-            
+        if self.is_walking:
+            self.stopWalkAnimation()
+        self.game.combat.cancelTimers(self)
+        self.game.monsterGrid.remove(self)
+        self.horde.release(self.slot)
+        self.monster.stash() # plus dessiné ni testé par les collisions
+
     def isDead(self):
         """verifier si le monstre est mort.
         Args:
@@ -104,70 +100,42 @@ class Monster:
 
     def loadMonster(self):
         """Charger le modèle du monstre et initialiser collision/animations."""
-        model_path = 'model3d/monsterCarton.glb'
-        # essayer Actor (pour animations) puis fallback sur NodePath
-        try:
-            self.monster = Actor(model_path)
-        except Exception:
-            self.monster = loader.loadModel(model_path)
+        if self.game.monsterRenderer is not None:
+            self.monster = self.horde.root.attachNewNode('monster') # dessiné par MonsterRenderer, ce noeud ne porte que la collision
+        else:
+            # essayer Actor (pour animations) puis fallback sur NodePath
+            try:
+                self.monster = Actor(self.game.assets.shared('monster'))
+            except Exception:
+                self.monster = self.game.assets.get('monster')
 
-        # attacher et positionner
-        self.monster.reparentTo(self.screen.render)
-        self.monster.setPos(self.position[0], self.position[1], self.position[2])
+        # attacher (la position est donnée par reset)
+        self.monster.reparentTo(self.horde.root) # sous la racine des collisions de la partie
 
         # détecter animations si Actor
         self.walk_anim = 'marche1'
-        self.is_walking = False
 
         # collider simple en sphere centré sur le modèle
         blockSolid = CollisionBox((-1,-1,-1), (1,1,1))
         blockNode = CollisionNode('monster-collision')
         blockNode.addSolid(blockSolid)
         blockNode.setIntoCollideMask(self.game.worldMask)
-        collider = self.monster.attachNewNode(blockNode)
-        collider.setPythonTag('owner', self.monster)
+        self.collider = self.monster.attachNewNode(blockNode)
+        self.collider.setPythonTag('owner', self.monster)
+
+        # loin de la caméra, l'animation est mise à jour moins souvent (niveaux de détail de la horde)
+        if isinstance(self.monster, Actor) and self.horde.far_tier is not None:
+            self.monster.setLODAnimation(self.horde.limits[1], self.horde.limits[0], 0.1)
 
     def unloadMonster(self):
-        """dechargement monstre.
+        """dechargement monstre immédiat, hors d'un pas de simulation (en jeu, la mort passe par Combat).
         Args:
             None
         Returns:
             None
         """
-        self.game.GameManager.score += 100
         self.game.monsters.remove(self)
-        self.monster.removeNode() # supprimer monstre
-
-    def nextAction(self, dt):
-        """prochaine action du monstre.
-        Args:
-            dt (float): temps qui c passer depuis la derniere update
-        Returns:
-            None
-        """
-        distance = self.getDistanceToPlayer() # obtenir la distance entre le joueur et le monstre
-        self.monster.setH(self.getAngleToPlayer(distance)) # Faire tourner le monstre vers le joueur
- 
-
-        good_distance = True # savoir s'i le joueur est dans la range du monstre
-        for elt in distance:
-            if abs(elt) > self.attack_range * self.size//2: # savoir si le joueur est trop loin
-                good_distance = False 
-        if good_distance: 
-            self.attack(self.game.player) # le monstre attaque s'il est dans la range
-            if self.is_walking:
-                self.stopWalkAnimation()
-        
-        else: # sinon le monstre se deplace 
-            # Se déplacer devant soi (direction de heading)
-            self.Movement(dt, "devant")
-            if not self.is_attacking:
-                self.playWalkAnimation()
-
-    def getAngleToPlayer(self, distance):
-        angle_to_player = atan2(distance[1], distance[0]) # Calculer l'angle vers le joueur
-        angle_to_player_degrees = degrees(angle_to_player)
-        return angle_to_player_degrees
+        self.game.monsterPool.release(self) # ranger le monstre pour un prochain spawn
 
     def getDistanceToPlayer(self):
         """optenir la distance entre le joueur est le monstre.
@@ -184,74 +152,47 @@ class Monster:
                         ) # distance en x,y,z entre le joueur et le monstre
         return distance
         
-    def Movement(self, dt, orientation):
-        """faire deplacer le monstre.
-        Args:
-            dt (float): temps qui c passer depuis la derniere update
-            orientation (str): dirrection du deplacement
-        Returns:
-            None
-        """
-        if orientation == "devant": # s'il se deplace vers la droite
-            if not self.isWallCollision(self.position[0], self.position[1]): # verifier s'il y a une collision avec un mur
-                self.position[0] += dt * self.speed * cos(degToRad(self.monster.getH()))
-                self.position[1] += dt * self.speed * sin(degToRad(self.monster.getH()))
-                self.gravityEffect(dt, self.position[0] - 0.5 * self.size, self.position[1])
-            else:
-                self.bypassWallCollision() #contourne le mur s'il y a une collision
-        self.monster.setPos(self.position[0], self.position[1], self.position[2]) # modifier les positions du mosntre  
-
-    def bypassWallCollision(self):
-        """contourner la collision avec un mur.
-        Args:
-            None
-        Returns:
-            None
-        """
-        # Logique pour contourner la collision avec les murs
-        pass
-
-
-    def isWallCollision(self, new_x, new_y):
-        """verifier si le monstre entre en collision avec un mur.
-        Args:
-            new_x (float): nouvelle position en x
-            new_y (float): nouvelle position en y
-        Returns:
-            (bool): True si collision, False sinon
-        """
-        if self.game.terrain.getSurfaceLevel(new_x, new_y) > self.position[2] + self.size:
-            return True
-        return False
-    
-
-    def attack(self, target):
-        """attaque du monstre.
+    def changeHealth(self, degats):
+        """modifier la vie du monstre.
         Args:
-            target (Target): cible de l'attaque
+            degat(int): degats que se prend le monstre
         Returns:
             None
         """
-        if self.game.player == target and not self.is_attacking: # si c le joueur
-            target.health -= self.attack_power # on lui enleve de la vie 
-            self.is_attacking = True # le monstre est en train d'attaquer
-            target.barre.setScale(target.health/100, 1, 1)
-
+        self.health -= degats
 
-    def changeHealth(self, degats):
-        """modifier la vie du monstre.
+    def setLodTier(self, tier):
+        """Change le niveau de détail du monstre (appelé par MonsterHorde.updateTiers).
+        Au niveau le plus loin : pose fixe et plus de collision.
         Args:
-            degat(int): degats que se prend le monstre
+            tier (int): nouveau niveau de détail, 0 : le plus proche du joueur
         Returns:
             None
         """
-        self.health -= degats
+        far = tier == self.horde.far_tier
+        if far != self.collider.isStashed(): # le compte des solides actifs de la horde suit
+            self.horde.solids += -self.collider.node().getNumSolids() if far else self.collider.node().getNumSolids()
+        if far:
+            self.collider.stash()
+        else:
+            self.collider.unstash()
+        if isinstance(self.monster, Actor) and self.walk_anim and self.is_walking:
+            try:
+                if far:
+                    self.monster.pose(self.walk_anim, 0)
+                else:
+                    self.monster.loop(self.walk_anim)
+            except Exception:
+                pass
 
     def playWalkAnimation(self):
-        """Lancer l'animation de marche si disponible."""
+        """Lancer l'animation de marche si disponible (pose fixe au niveau de détail le plus loin)."""
         if not self.is_walking and isinstance(self.monster, Actor) and self.walk_anim:
             try:
-                self.monster.loop(self.walk_anim)
+                if self.lod_tier == self.horde.far_tier:
+                    self.monster.pose(self.walk_anim, 0)
+                else:
+                    self.monster.loop(self.walk_anim)
                 self.is_walking = True
             except Exception:
                 pass
@@ -0,0 +1,349 @@
+#librairies
+from math import pi
+import numpy as np
+
+
+class HordeField():
+    """Attribut d'un monstre rangé dans un tableau de la horde (monster.health -> horde.health[monster.slot])."""
+    def __init__(self, name):
+        self.name = name # nom du tableau dans MonsterHorde
+
+    def __get__(self, monster, owner=None):
+        if monster is None:
+            return self
+        return getattr(monster.horde, self.name)[monster.slot]
+
+    def __set__(self, monster, value):
+        getattr(monster.horde, self.name)[monster.slot] = value
+
+
+class MonsterHorde():
+    """État de tous les monstres dans des tableaux contigus, avancé en une seule étape vectorisée par frame."""
+    FIELDS = { # tableaux par monstre et leur type
+        'health': np.float64,
+        'archetype': np.int16, # ligne du type du monstre dans la table des statistiques (stats)
+        'heading': np.float32, # même précision que NodePath.getH
+        'previous_heading': np.float32, # heading au pas de simulation précédent
+        'is_alive': np.bool_,
+        'is_attacking': np.bool_,
+        'is_walking': np.bool_,
+        'used': np.bool_, # emplacement occupé par un monstre
+        'tier': np.int8, # niveau de détail, 0 : le plus proche du joueur
+        'waiting': np.float64, # temps pas encore simulé depuis la dernière mise à jour du monstre
+        'step': np.float64, # temps simulé par la dernière mise à jour
+        'moved': np.bool_, # mis à jour depuis le dernier placement de son noeud
+    }
+
+    def __init__(self, game, capacity=64, tiers=None, separation=None):
+        """Initialisation de la horde.
+        Args:
+            game (Game): reference vers la classe principale
+            capacity (int): nombre d'emplacements réservés au départ
+            tiers (tuple): niveaux de détail ((distance max au joueur, pas entre deux mises à jour), ...) du plus
+                proche au plus loin, None : tous les monstres mis à jour à chaque pas
+            separation (float): distance en dessous de laquelle deux monstres s'écartent l'un de l'autre,
+                None : pas de séparation (les monstres peuvent se superposer)
+        Returns:
+            None
+        """
+        self.game = game # reference vers la partie
+        self.stats = game.archetypes.table # statistiques de chaque type de monstre, partagées
+        self.root = game.screen.render.attachNewNode('horde') # noeud des monstres (entités dynamiques des collisions)
+        self.solids = 0 # solides de collision actifs des monstres, tenu à jour sans parcourir le graphe
+        self.tiers = tiers # niveaux de détail
+        self.limits = None if tiers is None else np.array([limit for limit, _ in tiers], dtype=np.float64) # distance max de chaque niveau
+        self.every = None if tiers is None else np.array([every for _, every in tiers], dtype=np.int64) # pas entre deux mises à jour
+        self.far_tier = None if tiers is None or len(tiers) < 2 else len(tiers) - 1 # niveau sans animation ni collision
+        self.hysteresis = 4 # marge (unités) avant de changer de niveau, pour ne pas osciller à la limite
+        self.ticks = 0 # pas de simulation depuis le début
+        self.separation = separation # rayon de séparation entre monstres
+        self.max_neighbours = 8 # voisins au plus qui repoussent un monstre (les plus proches)
+        self.separation_strength = 1.5 # poids de la séparation face à la direction vers le joueur
+        self.capacity = 0
+        self.count = 0 # nombre de monstres en jeu
+        self.monsters = [] # monstre de chaque emplacement, None si libre
+        self.free_slots = [] # emplacements libérés, réutilisés en priorité
+        self.position = np.zeros((0, 3), dtype=np.float64) # positions [x, y, z]
+        self.previous_position = np.zeros((0, 3), dtype=np.float64) # positions au pas de simulation précédent
+        self.render_slots = np.zeros(0, dtype=np.intp) # monstres affichés à la dernière frame
+        self.render_position = np.zeros((0, 3), dtype=np.float64) # leurs positions interpolées
+        self.render_heading = np.zeros(0, dtype=np.float32) # leurs headings interpolés
+        for name, dtype in self.FIELDS.items():
+            setattr(self, name, np.zeros(0, dtype=dtype))
+        self.grow(capacity)
+
+    def grow(self, capacity):
+        """Agrandit les tableaux (les données existantes sont copiées).
+        Args:
+            capacity (int): nouvelle capacité
+        Returns:
+            None
+        """
+        extra = capacity - self.capacity
+        self.position = np.concatenate([self.position, np.zeros((extra, 3), dtype=np.float64)])
+        self.previous_position = np.concatenate([self.previous_position, np.zeros((extra, 3), dtype=np.float64)])
+        for name, dtype in self.FIELDS.items():
+            setattr(self, name, np.concatenate([getattr(self, name), np.zeros(extra, dtype=dtype)]))
+        self.monsters.extend([None] * extra)
+        self.free_slots.extend(range(capacity - 1, self.capacity - 1, -1)) # les plus petits indices d'abord
+        self.capacity = capacity
+
+    def allocate(self, monster):
+        """Réserve un emplacement pour un monstre.
+        Args:
+            monster (Monster): monstre
+        Returns:
+            int: emplacement du monstre dans les tableaux
+        """
+        if not self.free_slots:
+            self.grow(self.capacity * 2)
+        slot = self.free_slots.pop()
+        self.monsters[slot] = monster
+        self.solids += monster.collider.node().getNumSolids() # collision réactivée par Monster.reset
+        self.used[slot] = True
+        self.tier[slot] = 0
+        self.waiting[slot] = 0
+        self.count += 1
+        return slot
+
+    def release(self, slot):
+        """Libère l'emplacement d'un monstre retiré du jeu.
+        Args:
+            slot (int): emplacement
+        Returns:
+            None
+        """
+        collider = self.monsters[slot].collider
+        if not collider.isStashed(): # pas au niveau de détail le plus loin
+            self.solids -= collider.node().getNumSolids()
+        self.monsters[slot] = None
+        self.used[slot] = False
+        self.is_walking[slot] = False
+        self.is_attacking[slot] = False
+        self.free_slots.append(slot)
+        self.count -= 1
+
+    def snap(self, slot):
+        """Place un monstre sans interpolation depuis son ancienne position (spawn).
+        Args:
+            slot (int): emplacement
+        Returns:
+            None
+        """
+        self.previous_position[slot] = self.position[slot]
+        self.previous_heading[slot] = self.heading[slot]
+
+    def update(self, dt):
+        """Avance tous les monstres d'un pas de simulation : poursuite du joueur, attaques, déplacement et gravité.
+        Les noeuds des monstres sont placés ensuite, une fois par frame, par syncNodes.
+        Args:
+            dt (float): temps qui c passer depuis la derniere update
+        Returns:
+            None
+        """
+        if self.count == 0:
+            return
+        self.ticks += 1
+        self.previous_position[:] = self.position # état du pas précédent, pour l'interpolation
+        self.previous_heading[:] = self.heading
+        slots = np.flatnonzero(self.used)
+
+        # les monstres morts attendent d'être retirés à la fin du pas (Combat)
+        alive = slots[self.is_alive[slots]]
+        if len(alive) == 0:
+            return
+
+        # niveaux de détail : loin du joueur, un monstre n'est mis à jour que tous les k pas (décalés d'un monstre à l'autre)
+        living = alive
+        self.waiting[alive] += dt
+        if self.tiers is not None:
+            self.updateTiers(alive)
+            alive = alive[(self.ticks + alive) % self.every[self.tier[alive]] == 0]
+            if len(alive) == 0:
+                return
+        dt = self.step
+        dt[alive] = self.waiting[alive] # temps écoulé depuis leur dernière mise à jour
+        self.waiting[alive] = 0
+        self.moved[alive] = True
+
+        # direction et distance vers le joueur (en float32 comme le Vec3 de Monster.getDistanceToPlayer)
+        player = self.game.player
+        position = self.position[alive]
+        distance = (np.array(player.position, dtype=np.float64) - position).astype(np.float32)
+        heading = np.degrees(np.arctan2(distance[:, 1].astype(np.float64), distance[:, 0].astype(np.float64)))
+        field = self.game.flowField
+        if field is not None: # loin du joueur, suivre le champ de directions (contourne les marches trop hautes)
+            flow = field.headings(position[:, 0], position[:, 1])
+            far = distance[:, 0].astype(np.float64) ** 2 + distance[:, 1].astype(np.float64) ** 2 > field.direct_radius ** 2
+            heading = np.where(far & ~np.isnan(flow), flow, heading)
+        self.heading[alive] = heading
+        stats = self.stats[self.archetype[alive]] # statistiques du type de chaque monstre
+        reach = np.floor_divide(stats['attack_range'] * stats['size'], 2)
+        in_range = np.all(np.abs(distance) <= reach[:, None], axis=1)
+        push = None if self.separation is None else self.separate(alive, living) # écartement des voisins trop proches
+
+        # attaque des monstres à portée
+        attackers = alive[in_range]
+        combat = self.game.combat
+        for slot in attackers[~self.is_attacking[attackers]].tolist(): # attaque si le monstre n'est pas en recharge
+            combat.post('hit', self.monsters[slot], player) # dégâts appliqués à la fin du pas
+            combat.startReload(self.monsters[slot])
+        for slot in attackers[self.is_walking[attackers]].tolist():
+            self.monsters[slot].stopWalkAnimation()
+
+        # déplacement des autres vers l'avant (direction de heading)
+        movers = alive[~in_range]
+        if len(movers):
+            x, y, z = self.position[movers, 0], self.position[movers, 1], self.position[movers, 2]
+            mover_size = self.stats['size'][self.archetype[movers]]
+            wall = self.game.terrain.getSurfaceLevels(x, y) > z + mover_size # marche plus haute que le monstre
+            free = movers[~wall]
+            blocked = movers[wall]
+            if len(blocked) and field is not None: # contourner le mur en suivant le champ de directions
+                flow = field.headings(self.position[blocked, 0], self.position[blocked, 1])
+                blocked = blocked[~np.isnan(flow)]
+                self.heading[blocked] = flow[~np.isnan(flow)]
+                free = np.concatenate((free, blocked))
+            if len(free):
+                radians = self.heading[free].astype(np.float64) * (pi / 180)
+                velocity = np.stack((np.cos(radians), np.sin(radians)), axis=1)
+                if push is not None: # direction vers le joueur + séparation, sans dépasser la vitesse du monstre
+                    velocity += self.separation_strength * push[np.searchsorted(alive, free)]
+                    velocity /= np.maximum(np.hypot(velocity[:, 0], velocity[:, 1]), 1)[:, None]
+                self.position[free, :2] += (dt[free] * self.stats['speed'][self.archetype[free]])[:, None] * velocity
+                self.applyGravity(dt[free], free)
+            walkers = movers[~self.is_attacking[movers] & ~self.is_walking[movers]]
+            for slot in walkers.tolist():
+                self.monsters[slot].playWalkAnimation()
+
+        # les monstres à portée s'écartent aussi, pour se répartir autour du joueur au lieu de s'empiler
+        if push is not None:
+            crowded = np.flatnonzero(in_range & np.any(push != 0, axis=1))
+            if len(crowded):
+                stopped = alive[crowded]
+                shift = self.separation_strength * push[crowded]
+                shift /= np.maximum(np.hypot(shift[:, 0], shift[:, 1]), 1)[:, None]
+                self.position[stopped, :2] += (dt[stopped] * self.stats['speed'][self.archetype[stopped]])[:, None] * shift
+                self.applyGravity(dt[stopped], stopped)
+                movers = np.concatenate((movers, stopped)) # déplacés : grille de proximité à mettre à jour
+
+        # grille de proximité, une mise à jour par monstre déplacé
+        grid = self.game.monsterGrid
+        for slot, (x, y) in zip(movers.tolist(), self.position[movers, :2].tolist()):
+            grid.move(self.monsters[slot], x, y)
+
+    def separate(self, slots, among):
+        """Poussée de séparation de chaque monstre, loin de ses self.max_neighbours plus proches voisins à moins de
+        self.separation. Les voisins sont cherchés dans une grille de cellules de côté self.separation (clés triées) :
+        tous les monstres des 9 cellules autour sont examinés, puis les plus proches gardés, soit O(n·m) pour m monstres
+        par voisinage au lieu de comparer toutes les paires.
+        Args:
+            slots (np.ndarray): emplacements des monstres à pousser (triés)
+            among (np.ndarray): emplacements de tous les monstres qui repoussent (triés, contient slots)
+        Returns:
+            np.ndarray: poussée [x, y] de chaque monstre de slots, de norme 0 (aucun voisin) à environ 1 (voisin collé)
+        """
+        radius = self.separation
+        xs, ys = self.position[among, 0], self.position[among, 1]
+        stride = 1 << 32 # clé d'une cellule : x * stride + y, les cellules (x, y - 1), (x, y), (x, y + 1) se suivent
+        keys = np.floor(xs / radius).astype(np.int64) * stride + np.floor(ys / radius).astype(np.int64)
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+
+        # paires (monstre, voisin) : tous les monstres d'une colonne de 3 cellules à la fois
+        own = np.searchsorted(among, slots) # indices de slots dans among
+        owner, other = [], []
+        for dx in (-1, 0, 1):
+            key = keys[own] + dx * stride
+            start = np.searchsorted(sorted_keys, key - 1, 'left')
+            counts = np.searchsorted(sorted_keys, key + 1, 'right') - start
+            first = np.cumsum(counts) - counts # première paire de chaque monstre
+            owner.append(np.repeat(np.arange(len(slots)), counts))
+            other.append(order[np.arange(counts.sum()) + np.repeat(start - first, counts)])
+        owner, other = np.concatenate(owner), np.concatenate(other)
+
+        away_x = xs[own[owner]] - xs[other] # vers le monstre depuis chaque voisin
+        away_y = ys[own[owner]] - ys[other]
+        squared = away_x * away_x + away_y * away_y
+        near = (other != own[owner]) & (squared < radius * radius)
+
+        # les self.max_neighbours plus proches de chaque monstre : paires triées par monstre puis par distance
+        ranked = np.flatnonzero(near)[np.lexsort((squared[near], owner[near]))]
+        owner, other, away_x, away_y, squared = [values[ranked] for values in (owner, other, away_x, away_y, squared)]
+        rank = np.arange(len(owner)) - np.searchsorted(owner, owner) # rang du voisin parmi ceux de son monstre
+        if (rank >= self.max_neighbours).any():
+            kept = rank < self.max_neighbours
+            owner, other, away_x, away_y, squared = [values[kept] for values in (owner, other, away_x, away_y, squared)]
+
+        # deux monstres exactement au même endroit : direction fixe propre à chaque paire
+        stacked = squared == 0
+        if stacked.any():
+            angle = (slots[owner] - among[other]) * 2.399963 # angle d'or
+            away_x = np.where(stacked, np.cos(angle) * 1e-3, away_x)
+            away_y = np.where(stacked, np.sin(angle) * 1e-3, away_y)
+            squared = np.where(stacked, 1e-6, squared)
+
+        distance = np.sqrt(squared)
+        weight = (radius - distance) / (radius * distance) # plus fort quand le voisin est proche
+        return np.stack((np.bincount(owner, weight * away_x, len(slots)),
+                         np.bincount(owner, weight * away_y, len(slots))), axis=1)
+
+    def updateTiers(self, slots):
+        """Choisit le niveau de détail des monstres selon leur distance au joueur.
+        Un monstre ne change de niveau qu'une fois la limite dépassée de self.hysteresis.
+        Args:
+            slots (np.ndarray): emplacements des monstres en vie
+        Returns:
+            None
+        """
+        player = self.game.player.position
+        distance = np.hypot(self.position[slots, 0] - player[0], self.position[slots, 1] - player[1])
+        tier = self.tier[slots].astype(np.int64)
+        lower = np.where(tier > 0, self.limits[tier - 1] - self.hysteresis, -np.inf)
+        upper = self.limits[tier] + self.hysteresis
+        keep = (distance >= lower) & (distance <= upper)
+        new = np.where(keep, tier, np.searchsorted(self.limits, distance)).astype(np.int8)
+        changed = slots[new != tier]
+        self.tier[slots] = new
+        for slot in changed.tolist():
+            self.monsters[slot].setLodTier(int(self.tier[slot]))
+
+    def syncNodes(self, alpha=1.0):
+        """Place les noeuds des monstres entre les deux derniers pas de simulation, une fois par frame.
+        Hors du niveau de détail le plus proche, un noeud n'est replacé qu'après une mise à jour de son monstre.
+        Args:
+            alpha (float): avancement entre le pas précédent (0) et le dernier pas (1)
+        Returns:
+            None
+        """
+        slots = np.flatnonzero(self.used)
+        previous = self.previous_position[slots]
+        position = previous + (self.position[slots] - previous) * alpha
+        turn = (self.heading[slots] - self.previous_heading[slots] + 180) % 360 - 180 # par le plus court chemin
+        heading = (self.previous_heading[slots] + turn * alpha).astype(np.float32)
+        self.render_slots, self.render_position, self.render_heading = slots, position, heading
+        near = self.tier[slots] == 0
+        for slot, (x, y, z), h in zip(slots[near].tolist(), position[near].tolist(), heading[near].tolist()):
+            self.monsters[slot].monster.setPosHpr(x, y, z, h, 0, 0) # écriture dans le graphe de scène, une par monstre
+        others = slots[~near & self.moved[slots]]
+        for slot, (x, y, z), h in zip(others.tolist(), self.position[others].tolist(), self.heading[others].tolist()):
+            self.monsters[slot].monster.setPosHpr(x, y, z, h, 0, 0) # dernière position simulée, sans interpolation
+        self.moved[slots] = False
+
+    def applyGravity(self, dt, slots):
+        """Gravité et maintien au niveau du sol (hauteur du terrain sous l'arrière du monstre).
+        Args:
+            dt (np.ndarray): temps simulé pour chacun des monstres
+            slots (np.ndarray): emplacements des monstres qui se sont déplacés
+        Returns:
+            None
+        """
+        stats = self.stats[self.archetype[slots]]
+        size = stats['size']
+        x = self.position[slots, 0] - 0.5 * size
+        y = self.position[slots, 1]
+        z = self.position[slots, 2]
+        ground = self.game.terrain.getSurfaceLevels(x, y) + size
+        falling = z + stats['gravity'] * dt
+        z = np.where(z > ground, np.where(falling < ground, ground, falling), z) # au-dessus du sol : gravité
+        self.position[slots, 2] = np.where(z <= ground, ground, z) # au niveau du sol
@@ -0,0 +1,116 @@
+#librairies
+from Monster import Monster
+
+
+class MonsterPool():
+    """Réserve de monstres par type : un monstre mort est rangé (stash) au lieu d'être détruit,
+    et le prochain spawn le réutilise au lieu de recharger un modèle et un CollisionNode.
+    """
+    def __init__(self, game):
+        """Initialisation du pool.
+        Args:
+            game (Game): reference vers la classe principale
+        Returns:
+            None
+        """
+        self.game = game # reference vers la partie
+        self.free = {} # monstres rangés, par type
+        self.size = {} # monstres créés (en jeu + rangés), par type
+        self.in_use = 0 # monstres sortis du pool
+        self.hits = 0 # spawns servis par un monstre rangé
+        self.misses = 0 # spawns qui ont dû créer un monstre
+        self.peak = 0 # plus grand nombre de monstres sortis en même temps
+        self.target = {} # monstres voulus par type, créés petit à petit par prewarmStep
+        self.rate = 0.0 # monstres créés par seconde pour atteindre target à temps
+        self.credit = 0.0 # fraction de monstre pas encore créée
+
+    def prewarm(self, monster_type, count):
+        """Crée à l'avance des monstres rangés jusqu'à en avoir count de ce type.
+        Args:
+            monster_type (str): type de monstre
+            count (int): nombre de monstres voulu
+        Returns:
+            None
+        """
+        free = self.free.setdefault(monster_type, [])
+        archetype = self.game.archetypes.monster(monster_type)
+        while self.size.get(monster_type, 0) < count:
+            monster = Monster(self.game, [0, 0, 0], archetype) # position donnée par reset au spawn
+            monster.stash()
+            free.append(monster)
+            self.size[monster_type] = self.size.get(monster_type, 0) + 1
+
+    def reserve(self, counts, duration):
+        """Prépare des monstres rangés sans pic : ils sont créés par prewarmStep, répartis sur duration.
+        Args:
+            counts (dict): nombre de monstres voulu, par type
+            duration (float): temps (s) pour les créer, 0 pour les créer tout de suite
+        Returns:
+            None
+        """
+        for monster_type, count in counts.items():
+            self.target[monster_type] = max(self.target.get(monster_type, 0), count)
+        if duration <= 0:
+            for monster_type, count in self.target.items():
+                self.prewarm(monster_type, count)
+            self.target = {}
+            return
+        self.rate = self.missing() / duration
+        self.credit = 0.0
+
+    def missing(self):
+        """Monstres encore à créer pour atteindre target."""
+        return sum(max(count - self.size.get(monster_type, 0), 0) for monster_type, count in self.target.items())
+
+    def prewarmStep(self, dt):
+        """Crée la part des monstres réservés qui revient à ce pas de simulation.
+        Args:
+            dt (float): durée du pas
+        Returns:
+            int: monstres créés
+        """
+        if not self.target:
+            return 0
+        self.credit += self.rate * dt
+        created = 0
+        for monster_type, count in list(self.target.items()):
+            wanted = min(count, self.size.get(monster_type, 0) + int(self.credit) - created)
+            before = self.size.get(monster_type, 0)
+            self.prewarm(monster_type, wanted)
+            created += self.size.get(monster_type, 0) - before
+            if self.size.get(monster_type, 0) >= count:
+                del self.target[monster_type] # type prêt
+        self.credit -= created
+        return created
+
+    def acquire(self, monster_type, position):
+        """Sort un monstre du pool (ou en crée un si le pool est vide) et le met en jeu.
+        Args:
+            monster_type (str): type de monstre (game.archetypes)
+            position (list): position initiale du monstre [x, y, z]
+        Returns:
+            Monster: monstre en jeu, avec les statistiques de son type
+        """
+        free = self.free.setdefault(monster_type, [])
+        if free:
+            monster = free.pop()
+            monster.reset(position)
+            self.hits += 1
+        else:
+            monster = Monster(self.game, position, self.game.archetypes.monster(monster_type))
+            self.size[monster_type] = self.size.get(monster_type, 0) + 1
+            self.misses += 1
+        self.in_use += 1
+        self.peak = max(self.peak, self.in_use)
+        return monster
+
+    def release(self, monster):
+        """Range un monstre retiré du jeu.
+        Args:
+            monster (Monster): monstre
+        Returns:
+            None
+        """
+        monster.stash()
+        self.free.setdefault(monster.type, []).append(monster)
+        self.in_use -= 1
@@ -0,0 +1,87 @@
+#librairies
+import numpy as np
+
+#librairies panda3d
+from panda3d.core import Texture, GeomEnums, Shader, OmniBoundingVolume
+from direct.actor.Actor import Actor
+
+
+class MonsterRenderer():
+    """Dessine tous les monstres d'un type avec un seul modèle partagé (instanciation matérielle).
+    Le modèle est animé une seule fois ; la position et l'orientation de chaque monstre sont lues
+    par le shader dans un buffer texture rempli à partir des tableaux de MonsterHorde, une fois par frame.
+    """
+    def __init__(self, game, model='monster', animation='marche1', capacity=64):
+        """Initialisation du rendu des monstres.
+        Args:
+            game (Game): reference vers la classe principale
+            model (str): modèle des monstres dans game.assets
+            animation (str): animation jouée par tous les monstres
+            capacity (int): nombre d'instances réservées au départ dans le buffer texture
+        Returns:
+            None
+        """
+        self.game = game # reference vers la partie
+        self.count = 0 # nombre d'instances dessinées
+
+        # modèle partagé, animé une seule fois pour tous les monstres
+        self.model = Actor(game.assets.shared(model))
+        self.model.reparentTo(game.screen.render)
+        self.model.loop(animation)
+        self.model.node().setBounds(OmniBoundingVolume()) # les instances sont partout : pas de culling
+        self.model.node().setFinal(True)
+        self.model.hide()
+        self.parts = self.model.findAllMatches('**/+GeomNode') # parties du modèle, une par appel de dessin
+
+        # positions [x, y, z, heading] des instances
+        self.instances = Texture('monster-instances')
+        self.capacity = 0
+        self.reserve(capacity)
+        self.model.setShader(Shader.load(Shader.SL_GLSL,
+                                         vertex='ressources/shaders/monster_instanced.vert',
+                                         fragment='ressources/shaders/monster_instanced.frag'))
+        self.model.setShaderInput('instances', self.instances)
+
+    def reserve(self, capacity):
+        """Agrandit le buffer texture des instances.
+        Args:
+            capacity (int): nombre d'instances
+        Returns:
+            None
+        """
+        self.instances.setupBufferTexture(capacity, Texture.T_float, Texture.F_rgba32, GeomEnums.UH_dynamic)
+        self.capacity = capacity
+
+    def update(self, horde):
+        """Envoie au shader la position et l'orientation de tous les monstres, telles que placées par horde.syncNodes.
+        Args:
+            horde (MonsterHorde): état des monstres
+        Returns:
+            None
+        """
+        count = len(horde.render_slots)
+        if count == 0:
+            self.model.hide()
+            self.count = 0
+            return
+        if count > self.capacity:
+            self.reserve(max(count, self.capacity * 2))
+        data = np.empty((count, 4), dtype=np.float32)
+        data[:, :3] = horde.render_position
+        data[:, 3] = horde.render_heading
+        memoryview(self.instances.modifyRamImage())[:data.nbytes] = data.tobytes()
+        if count != self.count:
+            for part in self.parts:
+                part.setInstanceCount(count)
+            self.count = count
+        self.model.show()
+
+    def unload(self):
+        """Supprime le modèle partagé.
+        Args:
+            None
+        Returns:
+            None
+        """
+        self.model.cleanup()
+        self.model.removeNode()
@@ -1,13 +1,15 @@
 #librairies
-from math import pi, sin, cos, atan2, degrees
+from math import pi, sin, cos, atan2, degrees, sqrt
 
 #librairies panda3d
 from panda3d.core import CollisionNode, CollisionSphere, CollisionRay, BitMask32
-from panda3d.core import TransparencyAttrib, WindowProperties, CardMaker
+from panda3d.core import TransparencyAttrib, WindowProperties, GraphicsWindow
 from direct.controls.InputState import InputState
 from direct.gui.OnscreenImage import OnscreenImage
 from direct.gui.OnscreenText import OnscreenText
 
+UNARMED_COOLDOWN = 0.5 # temps (s) entre deux attaques sans arme
+
 def degToRad(deg):
     """Convertir des degrés en radiants.
     Args:
@@ -32,13 +34,14 @@ class Player():
         
         self.game = game  # référence vers la classe principale
         self.screen = game.screen # référence vers l'écran de jeu
-        self.input = InputState() # gestion des entrées utilisateur
+        self.input = game.inputs if game.inputs is not None else InputState() # gestion des entrées utilisateur (ou entrées scriptées)
 
         # Infos joueur
         self.health = 100 # santé actuelle du joueur
         self.maxhealth = 100 # santé maximale du joueur
         self.position = position # position du joueur [x,y,z]
         self.is_attacking = False # savoir si le joueur est en train d'attaquer
+        self.is_dead = False # savoir si la mort du joueur a déjà été affichée
         self.weapon = None # arme du joueur
         
         # Physique
@@ -61,20 +64,6 @@ class Player():
         self.cameraSwingActivated = True # savoir si la sourie est dans le jeu ou non
         self.cameraSwingFactor = 10 # facteur de la sourie
 
-        # Fond de la barre de vie
-        cm = CardMaker("fond")
-        cm.setFrame(0, 1, 0, 0.05)
-        self.fond = aspect2d.attachNewNode(cm.generate())
-        self.fond.setPos(-0.5, 0, -0.9)
-        self.fond.setColor(0.2, 0.2, 0.2, 1)
-
-        # Barre de vie
-        cm2 = CardMaker("barre")
-        cm2.setFrame(0, 1, 0, 0.05)
-        self.barre = aspect2d.attachNewNode(cm2.generate())
-        self.barre.setPos(-0.5, 0, -0.9)
-        self.barre.setColor(1, 0, 0, 1)
-
     def setupControls(self):
         """Initialisation des touches de controles.
         Args:
@@ -119,8 +108,9 @@ class Player():
         )
         self.crosshairs.setTransparency(TransparencyAttrib.MAlpha) #afficher le crosshairs
 
-        # Collisions
-        self.setupCollisions()
+        # Collisions (sauf physique calculée sur la grille des hauteurs du terrain)
+        if self.game.playerPhysics is None:
+            self.setupCollisions()
 
     def setupCollisions(self):
         """Initialisation des collitions du joueur.
@@ -159,33 +149,10 @@ class Player():
             self.updateMovement(dt) # on modifie sa position dans l'espace
             self.updateMouseLook(dt) # on modifie sa vision
 
-            # logique pour l'attaque ( a modifier quand y'aura pls monstre )
+            # attaque : coups résolus à la fin du pas, le cooldown est une minuterie (Combat)
             if self.input.isSet("attack") and not self.is_attacking: # si le joueur appuye sur la touche pour attaquer
-                for monster in self.game.monsters:
-                    distance = monster.getDistanceToPlayer() # on regarde la distance
-                    # on regarde si le joueur est a la bonne distance
-                    Is_attack_range = True
-                    for elt in distance:
-                        if self.weapon == None and abs(elt) > 4 * monster.size: # si le joueur n'a pas d'arme
-                            Is_attack_range = False # le monstre est trop loin
-                        elif self.weapon != None and abs(elt) > self.weapon.range * monster.size: # si le joueur a une arme
-                            Is_attack_range = False # le monstre est trop loin
-                    
-                    if Is_attack_range:
-                        self.attaque(monster) # on attaque
-                        self.is_attacking = True # on indique su'il est en train d'attaquer
-                        print("attaque")
-                    self.input.set("attack", False) # On remet a 0 la touche pour pas attaquer
-
-            # logique pour savoir s'il est tjs en train d'attaquer
-            if self.is_attacking:
-                if self.weapon.cooldown <= 0: # si plus de cooldown alors on peut reattaquer
-                    self.is_attacking = False
-                    self.weapon.cooldown = self.weapon.initialCooldown # on remet le cooldown a son etat de depart
-                else:
-                    self.weapon.cooldown -= dt # sinon, on enleve le temps qui c'est passé
-        else:
-            self.died()
+                self.game.combat.post('attack', self)
+                self.input.set("attack", False) # On remet a 0 la touche pour pas attaquer
         
     def updateMovement(self, dt):
         """faire deplacer le joueur.
@@ -195,21 +162,13 @@ class Player():
             None
         """
         # Mouvement horizontal
-        x_movement = 0 # en x
-        y_movement = 0 # en y
-        
-        if self.input.isSet("forward"): # s'il se deplace vers l'avant
-            x_movement -= dt * self.moveSpeed * sin(degToRad(self.screen.camera.getH()))
-            y_movement += dt * self.moveSpeed * cos(degToRad(self.screen.camera.getH()))
-        if self.input.isSet('backward'): # s'il se deplace vers l'arriere
-            x_movement += dt * self.moveSpeed * sin(degToRad(self.screen.camera.getH()))
-            y_movement -= dt * self.moveSpeed * cos(degToRad(self.screen.camera.getH()))
-        if self.input.isSet('left'): # s'il se deplace vers la gauche
-            x_movement -= dt * self.moveSpeed * cos(degToRad(self.screen.camera.getH()))
-            y_movement -= dt * self.moveSpeed * sin(degToRad(self.screen.camera.getH()))
-        if self.input.isSet('right'): # s'il se deplace vers la droite
-            x_movement += dt * self.moveSpeed * cos(degToRad(self.screen.camera.getH()))
-            y_movement += dt * self.moveSpeed * sin(degToRad(self.screen.camera.getH()))
+        heading = degToRad(self.screen.camera.getH()) # direction de la camera, lue une seule fois par pas
+        sin_h, cos_h = sin(heading), cos(heading)
+        forward = self.input.isSet("forward") - self.input.isSet('backward') # 1 vers l'avant, -1 vers l'arriere
+        side = self.input.isSet('right') - self.input.isSet('left') # 1 vers la droite, -1 vers la gauche
+        x_movement = dt * self.moveSpeed * (side * cos_h - forward * sin_h) # en x
+        y_movement = dt * self.moveSpeed * (forward * cos_h + side * sin_h) # en y
+
         if self.input.isSet('exit'): # sortir de la fenetre
             self.releaseMouse()
         if self.input.isSet('enter'): # entrer dans la fenetre
@@ -233,6 +192,10 @@ class Player():
             self.screen.camera.setZ(self.screen.camera.getZ() + 1.5) #uncrouch
             self.IsCrouched = False
 
+        if self.game.playerPhysics is not None:
+            self.updatePhysics(dt, x_movement, y_movement)
+            return
+
         # Application mouvement
         # sur la camera
         self.screen.camera.setPos( 
@@ -266,6 +229,36 @@ class Player():
         self.screen.camera.setZ(newZ) #changer la position Z de la camera
         self.position[2] = newZ #axe Z
 
+    def updatePhysics(self, dt, x_movement, y_movement):
+        """deplacement, gravité et sol calculés sur la grille des hauteurs du terrain (PlayerPhysics).
+        Args:
+            dt (float): temps qui c passer depuis la derniere update
+            x_movement (float): deplacement voulu en x
+            y_movement (float): deplacement voulu en y
+        Returns:
+            None
+        """
+        physics = self.game.playerPhysics
+        x, y, z = self.screen.camera.getPos()
+        x, y = physics.move(x, y, x_movement, y_movement, z - physics.radius) # murs : le joueur glisse le long
+
+        # Gravité
+        self.zVel += self.gravity * dt # changer le velosité sur l'axe Z en fonction de la gravité
+        newZ = z + self.zVel * dt # nouvelle valeur position Z du joueur
+
+        # Detection sol (marches comprises : le sol est le sommet de la plus haute colonne sous le joueur)
+        surfaceZ = physics.floorUnder(x, y, z)
+        if surfaceZ is not None:
+            if z - surfaceZ <= self.height_player and self.zVel <= 0: # on est sur le sol
+                self.onGround = True # le joueur est sur le sol
+                self.zVel = 0.0 # remetre notre velocité d'axe Z a 0
+                newZ = surfaceZ + self.height_player # remetre la position Z du joueur a 0
+            else: # on n'est pas sur le sol
+                self.onGround = False
+
+        self.screen.camera.setPos(x, y, newZ)
+        self.position[0], self.position[1], self.position[2] = x, y, newZ
+
     def updateMouseLook(self, dt):
         """update la vision du joueur
         Args:
@@ -273,7 +266,7 @@ class Player():
         Returns:
             None
         """
-        if not self.cameraSwingActivated:
+        if not self.cameraSwingActivated or not isinstance(self.screen.win, GraphicsWindow):
             return
         # Si la souris est disponible
         # récupérer le mouvement relatif de la souris
@@ -312,6 +305,8 @@ class Player():
             None
         """
         self.cameraSwingActivated = True # activer le mouvement de la camera
+        if not isinstance(self.screen.win, GraphicsWindow):
+            return # rendu hors écran (benchmarks) : pas de souris
         properties = WindowProperties() # creer des proprietes de fenetre
         properties.setCursorHidden(True) # cacher le curseur
         properties.setMouseMode(WindowProperties.M_confined) # confiner la souris dans la fenêtre
@@ -328,6 +323,8 @@ class Player():
             None
         """
         self.cameraSwingActivated = False # desactiver le mouvement de la camera
+        if not isinstance(self.screen.win, GraphicsWindow):
+            return # rendu hors écran (benchmarks) : pas de souris
         properties = WindowProperties() # creer des proprietes de fenetre
         properties.setCursorHidden(False) # afficher le curseur
         properties.setMouseMode(WindowProperties.M_absolute) # liberer la souris
@@ -341,18 +338,34 @@ class Player():
             h = (h + 180.0) % 360.0 - 180.0
         return h
 
-    def attaque(self, target):
-        """attaque du joueur.
+    def getTargets(self):
+        """monstres à portée de l'attaque du joueur.
         Args:
-            target (Target): cible
-        Returns:
             None
+        Returns:
+            list: monstres touchés
         """
-        if target in self.game.monsters:
-            if self.weapon != None:
-                target.changeHealth(self.weapon.degats)
-            else:
-                target.changeHealth(2)
+        range_factor = 4 if self.weapon == None else self.weapon.range # portée en tailles de monstre (4 sans arme)
+        grid = self.game.monsterGrid
+        reach = range_factor * grid.max_size * sqrt(2) # cercle qui contient la zone testée ci-dessous
+        targets = []
+        for monster in grid.queryRadius(self.position[0], self.position[1], reach): # seulement les monstres proches
+            distance = monster.getDistanceToPlayer() # on regarde la distance
+            if all(abs(elt) <= range_factor * monster.size for elt in distance): # le joueur est a la bonne distance
+                targets.append(monster)
+        return targets
+
+    def getDamage(self):
+        """degats d'un coup du joueur (2 sans arme)."""
+        return 2 if self.weapon == None else self.weapon.degats
+
+    def getCooldown(self):
+        """temps entre deux attaques du joueur."""
+        return UNARMED_COOLDOWN if self.weapon == None else self.weapon.initialCooldown
+
+    def endAttack(self):
+        """fin du cooldown : le joueur peut réattaquer (minuterie de Combat)."""
+        self.is_attacking = False
 
     def died(self):
         """logique quand le joueur meurt.
@@ -361,9 +374,9 @@ class Player():
         Returns:
             None
         """
+        self.is_dead = True
         self.crosshairs.destroy() # enlever le crosshairs
-        self.fond.removeNode() # enlever le fond de la barre de vie 
-        self.barre.removeNode() # enlever la barre de vie
+        self.game.hud.hideHealth() # cacher la barre de vie (les coups des monstres peuvent encore la mettre à jour)
 
         self.message = OnscreenText(
             text="Vous etes mort",
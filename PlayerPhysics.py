@@ -0,0 +1,94 @@
+#librairies
+from math import floor
+
+
+class PlayerPhysics():
+    """Collisions du joueur contre le terrain calculées sur la grille des hauteurs, sans CollisionTraverser.
+    La cellule (cell_x, cell_y) est une colonne pleine de côté block_size centrée en (cell_x, cell_y) * block_size,
+    jusqu'à son niveau de surface + block_size / 2, comme les boîtes de collision des blocs.
+    Le joueur est une boîte de demi-côté radius dont le bas est à la hauteur de la caméra - radius (comme la sphère
+    du pusher) : une colonne plus haute l'arrête, une colonne plus basse est une marche qu'il monte.
+    """
+    def __init__(self, terrain, radius=0.5):
+        """Initialisation de la physique du joueur.
+        Args:
+            terrain (Terrain): terrain (grille surfaceGrid ou chunks chargés)
+            radius (float): demi-côté de la boîte du joueur
+        Returns:
+            None
+        """
+        self.terrain = terrain # référence vers le terrain
+        self.block_size = terrain.block_size # côté d'une colonne
+        self.half = terrain.block_size / 2 # le sommet d'une colonne est à son niveau + half
+        self.radius = radius # demi-côté de la boîte du joueur
+        self.gap = 1e-4 # distance laissée entre le joueur et un mur
+
+    def cellAt(self, value):
+        """Indice de la colonne contenant une coordonnée (x ou y)."""
+        return floor(value / self.block_size + 0.5)
+
+    def cellsAcross(self, value):
+        """Colonnes couvertes par la boîte du joueur sur un axe, autour de la coordonnée value."""
+        return range(self.cellAt(value - self.radius + self.gap), self.cellAt(value + self.radius - self.gap) + 1)
+
+    def columnTop(self, cell_x, cell_y):
+        """Hauteur du sommet d'une colonne, None s'il n'y a pas de bloc (hors du terrain ou chunk pas chargé)."""
+        level = self.terrain.getCellLevel(cell_x, cell_y)
+        return None if level is None else level + self.half
+
+    def sweepAxis(self, position, other, delta, bottom, axis):
+        """Déplace la boîte du joueur sur un axe jusqu'à la première colonne qui l'arrête.
+        Les colonnes traversées par le bord avant de la boîte sont testées dans l'ordre (balayage AABB contre colonnes).
+        Args:
+            position (float): coordonnée du joueur sur l'axe du déplacement
+            other (float): coordonnée du joueur sur l'autre axe
+            delta (float): déplacement voulu
+            bottom (float): bas de la boîte du joueur, les colonnes plus hautes l'arrêtent
+            axis (int): 0 pour x, 1 pour y
+        Returns:
+            float: nouvelle coordonnée, contre la face de la colonne si elle arrête le joueur
+        """
+        if delta == 0:
+            return position
+        direction = 1 if delta > 0 else -1
+        edge = position + direction * self.radius # bord avant de la boîte
+        side = self.cellsAcross(other)
+        for cell in range(self.cellAt(edge) + direction, self.cellAt(edge + delta) + direction, direction):
+            for other_cell in side:
+                top = self.columnTop(cell, other_cell) if axis == 0 else self.columnTop(other_cell, cell)
+                if top is not None and top > bottom:
+                    face = cell * self.block_size - direction * self.half # face de la colonne vers le joueur
+                    return face - direction * (self.radius + self.gap)
+        return position + delta
+
+    def move(self, x, y, dx, dy, bottom):
+        """Déplacement horizontal, un axe après l'autre : contre un mur le joueur glisse le long de celui-ci.
+        Args:
+            x (float): position x du joueur
+            y (float): position y du joueur
+            dx (float): déplacement voulu en x
+            dy (float): déplacement voulu en y
+            bottom (float): bas de la boîte du joueur
+        Returns:
+            tuple: nouvelle position (x, y)
+        """
+        x = self.sweepAxis(x, y, dx, bottom, 0)
+        y = self.sweepAxis(y, x, dy, bottom, 1)
+        return x, y
+
+    def floorUnder(self, x, y, z):
+        """Sol sous le joueur : plus haut sommet des colonnes sous sa boîte, en dessous de z.
+        Args:
+            x (float): position x du joueur
+            y (float): position y du joueur
+            z (float): hauteur de la caméra
+        Returns:
+            float: hauteur du sol, None si aucune colonne (le joueur tombe)
+        """
+        floor_z = None
+        for cell_x in self.cellsAcross(x):
+            for cell_y in self.cellsAcross(y):
+                top = self.columnTop(cell_x, cell_y)
+                if top is not None and top <= z and (floor_z is None or top > floor_z):
+                    floor_z = top
+        return floor_z
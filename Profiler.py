@@ -0,0 +1,209 @@
+#librairies
+import csv
+import json
+import time
+import numpy as np
+
+#librairies panda3d
+from panda3d.core import PStatCollector, TextNode
+from direct.gui.OnscreenText import OnscreenText
+
+STAGES = ('terrain', 'collisions', 'player', 'gameManager', 'flowField', 'monsters', 'combat', 'sync', 'hud', 'render') # étapes d'une frame
+COUNTERS = ('solids', 'hudRebuilds') # valeurs comptées par frame (solides de collision actifs sous la racine des collisions, textes du HUD régénérés)
+RENDER_SORT = 50 # ordre de la tâche de rendu de ShowBase (igLoop)
+
+
+def nothing(name):
+    """Profileur désactivé : begin et end ne font rien."""
+
+
+class Profiler():
+    """Temps de chaque étape de la frame, gardés sur les dernières frames (tampon circulaire).
+    Chaque étape a aussi un collecteur PStats ("Game:<étape>", visible avec want-pstats 1 dans settings.prc).
+    Désactivé, begin et end sont remplacés par une fonction vide.
+    Des compteurs (nombre par frame, comme les solides de collision) sont gardés à côté des temps.
+    """
+    def __init__(self, screen, stages=STAGES, size=600, counters=COUNTERS):
+        """Initialisation du profileur.
+        Args:
+            screen (ShowBase): fenêtre du jeu
+            stages (tuple): noms des étapes mesurées
+            size (int): nombre de frames gardées
+            counters (tuple): noms des compteurs
+        Returns:
+            None
+        """
+        self.screen = screen # fenêtre du jeu
+        self.stages = stages # étapes mesurées
+        self.index = {name: i for i, name in enumerate(stages)} # colonne de chaque étape
+        self.samples = np.zeros((size, len(stages) + 1)) # temps (s) par frame et par étape, dernière colonne : frame entière
+        self.row = np.zeros(len(stages) + 1) # frame en cours
+        self.started = [0.0] * len(stages) # début de chaque étape en cours
+        self.collectors = [PStatCollector(f"Game:{name}") for name in stages] # collecteurs PStats
+        self.counters = counters # compteurs par frame
+        self.counterIndex = {name: i for i, name in enumerate(counters)} # colonne de chaque compteur
+        self.counterSamples = np.zeros((size, len(counters))) # valeur de chaque compteur par frame
+        self.counterRow = np.zeros(len(counters)) # compteurs de la frame en cours
+        self.cursor = 0 # prochaine ligne du tampon
+        self.count = 0 # frames enregistrées (au plus size)
+        self.frameStart = None # fin de la frame précédente
+        self.enabled = False # mesures en cours
+        self.begin = nothing # début d'une étape
+        self.end = nothing # fin d'une étape
+        self.overlay = None # texte affiché par-dessus le jeu
+        self.refresh = 0.5 # temps (s) entre deux mises à jour du texte
+        self.lastRefresh = 0 # dernière mise à jour du texte
+
+    def enable(self, overlay=True):
+        """Active les mesures (et l'affichage).
+        Args:
+            overlay (bool): afficher les percentiles à l'écran
+        Returns:
+            None
+        """
+        self.enabled = True
+        self.begin = self.start
+        self.end = self.stop
+        self.frameStart = None
+        self.row[:] = 0
+        self.counterRow[:] = 0
+        # le rendu (igLoop) est encadré par deux tâches juste avant et juste après lui
+        self.screen.taskMgr.add(self.renderStart, 'profilerRenderStart', sort=RENDER_SORT - 1)
+        self.screen.taskMgr.add(self.renderEnd, 'profilerRenderEnd', sort=RENDER_SORT + 1)
+        if overlay:
+            self.overlay = OnscreenText(text="", parent=self.screen.a2dTopLeft, pos=(0.05, -0.07), scale=0.045,
+                                        fg=(1, 1, 1, 1), bg=(0, 0, 0, 0.5), align=TextNode.ALeft, mayChange=True)
+
+    def disable(self):
+        """Arrête les mesures et cache l'affichage (les frames déjà mesurées sont gardées)."""
+        self.enabled = False
+        self.begin = nothing
+        self.end = nothing
+        self.screen.taskMgr.remove('profilerRenderStart')
+        self.screen.taskMgr.remove('profilerRenderEnd')
+        if self.overlay is not None:
+            self.overlay.destroy()
+            self.overlay = None
+
+    def toggle(self):
+        """Active ou désactive le profileur (touche F3)."""
+        if self.enabled:
+            self.disable()
+        else:
+            self.enable()
+
+    def start(self, name):
+        """Début d'une étape."""
+        i = self.index[name]
+        self.collectors[i].start()
+        self.started[i] = time.perf_counter()
+
+    def stop(self, name):
+        """Fin d'une étape, son temps s'ajoute à la frame en cours (une étape peut tourner à chaque pas de simulation)."""
+        i = self.index[name]
+        self.row[i] += time.perf_counter() - self.started[i]
+        self.collectors[i].stop()
+
+    def add(self, name, value):
+        """Ajoute une valeur à un compteur de la frame en cours (une étape peut tourner à chaque pas de simulation)."""
+        self.counterRow[self.counterIndex[name]] += value
+
+    def renderStart(self, task):
+        """Tâche juste avant le rendu."""
+        self.start('render')
+        return task.cont
+
+    def renderEnd(self, task):
+        """Tâche juste après le rendu : fin de la frame."""
+        self.stop('render')
+        self.endFrame()
+        return task.cont
+
+    def endFrame(self):
+        """Enregistre la frame en cours dans le tampon et met à jour l'affichage.
+        Args:
+            None
+        Returns:
+            None
+        """
+        now = time.perf_counter()
+        if self.frameStart is not None: # la première frame n'a pas de début connu
+            self.row[-1] = now - self.frameStart
+            self.samples[self.cursor] = self.row
+            self.counterSamples[self.cursor] = self.counterRow
+            self.cursor = (self.cursor + 1) % len(self.samples)
+            self.count = min(self.count + 1, len(self.samples))
+        self.frameStart = now
+        self.row[:] = 0
+        self.counterRow[:] = 0
+        if self.overlay is not None and now - self.lastRefresh >= self.refresh:
+            self.lastRefresh = now
+            self.overlay.setText(self.report())
+
+    def history(self):
+        """Frames enregistrées, de la plus ancienne à la plus récente.
+        Args:
+            None
+        Returns:
+            np.ndarray: temps (s), une ligne par frame, une colonne par étape puis la frame entière
+        """
+        if self.count < len(self.samples):
+            return self.samples[:self.count]
+        return np.roll(self.samples, -self.cursor, axis=0)
+
+    def percentiles(self):
+        """p50, p95 et p99 de chaque étape et de la frame entière.
+        Args:
+            None
+        Returns:
+            dict: {étape: {"p50": ms, "p95": ms, "p99": ms}}
+        """
+        names = self.stages + ('frame',)
+        if self.count == 0:
+            return {name: {'p50': 0, 'p95': 0, 'p99': 0} for name in names}
+        values = np.percentile(self.samples[:self.count], (50, 95, 99), axis=0) * 1000
+        return {name: {'p50': values[0, i], 'p95': values[1, i], 'p99': values[2, i]} for i, name in enumerate(names)}
+
+    def counterPercentiles(self):
+        """p50, p95 et p99 de chaque compteur.
+        Args:
+            None
+        Returns:
+            dict: {compteur: {"p50": valeur, "p95": valeur, "p99": valeur}}
+        """
+        if self.count == 0:
+            return {name: {'p50': 0, 'p95': 0, 'p99': 0} for name in self.counters}
+        values = np.percentile(self.counterSamples[:self.count], (50, 95, 99), axis=0)
+        return {name: {'p50': values[0, i], 'p95': values[1, i], 'p99': values[2, i]} for i, name in enumerate(self.counters)}
+
+    def report(self):
+        """Texte de l'affichage : une ligne par étape, puis une par compteur utilisé."""
+        lines = [f"{'ms':<12}{'p50':>7}{'p95':>7}{'p99':>7}"]
+        for name, values in self.percentiles().items():
+            lines.append(f"{name:<12}{values['p50']:>7.2f}{values['p95']:>7.2f}{values['p99']:>7.2f}")
+        for name, values in self.counterPercentiles().items():
+            if values['p99'] > 0:
+                lines.append(f"{name:<12}{values['p50']:>7.0f}{values['p95']:>7.0f}{values['p99']:>7.0f}")
+        return "\n".join(lines)
+
+    def export(self, path):
+        """Écrit les frames enregistrées : CSV (une ligne par frame) ou JSON (percentiles et frames) selon l'extension.
+        Args:
+            path (str): fichier de sortie, .csv ou .json
+        Returns:
+            None
+        """
+        history = self.history() * 1000
+        names = list(self.stages) + ['frame']
+        counters = self.counterSamples[:self.count] if self.count < len(self.samples) else np.roll(self.counterSamples, -self.cursor, axis=0)
+        if path.endswith('.csv'):
+            with open(path, 'w', newline='') as file:
+                writer = csv.writer(file)
+                writer.writerow([f"{name} (ms)" for name in names] + list(self.counters))
+                writer.writerows([[f"{value:.4f}" for value in row] + [f"{value:.0f}" for value in counts]
+                                  for row, counts in zip(history, counters)])
+            return
+        with open(path, 'w') as file:
+            json.dump({'stages': names, 'percentiles': self.percentiles(), 'frames': history.round(4).tolist(),
+                       'counters': list(self.counters), 'counterPercentiles': self.counterPercentiles(),
+                       'counterFrames': counters.tolist()}, file)
@@ -0,0 +1,124 @@
+#librairies
+import json
+
+INPUTS = ('forward', 'backward', 'left', 'right', 'jump', 'sprint', 'crouch', 'attack', 'exit', 'enter') # entrées du joueur
+
+
+class ScriptedInput():
+    """Remplace InputState du joueur : les entrées viennent d'un script (ou d'un enregistrement), pas par pas de simulation.
+    Un évènement est {"tick": 12, "input": "forward", "value": true} ou {"tick": 12, "look": [h, p]} (orientation de la caméra).
+    """
+    def __init__(self, events=()):
+        """Initialisation des entrées scriptées.
+        Args:
+            events (list): évènements, dans n'importe quel ordre
+        Returns:
+            None
+        """
+        self.events = sorted(events, key=lambda event: event['tick']) # évènements triés par pas
+        self.index = 0 # prochain évènement à appliquer
+        self.states = {} # état de chaque entrée
+
+    @classmethod
+    def load(cls, path):
+        """Charge un script ou un enregistrement (fichier JSON).
+        Args:
+            path (str): fichier JSON {"seed": ..., "events": [...]}
+        Returns:
+            tuple: (ScriptedInput, seed enregistrée ou None)
+        """
+        with open(path) as file:
+            data = json.load(file)
+        return cls(data['events']), data.get('seed')
+
+    def watchWithModifiers(self, name, key):
+        """Même interface qu'InputState : les touches ne sont pas écoutées, le script les remplace."""
+        self.states.setdefault(name, False)
+
+    def isSet(self, name):
+        """État d'une entrée."""
+        return self.states.get(name, False)
+
+    def set(self, name, value):
+        """Change l'état d'une entrée (ex: le joueur relâche "attack" après une attaque)."""
+        self.states[name] = value
+
+    def advance(self, tick, camera):
+        """Applique les évènements d'un pas de simulation.
+        Args:
+            tick (int): numéro du pas
+            camera (NodePath): caméra du joueur, orientée par les évènements "look"
+        Returns:
+            None
+        """
+        while self.index < len(self.events) and self.events[self.index]['tick'] <= tick:
+            event = self.events[self.index]
+            if 'look' in event:
+                camera.setHpr(event['look'][0], event['look'][1], 0)
+            else:
+                self.states[event['input']] = event['value']
+            self.index += 1
+
+
+class InputRecorder():
+    """Enregistre les entrées du joueur à chaque pas de simulation, pour les rejouer avec ScriptedInput."""
+    def __init__(self, seed):
+        """Initialisation de l'enregistrement.
+        Args:
+            seed (int): seed de la partie enregistrée
+        Returns:
+            None
+        """
+        self.seed = seed # seed de la partie
+        self.events = [] # changements d'entrées
+        self.states = {} # dernier état enregistré de chaque entrée
+        self.look = None # dernière orientation enregistrée de la caméra
+
+    def record(self, tick, inputs, camera):
+        """Enregistre ce qui a changé depuis le pas précédent.
+        Args:
+            tick (int): numéro du pas
+            inputs (InputState): entrées du joueur
+            camera (NodePath): caméra du joueur
+        Returns:
+            None
+        """
+        for name in INPUTS:
+            value = bool(inputs.isSet(name))
+            if self.states.get(name, False) != value:
+                self.events.append({'tick': tick, 'input': name, 'value': value})
+                self.states[name] = value
+        look = [camera.getH(), camera.getP()]
+        if look != self.look:
+            self.events.append({'tick': tick, 'look': look})
+            self.look = look
+
+    def save(self, path):
+        """Écrit l'enregistrement (fichier JSON lisible par ScriptedInput.load).
+        Args:
+            path (str): fichier de sortie
+        Returns:
+            None
+        """
+        with open(path, 'w') as file:
+            json.dump({'seed': self.seed, 'events': self.events}, file)
+
+
+def patrol(ticks, tick_rate=30, leg=2):
+    """Script par défaut des parties sans joueur : fait le tour d'un carré, en boucle, et attaque 3 fois par seconde.
+    Le trajet est fermé : le joueur reste à moins d'un côté (leg secondes de marche, 20 unités pour leg=2) de son
+    point de départ, donc sur le terrain quelle que soit la durée de la partie.
+    Args:
+        ticks (int): nombre de pas de la partie
+        tick_rate (int): pas de simulation par seconde
+        leg (float): durée (s) d'un côté du carré
+    Returns:
+        list: évènements pour ScriptedInput
+    """
+    events = [{'tick': 0, 'input': 'forward', 'value': True}]
+    side = round(leg * tick_rate) # pas par côté
+    for tick in range(0, ticks, side):
+        events.append({'tick': tick, 'look': [tick // side * 90 % 360, 0]})
+    for tick in range(0, ticks, tick_rate // 3):
+        events.append({'tick': tick, 'input': 'attack', 'value': True})
+    return events
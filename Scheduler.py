@@ -0,0 +1,60 @@
+#librairies
+import heapq
+from itertools import count
+
+
+class Scheduler():
+    """Minuteries de la partie (recharges, cooldowns) dans une file de priorité sur le temps de simulation.
+    Une minuterie ne coûte rien tant qu'elle n'est pas échue : chaque pas ne regarde que la plus proche.
+    """
+    def __init__(self):
+        """Initialisation de l'ordonnanceur.
+        Args:
+            None
+        Returns:
+            None
+        """
+        self.now = 0.0 # temps de simulation écoulé
+        self.queue = [] # tas de [échéance, numéro, fonction, arguments]
+        self.counter = count() # départage les échéances égales dans l'ordre de programmation
+        self.fired = 0 # minuteries déclenchées depuis le début
+
+    def __len__(self):
+        return len(self.queue)
+
+    def schedule(self, delay, callback, *args):
+        """Programme l'appel d'une fonction après un délai.
+        Args:
+            delay (float): délai (s) de temps de simulation
+            callback (function): fonction appelée à l'échéance
+            *args: arguments de la fonction
+        Returns:
+            list: minuterie, à passer à cancel pour l'annuler
+        """
+        timer = [self.now + delay, next(self.counter), callback, args]
+        heapq.heappush(self.queue, timer)
+        return timer
+
+    def cancel(self, timer):
+        """Annule une minuterie (elle reste dans le tas mais ne sera pas déclenchée).
+        Args:
+            timer (list): minuterie renvoyée par schedule
+        Returns:
+            None
+        """
+        timer[2] = None
+
+    def advance(self, dt):
+        """Avance le temps et déclenche les minuteries échues, dans l'ordre de leurs échéances.
+        Args:
+            dt (float): durée du pas de simulation
+        Returns:
+            None
+        """
+        self.now += dt
+        queue = self.queue
+        while queue and queue[0][0] <= self.now:
+            _, _, callback, args = heapq.heappop(queue)
+            if callback is not None:
+                self.fired += 1
+                callback(*args)
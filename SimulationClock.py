@@ -0,0 +1,41 @@
+class SimulationClock():
+    """Pas de simulation fixe, indépendant du rendu (accumulateur).
+    Chaque frame ajoute son temps à l'accumulateur, qui est consommé par pas de 1 / tick_rate ;
+    ce qui reste (alpha) sert à interpoler l'affichage entre les deux derniers pas.
+    """
+    def __init__(self, tick_rate=30, max_steps=5):
+        """Initialisation de l'horloge.
+        Args:
+            tick_rate (int): nombre de pas de simulation par seconde
+            max_steps (int): nombre maximum de pas pour rattraper une frame lente
+        Returns:
+            None
+        """
+        self.step = 1 / tick_rate # durée d'un pas
+        self.max_steps = max_steps # au-delà, le retard est abandonné (le jeu ralentit au lieu de geler)
+        self.accumulator = 0 # temps pas encore simulé
+        self.alpha = 0 # avancement entre le dernier pas et le suivant, de 0 à 1
+        self.ticks = 0 # pas simulés depuis le début
+        self.dropped = 0 # temps abandonné par la limite de rattrapage (s)
+
+    def advance(self, frame_dt, tick):
+        """Simule autant de pas fixes que le temps de la frame le permet.
+        Args:
+            frame_dt (float): temps écoulé depuis la frame précédente
+            tick (function): appelée avec la durée d'un pas, une fois par pas
+        Returns:
+            int: nombre de pas simulés pendant cette frame
+        """
+        self.accumulator += frame_dt
+        steps = 0
+        while self.accumulator >= self.step and steps < self.max_steps:
+            tick(self.step)
+            self.accumulator -= self.step
+            self.ticks += 1
+            steps += 1
+        if self.accumulator >= self.step: # trop de retard : on ne garde que la fraction de pas
+            late = self.accumulator - self.accumulator % self.step
+            self.dropped += late
+            self.accumulator -= late
+        self.alpha = self.accumulator / self.step
+        return steps
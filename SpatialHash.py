@@ -0,0 +1,105 @@
+#librairies
+from math import floor
+
+
+class SpatialHash():
+    """Grille uniforme des entités (monstres) pour retrouver rapidement celles proches d'un point."""
+    def __init__(self, cell_size=8):
+        """Initialisation de la grille.
+        Args:
+            cell_size (float): côté d'une cellule de la grille
+        Returns:
+            None
+        """
+        self.cell_size = cell_size # côté d'une cellule
+        self.cells = {} # entités de chaque cellule, par (cell_x, cell_y)
+        self.entries = {} # [x, y, cellule] de chaque entité
+        self.max_size = 0 # plus grande taille d'entité insérée
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, item):
+        return item in self.entries
+
+    def cellAt(self, x, y):
+        """Cellule contenant une position."""
+        return (floor(x / self.cell_size), floor(y / self.cell_size))
+
+    def insert(self, item, x, y, size=0):
+        """Ajoute une entité à la grille.
+        Args:
+            item (object): entité (ex: Monster)
+            x (float): position x
+            y (float): position y
+            size (float): taille de l'entité, pour les requêtes qui en tiennent compte
+        Returns:
+            None
+        """
+        cell = self.cellAt(x, y)
+        self.entries[item] = [x, y, cell]
+        self.cells.setdefault(cell, set()).add(item)
+        self.max_size = max(self.max_size, size)
+
+    def move(self, item, x, y):
+        """Met à jour la position d'une entité ; la grille n'est modifiée que si elle change de cellule.
+        Args:
+            item (object): entité déjà insérée
+            x (float): nouvelle position x
+            y (float): nouvelle position y
+        Returns:
+            None
+        """
+        entry = self.entries[item]
+        entry[0] = x
+        entry[1] = y
+        cell = self.cellAt(x, y)
+        if cell != entry[2]:
+            self.removeFromCell(item, entry[2])
+            self.cells.setdefault(cell, set()).add(item)
+            entry[2] = cell
+
+    def remove(self, item):
+        """Retire une entité de la grille.
+        Args:
+            item (object): entité
+        Returns:
+            None
+        """
+        entry = self.entries.pop(item, None)
+        if entry is not None:
+            self.removeFromCell(item, entry[2])
+
+    def removeFromCell(self, item, cell):
+        """Retire une entité d'une cellule et supprime la cellule si elle est vide."""
+        members = self.cells[cell]
+        members.discard(item)
+        if not members:
+            del self.cells[cell]
+
+    def queryRadius(self, x, y, radius):
+        """Entités à moins de radius (dans le plan x, y) d'un point.
+        Seules les cellules qui touchent le cercle sont visitées.
+        Args:
+            x (float): position x du point
+            y (float): position y du point
+            radius (float): rayon de recherche
+        Returns:
+            list: entités trouvées
+        """
+        min_x, min_y = self.cellAt(x - radius, y - radius)
+        max_x, max_y = self.cellAt(x + radius, y + radius)
+        radius_squared = radius * radius
+        found = []
+        for cell_x in range(min_x, max_x + 1):
+            for cell_y in range(min_y, max_y + 1):
+                members = self.cells.get((cell_x, cell_y))
+                if not members:
+                    continue
+                for item in members:
+                    entry = self.entries[item]
+                    dx = entry[0] - x
+                    dy = entry[1] - y
+                    if dx * dx + dy * dy <= radius_squared:
+                        found.append(item)
+        return found
@@ -0,0 +1,171 @@
+#librairies
+import heapq
+from itertools import count
+import numpy as np
+
+
+class SpawnPlanner():
+    """Programme des apparitions d'une vague, calculé en entier quand la vague commence.
+    Chaque entrée (temps, type, position) est tirée d'avance : les positions viennent d'une table des cellules de
+    surface praticables, loin du joueur. Pendant la vague, chaque pas ne sort de la file de priorité que les
+    entrées échues. Le programme reste lisible (schedule) et peut être rejoué tel quel (replay).
+    """
+    def __init__(self, terrain, seed=None, min_distance=20, step_limit=1, interval=3.0, retry=1.0):
+        """Initialisation du planificateur.
+        Args:
+            terrain (Terrain): terrain (grille surfaceGrid, ou chunks chargés du monde infini)
+            seed (int): seed des tirages, même seed : mêmes programmes
+            min_distance (float): distance minimale au joueur d'une apparition
+            step_limit (int): hauteur maximale (en blocs) d'une marche, comme FlowField
+            interval (float): temps maximum (s) entre deux apparitions
+            retry (float): délai (s) d'une apparition sans cellule praticable chargée, avant de réessayer
+        Returns:
+            None
+        """
+        self.terrain = terrain # référence vers le terrain
+        self.rng = np.random.default_rng(seed) # tirages des programmes
+        self.min_distance = min_distance # distance minimale au joueur
+        self.step = step_limit * terrain.block_size # marche maximale (unités)
+        self.interval = interval # temps maximum entre deux apparitions
+        self.retry = retry # délai d'une apparition sans cellule praticable
+        self.drop = 2 * terrain.block_size # hauteur d'apparition au-dessus de la surface (le monstre tombe au sol)
+        self.cells = None # table des cellules praticables : positions [x, y, z], une ligne par cellule
+        self.time = 0.0 # temps écoulé depuis le début de la vague
+        self.queue = [] # tas de (temps, numéro, type, position) des apparitions à venir
+        self.counter = count() # départage les temps égaux dans l'ordre du programme
+        self.schedule = [] # programme de la vague en cours : (temps, type, position)
+        self.redraws = 0 # positions tirées à nouveau (joueur trop proche, chunk déchargé)
+        self.delays = 0 # apparitions repoussées faute de cellule praticable chargée
+
+    def __len__(self):
+        return len(self.queue)
+
+    def walkable(self, levels):
+        """Cellules praticables d'une grille de niveaux : un monstre peut en sortir vers au moins un voisin droit.
+        Args:
+            levels (np.ndarray): niveaux de surface (unités), indexés par [x, y]
+        Returns:
+            np.ndarray: masque des cellules praticables
+        """
+        padded = np.full((levels.shape[0] + 2, levels.shape[1] + 2), np.iinfo(np.int32).max // 2, dtype=np.int64) # bord infranchissable
+        padded[1:-1, 1:-1] = levels
+        width, length = levels.shape
+        mask = np.zeros(levels.shape, dtype=bool)
+        for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+            mask |= padded[1 + dx:width + 1 + dx, 1 + dy:length + 1 + dy] - levels <= self.step
+        return mask
+
+    def buildCells(self):
+        """Table des positions des cellules praticables : grille entière une seule fois, chunks chargés sinon.
+        Args:
+            None
+        Returns:
+            np.ndarray: positions [x, y, z], une ligne par cellule
+        """
+        terrain = self.terrain
+        if not terrain.streaming:
+            if self.cells is None:
+                self.cells = self.cellPositions(terrain.surfaceGrid, 0, 0)
+            return self.cells
+        tables = [self.cellPositions(surface, key[0] * terrain.chunk_size, key[1] * terrain.chunk_size)
+                  for key, surface in terrain.chunk_surfaces.items()] # le monde infini change avec le joueur
+        return np.concatenate(tables) if tables else np.zeros((0, 3))
+
+    def cellPositions(self, levels, first_x, first_y):
+        """Positions d'apparition des cellules praticables d'une grille de niveaux.
+        Args:
+            levels (np.ndarray): niveaux de surface (unités), indexés par [x, y]
+            first_x, first_y (int): indices de la première cellule de la grille
+        Returns:
+            np.ndarray: positions [x, y, z]
+        """
+        cells_x, cells_y = np.nonzero(self.walkable(levels))
+        size = self.terrain.block_size
+        return np.column_stack(((cells_x + first_x) * size, (cells_y + first_y) * size,
+                                levels[cells_x, cells_y] + self.drop)).astype(np.float64)
+
+    def positions(self, count, player):
+        """Tire count positions d'apparition loin du joueur.
+        Args:
+            count (int): nombre de positions
+            player (tuple): position (x, y) du joueur, None pour ne pas en tenir compte
+        Returns:
+            np.ndarray: positions [x, y, z], une ligne par apparition, aucune si aucune cellule praticable n'est chargée
+        """
+        cells = self.buildCells()
+        if player is not None:
+            far = np.hypot(cells[:, 0] - player[0], cells[:, 1] - player[1]) >= self.min_distance
+            if far.any(): # sinon (terrain trop petit) toutes les cellules restent possibles
+                cells = cells[far]
+        if len(cells) == 0:
+            return np.zeros((0, 3)) # pas de position par défaut : l'origine peut être dans le terrain
+        return cells[self.rng.integers(len(cells), size=count)]
+
+    def plan(self, count, delay, kinds, player=None):
+        """Calcule le programme complet d'une vague et remplace le précédent.
+        Args:
+            count (int): nombre de monstres de la vague
+            delay (float): temps (s) avant la première apparition
+            kinds (list): types de monstres possibles
+            player (tuple): position (x, y) du joueur au début de la vague
+        Returns:
+            list: programme de la vague, (temps, type, position) par apparition ; position None si aucune cellule
+                n'était chargée, elle est alors tirée à la sortie (pop)
+        """
+        times = delay + np.concatenate(([0.0], np.cumsum(self.interval * self.rng.random(max(count - 1, 0)))))[:count]
+        chosen = self.rng.integers(len(kinds), size=count)
+        positions = self.positions(count, player)
+        positions = [tuple(position) for position in positions.tolist()] if len(positions) else [None] * count
+        return self.replay([(float(time), kinds[kind], position)
+                            for time, kind, position in zip(times.tolist(), chosen.tolist(), positions)])
+
+    def replay(self, schedule):
+        """Remplace le programme en cours par un programme donné (calculé par plan, ou enregistré).
+        Args:
+            schedule (list): (temps, type, position) par apparition, temps depuis le début de la vague
+        Returns:
+            list: le programme
+        """
+        self.time = 0.0
+        self.schedule = list(schedule)
+        self.queue = [(time, next(self.counter), kind, position) for time, kind, position in self.schedule]
+        heapq.heapify(self.queue)
+        return self.schedule
+
+    def advance(self, dt):
+        """Avance le temps de la vague.
+        Args:
+            dt (float): durée du pas de simulation
+        Returns:
+            None
+        """
+        self.time += dt
+
+    def isDue(self):
+        """La prochaine apparition est-elle échue ?"""
+        return bool(self.queue) and self.queue[0][0] <= self.time
+
+    def isLoaded(self, position):
+        """La cellule d'une position est-elle encore chargée ? (toujours vrai hors du monde infini)"""
+        terrain = self.terrain
+        return not terrain.streaming or terrain.chunkAt(position[0], position[1]) in terrain.chunk_surfaces
+
+    def pop(self, player=None):
+        """Sort la prochaine apparition échue. Une autre position est tirée si le joueur s'en est approché ou si son
+        chunk a été déchargé depuis le programme ; sans aucune cellule praticable chargée, l'apparition est repoussée.
+        Args:
+            player (tuple): position (x, y) actuelle du joueur, None pour ne pas en tenir compte
+        Returns:
+            tuple: (type, position [x, y, z]), None si l'apparition est repoussée de retry secondes
+        """
+        _, _, kind, position = heapq.heappop(self.queue)
+        if (position is None or not self.isLoaded(position) or (player is not None and
+                np.hypot(position[0] - player[0], position[1] - player[1]) < self.min_distance)):
+            drawn = self.positions(1, player)
+            if len(drawn) == 0:
+                heapq.heappush(self.queue, (self.time + self.retry, next(self.counter), kind, None)) # réessayée plus tard
+                self.delays += 1
+                return None
+            position = tuple(drawn[0].tolist())
+            self.redraws += 1
+        return kind, list(position)
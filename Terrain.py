@@ -1,17 +1,32 @@
 #librairies
 import random
-from perlin_noise import PerlinNoise
+import time
+import multiprocessing
+from math import ceil
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, BrokenExecutor
+import numpy as np
+import TerrainNoise
+import TerrainChunk
+import TerrainCache
 
 #librairies panda3d
-from panda3d.core import CollisionNode, CollisionBox, BitMask32
+from panda3d.core import CollisionNode, CollisionBox, BitMask32, BoundingVolume, NodePath
+from direct.directnotify.DirectNotifyGlobal import directNotify
+
+notify = directNotify.newCategory("Terrain")
 
 class Terrain():
     """Classe représentant le terrain."""
-    def __init__(self, game, blocks):
+    def __init__(self, game, blocks, mode="chunks", streaming=False, bake_geometry=False, seed=None):
         """Initialisation du terrain.
         Args:
             game (Game): reference vers la classe principale
             blocks (dict): dictionnaire avec les blocks du jeu
+            mode (str): "chunks" pour un maillage fusionné par chunk, "blocks" pour un noeud par bloc
+            streaming (bool): monde infini, chunks chargés autour du joueur (mode "chunks" uniquement)
+            bake_geometry (bool): garder aussi les maillages des chunks dans le cache disque (.bam)
+            seed (int): seed du bruit Perlin, tirée au hasard si None
         Returns:
             None
         """
@@ -24,12 +39,44 @@ class Terrain():
         self.terrain_length = 75
         self.max_height = 10
         self.block_size = 2
+        self.mode = mode # mode d'affichage du terrain
+        self.chunk_size = 16 # nombre de colonnes par côté d'un chunk
+        self.streaming = streaming and mode == "chunks" # monde infini généré autour du joueur
+        self.view_radius = 3 # rayon (en chunks) des chunks affichés autour du joueur
+        self.max_chunks = 64 # nombre maximum de chunks gardés en mémoire (cache LRU)
+        self.max_chunk_loads = 2 # nombre maximum de chunks générés par frame sans workers
+        self.worker_mode = "thread" # génération des chunks : "thread", "process" ou None (dans la boucle de rendu)
+        self.worker_count = 2 # nombre de workers de génération
+        self.attach_budget = 0.004 # temps maximum (s) par frame pour attacher les chunks générés
+        self.ground_loads = 0 # chunks sous le joueur chargés tout de suite parce que les workers ne les avaient pas encore rendus
         
         # Seed pour la génération aléatoire reproductible
-        self.seed = random.randint(0, 10000)
-        self.noise = PerlinNoise(octaves=0.6, seed=self.seed)
+        self.seed = seed if seed is not None else random.randint(1, 10000) # 0 est remplacé par une seed aléatoire dans perlin_noise
+        self.octaves = 0.6 # octaves du bruit Perlin
+        self.noise_scale = 0.1 # facteur entre indice de cellule et coordonnée du bruit
         
         self.terrain_blocks = []  # Liste pour garder track des blocks
+        self.terrain_node = None # noeud racine du terrain
+        self.chunk_nodes = {} # noeud de chaque chunk, par (chunk_x, chunk_y)
+        self.chunk_colliders = {} # noeud de collision de chaque chunk, par (chunk_x, chunk_y)
+        self.collision_root = NodePath('terrain-collisions') # collisions actives, placé sous la racine des collisions de la partie
+        self.collision_root.node().setBoundsType(BoundingVolume.BT_box)
+        self.collision_radius = 1 # rayon (en chunks) autour du joueur où les collisions sont actives
+        self.active_colliders = set() # chunks dont la collision est active
+        self.collider_solids = {} # solides de collision de chaque chunk
+        self.active_solids = 0 # solides sous collision_root, tenu à jour sans parcourir le graphe
+        self.collision_center = None # chunk du joueur lors de la dernière mise à jour des collisions
+        self.block_template = None # faces du bloc utilisées pour les maillages des chunks
+        self.chunk_surfaces = {} # niveaux de surface de chaque chunk chargé (streaming)
+        self.chunk_lru = OrderedDict() # chunks chargés, du moins au plus récemment utilisé (streaming)
+        self.visible_chunks = set() # chunks affichés (streaming)
+        self.streaming_center = None # chunk du joueur lors de la dernière mise à jour du streaming
+        self.pending_chunks = False # des chunks proches restent à générer (streaming)
+        self.cache = TerrainCache.TerrainCache() # cache disque des terrains déjà générés, None pour le désactiver
+        self.bake_geometry = bake_geometry # garder aussi les maillages des chunks dans le cache (.bam)
+        self.chunk_jobs = {} # générations en cours dans les workers, par chunk (streaming)
+        self.worker_pool = None # pool de workers, créé au premier chunk
+        self.surfaceGrid = np.zeros((0, 0), dtype=np.int32) # grille des niveaux de surface, indexée par [x, y] de cellule
         self.generateTerrain()
 
     def generateTerrain(self):
@@ -41,15 +88,21 @@ class Terrain():
         """
         # Créer un dossier pour le terrain
         terrain_node = self.screen.render.attachNewNode('terrain')
+        self.terrain_node = terrain_node
+        if self.streaming:
+            return # les chunks sont générés par updateStreaming autour du joueur
+
+        # Calculer toutes les hauteurs (0 à max_height) avec le bruit Perlin en une fois
+        self.surfaceGrid = self.loadSurface() # memmap du cache, utilisée telle quelle sans copie
+        if self.mode == "chunks":
+            if not self.loadBakedChunks():
+                self.buildChunks(self.surfaceGrid // self.block_size) # un seul maillage et un seul noeud de collision par chunk
+                self.saveBakedChunks()
+            return
         
         for y in range(self.terrain_length):
             for x in range(self.terrain_width):
-                # Calculer la hauteur avec le bruit Perlin
-                noise_value = self.noise([x * 0.1, y * 0.1])
-                
-                # Convertir en hauteur entière (0 à max_height)
-                height = int((noise_value + 1) / 2 * self.max_height)
-                height = max(0, min(height, self.max_height))
+                height = int(self.surfaceGrid[x, y]) // self.block_size
                 
                 # Créer le noeud du bloc
                 block_node = terrain_node.attachNewNode(f'block_{x}_{y}_{height}')
@@ -68,20 +121,377 @@ class Terrain():
                     'type': 'grassBlock'
                 })
 
+    def cacheKey(self, **extra):
+        """Clé du terrain dans le cache : seed, dimensions, paramètres du bruit.
+        Args:
+            extra: paramètres supplémentaires (ex: ceux du maillage)
+        Returns:
+            str: clé de l'entrée
+        """
+        return self.cache.makeKey(seed=self.seed, width=self.terrain_width, length=self.terrain_length,
+                                  max_height=self.max_height, octaves=self.octaves, scale=self.noise_scale, **extra)
+
+    def loadSurface(self):
+        """Niveaux de surface du terrain, lus en mémoire mappée depuis le cache ou générés puis enregistrés.
+        Le cache garde les niveaux déjà multipliés par block_size pour que la grille serve sans copie.
+        Args:
+            None
+        Returns:
+            np.ndarray: niveaux de surface (hauteur en blocs * block_size), indexés par [x, y]
+        """
+        key = None if self.cache is None else self.cacheKey(block_size=self.block_size)
+        levels = None if key is None else self.cache.loadHeights(key)
+        if levels is None:
+            heights = TerrainNoise.generateHeights(self.seed, self.terrain_width, self.terrain_length,
+                                                   self.max_height, self.octaves, self.noise_scale)
+            levels = heights * self.block_size
+            if key is not None:
+                self.cache.saveHeights(key, levels)
+        return levels
+
+    def bakeKey(self):
+        """Clé des maillages cuits du terrain dans le cache."""
+        return self.cacheKey(chunk_size=self.chunk_size, block_size=self.block_size, geometry="chunks")
+
+    def blockModelPath(self):
+        """Fichier du modèle du bloc, les maillages cuits sont périmés s'il change."""
+        return self.blocks['grassBlock'].node().getFullpath().toOsSpecific()
+
+    def loadBakedChunks(self):
+        """Charge les maillages et collisions des chunks depuis le cache (.bam).
+        Args:
+            None
+        Returns:
+            bool: True si le terrain a été chargé depuis le cache
+        """
+        if self.cache is None or not self.bake_geometry:
+            return False
+        baked = self.cache.loadBam(self.bakeKey(), self.screen.loader, self.blockModelPath())
+        if baked is None:
+            return False
+        for chunk_node in baked.findAllMatches('**/chunk_*'):
+            key = tuple(int(index) for index in chunk_node.getName().split('_')[1:])
+            chunk_node.reparentTo(self.terrain_node)
+            self.chunk_nodes[key] = chunk_node
+            self.chunk_colliders[key] = chunk_node.find('block-collision;+s') # collision restée désactivée (stash)
+            self.chunk_colliders[key].node().setBoundsType(BoundingVolume.BT_box)
+            self.collider_solids[key] = self.chunk_colliders[key].node().getNumSolids()
+        baked.removeNode()
+        return True
+
+    def saveBakedChunks(self):
+        """Enregistre les maillages et collisions des chunks dans le cache (.bam).
+        Args:
+            None
+        Returns:
+            None
+        """
+        if self.cache is not None and self.bake_geometry:
+            self.cache.saveBam(self.bakeKey(), self.terrain_node, self.blockModelPath())
+
+    def buildChunks(self, heights):
+        """Construit un GeomNode et un CollisionNode par chunk de chunk_size x chunk_size colonnes.
+        Les faces cachées entre deux colonnes voisines de même hauteur ne sont pas générées.
+        Les collisions restent désactivées (stash) jusqu'à ce que le joueur s'approche du chunk.
+        Args:
+            heights (np.ndarray): hauteurs en blocs, indexées par [x, y]
+        Returns:
+            None
+        """
+        padded = np.full((heights.shape[0] + 2, heights.shape[1] + 2), -1, dtype=np.int32) # bordure sans voisin
+        padded[1:-1, 1:-1] = heights
+        for chunk_x in range(0, self.terrain_width, self.chunk_size):
+            for chunk_y in range(0, self.terrain_length, self.chunk_size):
+                key = (chunk_x // self.chunk_size, chunk_y // self.chunk_size)
+                self.attachChunk(key, padded[chunk_x:chunk_x + self.chunk_size + 2, chunk_y:chunk_y + self.chunk_size + 2])
+
+    def attachChunk(self, key, levels, vertices=None, indices=None, quads=None):
+        """Crée le maillage et la collision d'un chunk et les attache au terrain.
+        Les tableaux de sommets et de collision sont calculés ici s'ils ne viennent pas d'un worker.
+        Args:
+            key (tuple): indices (chunk_x, chunk_y) du chunk
+            levels (np.ndarray): hauteurs en blocs du chunk avec une bordure d'une cellule, -1 si pas de voisin
+            vertices, indices (np.ndarray): maillage déjà calculé (optionnel)
+            quads (np.ndarray): quadrilatères de collision déjà calculés (optionnel)
+        Returns:
+            None
+        """
+        template = self.getBlockTemplate()
+        chunk_x, chunk_y = key[0] * self.chunk_size, key[1] * self.chunk_size # première cellule du chunk
+        chunk_node = self.terrain_node.attachNewNode(f'chunk_{key[0]}_{key[1]}')
+
+        # Maillage
+        if vertices is None:
+            vertices, indices = TerrainChunk.buildChunkArrays(template.faces, levels, chunk_x, chunk_y, self.block_size)
+        chunk_node.attachNewNode(TerrainChunk.makeGeomNode('chunk-mesh', vertices, indices, template.state))
+
+        # Collision
+        if quads is None:
+            quads = TerrainChunk.buildCollisionQuads(levels, chunk_x, chunk_y, self.block_size)
+        collider = chunk_node.attachNewNode(TerrainChunk.makeCollisionNode('block-collision', quads, self.game.worldMask))
+        collider.node().setBoundsType(BoundingVolume.BT_box) # boîte serrée autour du chunk plutôt qu'une sphère
+        collider.stash() # gardée avec le chunk (cache .bam), activée par updateCollisions
+
+        self.chunk_nodes[key] = chunk_node
+        self.chunk_colliders[key] = collider
+        self.collider_solids[key] = collider.node().getNumSolids()
+        if self.collision_center is not None and self.isNear(key, self.collision_center, self.collision_radius):
+            collider.reparentTo(self.collision_root) # chunk chargé à côté du joueur
+            self.active_colliders.add(key)
+            self.active_solids += self.collider_solids[key]
+
+    def getBlockTemplate(self):
+        """Faces du bloc utilisées pour les maillages, lues une seule fois dans le modèle."""
+        if self.block_template is None:
+            self.block_template = TerrainChunk.BlockTemplate(self.blocks['grassBlock'])
+        return self.block_template
+
+    def loadChunk(self, key, generated=None):
+        """Ajoute un chunk du monde infini, généré ici à partir de la seed ou fourni par un worker.
+        Args:
+            key (tuple): indices (chunk_x, chunk_y) du chunk
+            generated (tuple): résultat de TerrainChunk.generateChunk (optionnel)
+        Returns:
+            None
+        """
+        if generated is None:
+            generated = TerrainChunk.generateChunk(*self.chunkJobArgs(key))
+        levels, vertices, indices, quads = generated
+        self.chunk_surfaces[key] = levels[1:-1, 1:-1] * self.block_size
+        self.attachChunk(key, levels, vertices, indices, quads)
+        self.chunk_lru[key] = True
+
+    def chunkJobArgs(self, key):
+        """Arguments de TerrainChunk.generateChunk pour un chunk."""
+        return (self.getBlockTemplate().faces, key, self.chunk_size, self.block_size,
+                self.seed, self.max_height, self.octaves, self.noise_scale)
+
+    def submitChunk(self, key):
+        """Confie la génération d'un chunk (bruit, maillage, collision) au pool de workers.
+        Args:
+            key (tuple): indices (chunk_x, chunk_y) du chunk
+        Returns:
+            None
+        """
+        if self.worker_pool is None:
+            if self.worker_mode == "process":
+                context = multiprocessing.get_context("spawn") # pas de fork du processus qui tient le contexte graphique
+                self.worker_pool = ProcessPoolExecutor(self.worker_count, mp_context=context)
+            else:
+                self.worker_pool = ThreadPoolExecutor(self.worker_count, thread_name_prefix="terrain")
+        self.chunk_jobs[key] = self.worker_pool.submit(TerrainChunk.generateChunk, *self.chunkJobArgs(key))
+
+    def attachFinishedChunks(self, center):
+        """Attache les chunks générés par les workers, dans la limite de attach_budget par frame.
+        Args:
+            center (tuple): chunk du joueur
+        Returns:
+            None
+        """
+        start = time.perf_counter()
+        for key, job in list(self.chunk_jobs.items()): # dans l'ordre de soumission, les plus proches d'abord
+            if not job.done():
+                continue
+            del self.chunk_jobs[key]
+            if job.cancelled() or not self.isNear(key, center, self.view_radius + 1):
+                continue # le joueur est parti entre temps
+            try:
+                generated = job.result()
+            except BrokenExecutor as error: # BrokenProcessPool, BrokenThreadPool ; les autres erreurs remontent
+                if self.worker_pool is not None:
+                    notify.warning(f"pool de workers inutilisable ({error!r}), génération dans la boucle de rendu")
+                    self.worker_pool.shutdown(wait=False, cancel_futures=True)
+                    self.worker_pool = None
+                self.worker_mode = None # les chunks restants sont générés dans la boucle de rendu
+                self.pending_chunks = True
+                continue
+            self.loadChunk(key, generated)
+            if self.isNear(key, center, self.view_radius):
+                self.visible_chunks.add(key)
+            else:
+                self.chunk_nodes[key].stash() # arrivé trop tard, gardé en cache
+                self.chunk_lru.move_to_end(key, last=False)
+            if time.perf_counter() - start > self.attach_budget:
+                break # la suite à la prochaine frame
+        while len(self.chunk_lru) > self.max_chunks:
+            self.evictChunk(next(iter(self.chunk_lru))) # le moins récemment utilisé
+
+    def ensureGround(self, center):
+        """Charge tout de suite, hors attach_budget, les chunks sous le joueur et autour (collision_radius) qui
+        manquent encore : sans eux PlayerPhysics ne trouve pas de sol et le joueur tombe à travers le monde.
+        Un chunk pas encore commencé par un worker est généré ici ; s'il est en cours, son résultat est attendu.
+        Args:
+            center (tuple): chunk du joueur
+        Returns:
+            None
+        """
+        for chunk_x in range(center[0] - self.collision_radius, center[0] + self.collision_radius + 1):
+            for chunk_y in range(center[1] - self.collision_radius, center[1] + self.collision_radius + 1):
+                key = (chunk_x, chunk_y)
+                if key in self.chunk_nodes:
+                    continue
+                generated = None
+                job = self.chunk_jobs.pop(key, None)
+                if job is not None and not job.cancel(): # déjà commencé (ou fini) : attendre le worker
+                    try:
+                        generated = job.result()
+                    except BrokenExecutor:
+                        generated = None # pool cassé : généré ici, attachFinishedChunks s'occupe du pool
+                self.loadChunk(key, generated)
+                self.visible_chunks.add(key)
+                self.ground_loads += 1
+
+    def evictChunk(self, key):
+        """Retire un chunk du monde infini : noeuds supprimés, collision détachée.
+        Args:
+            key (tuple): indices (chunk_x, chunk_y) du chunk
+        Returns:
+            None
+        """
+        self.chunk_nodes.pop(key).removeNode()
+        self.chunk_colliders.pop(key).removeNode() # encore sous collision_root si elle était active
+        solids = self.collider_solids.pop(key)
+        if key in self.active_colliders:
+            self.active_solids -= solids
+        self.chunk_surfaces.pop(key)
+        self.chunk_lru.pop(key)
+        self.active_colliders.discard(key)
+        self.visible_chunks.discard(key)
+
+    def updateStreaming(self, x, y):
+        """Charge les chunks autour de la position donnée et décharge les plus anciens.
+        La génération est confiée aux workers si worker_mode est défini ; seul l'attachement au graphe
+        de scène se fait ici. Les chunks hors de view_radius sont cachés mais gardés en cache tant que
+        max_chunks n'est pas atteint.
+        Args:
+            x (float): position x du joueur
+            y (float): position y du joueur
+        Returns:
+            None
+        """
+        center = self.chunkAt(x, y)
+        if self.chunk_jobs:
+            self.attachFinishedChunks(center)
+        self.ensureGround(center)
+        if center == self.streaming_center and not self.pending_chunks:
+            return
+        self.streaming_center = center
+
+        # chunks voulus, du plus proche au plus loin
+        wanted = []
+        for chunk_x in range(center[0] - self.view_radius, center[0] + self.view_radius + 1):
+            for chunk_y in range(center[1] - self.view_radius, center[1] + self.view_radius + 1):
+                wanted.append((chunk_x, chunk_y))
+        wanted.sort(key=lambda key: max(abs(key[0] - center[0]), abs(key[1] - center[1])))
+
+        for key, job in list(self.chunk_jobs.items()):
+            if not self.isNear(key, center, self.view_radius) and job.cancel():
+                del self.chunk_jobs[key] # plus voulu et pas encore commencé
+
+        loads = 0
+        self.pending_chunks = False
+        visible = set()
+        for key in wanted:
+            if key in self.chunk_jobs:
+                continue # en cours de génération
+            if key not in self.chunk_nodes:
+                if self.worker_mode is not None:
+                    self.submitChunk(key)
+                    continue
+                if loads >= self.max_chunk_loads:
+                    self.pending_chunks = True # à générer lors des prochaines frames
+                    continue
+                self.loadChunk(key)
+                loads += 1
+            elif key not in self.visible_chunks:
+                self.chunk_nodes[key].unstash() # chunk encore en cache
+            self.chunk_lru.move_to_end(key) # le plus récemment utilisé
+            visible.add(key)
+        for key in self.visible_chunks - visible:
+            self.chunk_nodes[key].stash() # trop loin : plus affiché
+        self.visible_chunks = visible
+
+        while len(self.chunk_lru) > self.max_chunks:
+            self.evictChunk(next(iter(self.chunk_lru))) # le moins récemment utilisé
+
+    def update(self, x, y):
+        """Mise à jour du terrain autour du joueur (streaming et collisions actives).
+        Args:
+            x (float): position x du joueur
+            y (float): position y du joueur
+        Returns:
+            None
+        """
+        if self.streaming:
+            self.updateStreaming(x, y)
+        self.updateCollisions(x, y)
+
+    def chunkAt(self, x, y):
+        """Indices du chunk contenant une position.
+        Args:
+            x (float): position x
+            y (float): position y
+        Returns:
+            tuple: (chunk_x, chunk_y)
+        """
+        chunk_width = self.chunk_size * self.block_size
+        return (int((x + self.block_size / 2) // chunk_width), int((y + self.block_size / 2) // chunk_width))
+
+    def isNear(self, key, center, radius):
+        """Savoir si un chunk est à moins de radius chunks d'un autre."""
+        return abs(key[0] - center[0]) <= radius and abs(key[1] - center[1]) <= radius
+
+    def updateCollisions(self, x, y):
+        """Active les collisions des chunks proches de la position donnée et désactive les autres.
+        Les collisions actives sont sous collision_root, seul sous-graphe du terrain parcouru par le CollisionTraverser ;
+        les autres en sont détachées. Ne fait rien tant que la position reste dans le même chunk.
+        Args:
+            x (float): position x (en général celle du joueur)
+            y (float): position y
+        Returns:
+            None
+        """
+        center = self.chunkAt(x, y)
+        if center == self.collision_center:
+            return
+        self.collision_center = center
+
+        near = set()
+        for chunk_x in range(center[0] - self.collision_radius, center[0] + self.collision_radius + 1):
+            for chunk_y in range(center[1] - self.collision_radius, center[1] + self.collision_radius + 1):
+                if (chunk_x, chunk_y) in self.chunk_colliders:
+                    near.add((chunk_x, chunk_y))
+        for key in self.active_colliders - near:
+            self.chunk_colliders[key].detachNode() # trop loin : hors du sous-graphe parcouru
+            self.active_solids -= self.collider_solids[key]
+        for key in near - self.active_colliders:
+            self.chunk_colliders[key].reparentTo(self.collision_root)
+            self.active_solids += self.collider_solids[key]
+        self.active_colliders = near
 
     def addBlockCollision(self, block_node):
-        """Ajoute une collision à un bloc.
+        """Ajoute une collision à un bloc, rangée dans le groupe de collisions de son chunk.
         args:
             block_node (NodePath): le noeud du bloc auquel ajouter la collision
         Returns:
             None
         """
+        key = self.chunkAt(block_node.getX(), block_node.getY())
+        group = self.chunk_colliders.get(key)
+        if group is None:
+            group = NodePath(f'collision_{key[0]}_{key[1]}') # activé par updateCollisions, comme la collision d'un chunk
+            group.node().setBoundsType(BoundingVolume.BT_box)
+            self.chunk_colliders[key] = group
         blockSolid = CollisionBox((-1, -1, -1), (1, 1, 1)) # Créer une boîte de collision
         blockNode = CollisionNode('block-collision') # Créer un noeud de collision
         blockNode.addSolid(blockSolid) # Ajouter la boîte solide au noeud de collision
         blockNode.setIntoCollideMask(self.game.worldMask) # Définir le masque de collision
-        collider = block_node.attachNewNode(blockNode) # Attacher le noeud de collision au bloc
+        collider = group.attachNewNode(blockNode) # Attacher le noeud de collision au groupe, à la place du bloc
+        collider.setPos(block_node.getPos())
         collider.setPythonTag('owner', block_node) # Tag pour référence future
+        self.collider_solids[key] = self.collider_solids.get(key, 0) + 1
+        if key in self.active_colliders:
+            self.active_solids += 1
 
     def unloadTerrain(self):
         """Décharge le terrain de la mémoire.
@@ -93,19 +503,100 @@ class Terrain():
         for block in self.terrain_blocks:
             block['node'].removeNode() # Supprimer le noeud du bloc
         self.terrain_blocks.clear() # Vider la liste des blocks
+        for chunk_node in self.chunk_nodes.values():
+            chunk_node.removeNode() # Supprimer le maillage et la collision du chunk
+        self.chunk_nodes.clear()
+        for collider in self.chunk_colliders.values():
+            collider.removeNode() # collisions actives (sous collision_root) ou groupes des blocs
+        self.chunk_colliders.clear()
+        self.collider_solids.clear()
+        self.active_colliders = set()
+        self.active_solids = 0
+        self.collision_center = None
+        for job in self.chunk_jobs.values():
+            job.cancel()
+        self.chunk_jobs.clear()
+        if self.worker_pool is not None:
+            self.worker_pool.shutdown(wait=False) # arrêter les workers
+            self.worker_pool = None
+        self.chunk_surfaces.clear()
+        self.chunk_lru.clear()
+        self.visible_chunks = set()
+        self.streaming_center = None
+        self.pending_chunks = False
+        if self.terrain_node is not None:
+            self.terrain_node.removeNode() # Supprimer le dossier du terrain
+            self.terrain_node = None
+        self.surfaceGrid = np.zeros((0, 0), dtype=np.int32) # plus aucune surface connue
 
     def getSurfaceLevel(self, x, y):
         """Obtient le niveau de surface (hauteur) à une position donnée.
+        Le bloc retenu est celui dont la position est dans [x, x + block_size[ et [y, y + block_size[,
+        soit la cellule ceil(x / block_size), ceil(y / block_size) de la grille.
         Args:
             x (float): position x
             y (float): position y
         Returns:
             float: niveau de surface (hauteur) à la position donnée
         """
-        liste = [] # liste des hauteurs des blocks à la position (x, y)
-        for elt in self.terrain_blocks:
-            if elt['pos'][0] >= x and elt['pos'][0] < x + self.block_size and elt['pos'][1] >= y and elt['pos'][1] < y + self.block_size: 
-                liste.append(elt['pos'][2]) # ajouter la hauteur du block à la liste
-        if liste != []:
-            return max(liste) # retourner la hauteur maximale trouvée
-        return 0 # si aucun block trouvé, retourner 0
\ No newline at end of file
+        cell_x = ceil(x / self.block_size) # cellule contenant le bloc en x
+        cell_y = ceil(y / self.block_size) # cellule contenant le bloc en y
+        if self.streaming:
+            surface = self.chunk_surfaces.get((cell_x // self.chunk_size, cell_y // self.chunk_size))
+            if surface is None:
+                return 0 # chunk pas chargé
+            return int(surface[cell_x % self.chunk_size, cell_y % self.chunk_size])
+        if 0 <= cell_x < self.surfaceGrid.shape[0] and 0 <= cell_y < self.surfaceGrid.shape[1]:
+            return int(self.surfaceGrid[cell_x, cell_y]) # lecture directe dans la grille
+        return 0 # si aucun block trouvé, retourner 0
+
+    def getCellLevel(self, cell_x, cell_y):
+        """Niveau de surface (centre du bloc du dessus) d'une cellule de la grille.
+        Args:
+            cell_x (int): indice x de la cellule
+            cell_y (int): indice y de la cellule
+        Returns:
+            int: niveau de surface, None hors du terrain ou si le chunk n'est pas chargé
+        """
+        if self.streaming:
+            surface = self.chunk_surfaces.get((cell_x // self.chunk_size, cell_y // self.chunk_size))
+            return None if surface is None else int(surface[cell_x % self.chunk_size, cell_y % self.chunk_size])
+        if 0 <= cell_x < self.surfaceGrid.shape[0] and 0 <= cell_y < self.surfaceGrid.shape[1]:
+            return int(self.surfaceGrid[cell_x, cell_y])
+        return None
+
+    def getSurfaceLevels(self, xs, ys):
+        """Obtient les niveaux de surface pour plusieurs positions en une seule fois.
+        Args:
+            xs (array): positions x
+            ys (array): positions y
+        Returns:
+            np.ndarray: niveaux de surface, 0 hors du terrain
+        """
+        cells_x = np.ceil(np.asarray(xs, dtype=np.float64) / self.block_size).astype(np.int64)
+        cells_y = np.ceil(np.asarray(ys, dtype=np.float64) / self.block_size).astype(np.int64)
+        if self.streaming:
+            return self.getStreamedLevels(cells_x, cells_y)
+        inside = (cells_x >= 0) & (cells_x < self.surfaceGrid.shape[0]) & (cells_y >= 0) & (cells_y < self.surfaceGrid.shape[1])
+        levels = np.zeros(cells_x.shape, dtype=np.int32) # 0 hors du terrain
+        levels[inside] = self.surfaceGrid[cells_x[inside], cells_y[inside]]
+        return levels
+
+    def getStreamedLevels(self, cells_x, cells_y):
+        """Niveaux de surface de plusieurs cellules dans les chunks chargés.
+        Args:
+            cells_x (np.ndarray): indices x des cellules
+            cells_y (np.ndarray): indices y des cellules
+        Returns:
+            np.ndarray: niveaux de surface, 0 si le chunk n'est pas chargé
+        """
+        levels = np.zeros(cells_x.shape, dtype=np.int32)
+        keys_x = cells_x // self.chunk_size
+        keys_y = cells_y // self.chunk_size
+        for key_x, key_y in set(zip(keys_x.ravel().tolist(), keys_y.ravel().tolist())): # un accès par chunk
+            surface = self.chunk_surfaces.get((key_x, key_y))
+            if surface is None:
+                continue
+            selected = (keys_x == key_x) & (keys_y == key_y)
+            levels[selected] = surface[cells_x[selected] % self.chunk_size, cells_y[selected] % self.chunk_size]
+        return levels
@@ -0,0 +1,239 @@
+#librairies
+import hashlib
+import json
+import os
+import zlib
+import numpy as np
+
+#librairies panda3d
+from panda3d.core import Filename
+
+FORMAT_VERSION = 2 # à incrémenter quand la génération ou le format des fichiers change
+verified = set() # entrées (clé, extension) déjà relues en entier pendant cette session
+
+
+class TerrainCache():
+    """Cache sur disque des terrains générés : cartes des hauteurs (.npy) et maillages des chunks (.bam)."""
+    def __init__(self, directory="ressources/cache/terrain", max_bytes=64 * 1024 * 1024):
+        """Initialisation du cache.
+        Args:
+            directory (str): dossier du cache
+            max_bytes (int): taille maximale du cache, les entrées les moins récemment utilisées sont supprimées au-delà
+        Returns:
+            None
+        """
+        self.directory = directory # dossier du cache
+        self.max_bytes = max_bytes # taille maximale du cache
+        self.hits = 0 # entrées valides trouvées
+        self.misses = 0 # entrées absentes, périmées ou corrompues
+
+    def makeKey(self, **params):
+        """Clé d'une entrée à partir des paramètres de génération (seed, tailles, octaves...).
+        Args:
+            params: paramètres qui changent le terrain généré
+        Returns:
+            str: clé hexadécimale
+        """
+        params = dict(params, format_version=FORMAT_VERSION)
+        return hashlib.sha1(json.dumps(params, sort_keys=True).encode()).hexdigest()[:20]
+
+    def path(self, key, extension):
+        """Chemin d'un fichier du cache."""
+        return os.path.join(self.directory, f"{key}.{extension}")
+
+    def loadHeights(self, key):
+        """Charge une carte des hauteurs en mémoire mappée.
+        Args:
+            key (str): clé de l'entrée
+        Returns:
+            np.ndarray: hauteurs (memmap en lecture seule), None si absente ou invalide
+        """
+        meta = self.checkMeta(key, 'npy')
+        if meta is None:
+            return None
+        try:
+            heights = np.load(self.path(key, 'npy'), mmap_mode='r')
+        except (OSError, ValueError):
+            return self.reject(key)
+        if list(heights.shape) != meta['shape'] or str(heights.dtype) != meta['dtype']:
+            return self.reject(key)
+        self.touch(key)
+        self.hits += 1
+        return heights
+
+    def saveHeights(self, key, heights):
+        """Enregistre une carte des hauteurs.
+        Args:
+            key (str): clé de l'entrée
+            heights (np.ndarray): hauteurs
+        Returns:
+            None
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        temporary = self.path(key, 'npy.tmp')
+        with open(temporary, 'wb') as file:
+            np.save(file, np.ascontiguousarray(heights))
+        os.replace(temporary, self.path(key, 'npy')) # écriture atomique
+        self.writeMeta(key, 'npy', {'shape': list(heights.shape), 'dtype': str(heights.dtype)})
+        self.trim()
+
+    def loadBam(self, key, loader, source):
+        """Charge un maillage cuit du terrain.
+        Args:
+            key (str): clé de l'entrée
+            loader (Loader): loader de Panda3D
+            source (str): modèle du bloc, l'entrée est périmée s'il a changé depuis
+        Returns:
+            NodePath: terrain chargé, None si absent ou invalide
+        """
+        meta = self.checkMeta(key, 'bam')
+        if meta is None:
+            return None
+        if meta.get('source') != self.sourceStamp(source):
+            return self.reject(key) # modèle du bloc modifié
+        try:
+            node = loader.loadModel(Filename.fromOsSpecific(os.path.abspath(self.path(key, 'bam'))), noCache=True)
+        except OSError:
+            return self.reject(key)
+        self.touch(key)
+        self.hits += 1
+        return node
+
+    def saveBam(self, key, node, source):
+        """Enregistre le maillage cuit du terrain.
+        Args:
+            key (str): clé de l'entrée
+            node (NodePath): noeud du terrain
+            source (str): modèle du bloc utilisé pour le maillage
+        Returns:
+            None
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        temporary = self.path(key, 'tmp.bam') # l'extension .bam est nécessaire à writeBamFile
+        if not node.writeBamFile(Filename.fromOsSpecific(os.path.abspath(temporary))):
+            return
+        os.replace(temporary, self.path(key, 'bam'))
+        self.writeMeta(key, 'bam', {'source': self.sourceStamp(source)})
+        self.trim()
+
+    def sourceStamp(self, source):
+        """Date de modification et taille d'un fichier source."""
+        try:
+            stat = os.stat(source)
+        except OSError:
+            return None
+        return [stat.st_mtime_ns, stat.st_size]
+
+    def readMeta(self, key, extension):
+        """Lit et vérifie la description d'une entrée (version et taille du fichier), sans lire le fichier lui-même.
+        Args:
+            key (str): clé de l'entrée
+            extension (str): 'npy' ou 'bam'
+        Returns:
+            dict: description, None si l'entrée est absente ou invalide (elle est alors supprimée)
+        """
+        try:
+            with open(self.path(key, f'{extension}.json')) as file:
+                meta = json.load(file)
+            size = os.path.getsize(self.path(key, extension))
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError):
+            return self.reject(key)
+        if meta.get('format_version') != FORMAT_VERSION or meta.get('size') != size:
+            return self.reject(key) # périmée ou tronquée
+        return meta
+
+    def checkMeta(self, key, extension):
+        """Description d'une entrée, avec une vérification complète la première fois qu'elle est lue dans la session.
+        Args:
+            key (str): clé de l'entrée
+            extension (str): 'npy' ou 'bam'
+        Returns:
+            dict: description, None si l'entrée est absente ou invalide
+        """
+        if (key, extension) in verified:
+            return self.readMeta(key, extension)
+        return self.verify(key, extension)
+
+    def verify(self, key, extension):
+        """Vérification complète d'une entrée : relit tout le fichier et compare sa somme de contrôle.
+        Args:
+            key (str): clé de l'entrée
+            extension (str): 'npy' ou 'bam'
+        Returns:
+            dict: description si l'entrée est intacte, sinon None (elle est alors supprimée)
+        """
+        meta = self.readMeta(key, extension)
+        if meta is None:
+            return None
+        crc = 0
+        try:
+            with open(self.path(key, extension), 'rb') as file:
+                for block in iter(lambda: file.read(1024 * 1024), b''):
+                    crc = zlib.crc32(block, crc)
+        except OSError:
+            return self.reject(key)
+        if meta.get('crc32') != crc:
+            return self.reject(key) # corrompue
+        verified.add((key, extension))
+        return meta
+
+    def writeMeta(self, key, extension, meta):
+        """Écrit la description d'une entrée à côté de son fichier."""
+        with open(self.path(key, extension), 'rb') as file:
+            data = file.read()
+        meta = dict(meta, format_version=FORMAT_VERSION, size=len(data), crc32=zlib.crc32(data))
+        with open(self.path(key, f'{extension}.json'), 'w') as file:
+            json.dump(meta, file)
+        verified.add((key, extension)) # somme calculée sur les données qu'on vient d'écrire
+
+    def reject(self, key):
+        """Supprime une entrée invalide pour qu'elle soit reconstruite.
+        Args:
+            key (str): clé de l'entrée
+        Returns:
+            None
+        """
+        self.misses += 1
+        self.remove(key)
+        return None
+
+    def remove(self, key):
+        """Supprime tous les fichiers d'une entrée."""
+        verified.difference_update({(key, 'npy'), (key, 'bam')})
+        for extension in ('npy', 'npy.json', 'bam', 'bam.json'):
+            try:
+                os.remove(self.path(key, extension))
+            except OSError:
+                pass
+
+    def touch(self, key):
+        """Marque une entrée comme récemment utilisée (date de modification de ses fichiers)."""
+        for extension in ('npy.json', 'bam.json'):
+            try:
+                os.utime(self.path(key, extension))
+            except OSError:
+                pass
+
+    def trim(self):
+        """Supprime les entrées les moins récemment utilisées tant que le cache dépasse max_bytes.
+        Args:
+            None
+        Returns:
+            None
+        """
+        entries = {} # clé -> [dernière utilisation, taille]
+        for name in os.listdir(self.directory):
+            key = name.split('.')[0]
+            stat = os.stat(os.path.join(self.directory, name))
+            entry = entries.setdefault(key, [0, 0])
+            entry[0] = max(entry[0], stat.st_mtime)
+            entry[1] += stat.st_size
+        total = sum(size for _, size in entries.values())
+        for key, (_, size) in sorted(entries.items(), key=lambda item: item[1][0]):
+            if total <= self.max_bytes:
+                break
+            self.remove(key)
+            total -= size
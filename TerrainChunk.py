@@ -0,0 +1,269 @@
+#librairies
+import numpy as np
+import TerrainNoise
+
+#librairies panda3d
+from panda3d.core import Geom, GeomEnums, GeomNode, GeomTriangles, GeomVertexData, GeomVertexFormat, NodePath
+from panda3d.core import CollisionNode, CollisionPolygon, Point3, BitMask32
+
+# Construction de maillages fusionnés pour le terrain : un seul GeomNode par chunk
+# de N x N colonnes au lieu d'un NodePath par bloc.
+
+FACES = ('+x', '-x', '+y', '-y', '+z', '-z') # faces d'un bloc, repérées par leur normale
+NEIGHBOURS = {'+x': (1, 0), '-x': (-1, 0), '+y': (0, 1), '-y': (0, -1)} # voisin caché par chaque face latérale
+
+
+def findColumn(vertex_format, contents):
+    """Première colonne d'un format de sommets ayant ce contenu ('texcoord' ou 'texcoord.0' selon le loader).
+    Args:
+        vertex_format (GeomVertexFormat): format des sommets
+        contents (int): GeomEnums.C_point, C_normal ou C_texcoord
+    Returns:
+        tuple: (indice du tableau, GeomVertexColumn)
+    """
+    for array_index in range(vertex_format.getNumArrays()):
+        array_format = vertex_format.getArray(array_index)
+        for column_index in range(array_format.getNumColumns()):
+            column = array_format.getColumn(column_index)
+            if column.getContents() == contents:
+                return array_index, column
+    raise ValueError(f"colonne de sommets absente : {contents}")
+
+
+class BlockTemplate():
+    """Géométrie d'un bloc découpée par face, extraite du modèle 3D."""
+    def __init__(self, model):
+        """Lecture des sommets du modèle.
+        Args:
+            model (NodePath): modèle du bloc (ex: grass-block.glb)
+        Returns:
+            None
+        """
+        flat = model.copyTo(NodePath('block-template')) # copie, le modèle partagé n'est pas modifié
+        flat.flattenStrong() # appliquer les transformations du modèle aux sommets
+        geom_node = flat.find('**/+GeomNode').node()
+        geom = geom_node.getGeom(0)
+        self.state = geom_node.getState().compose(geom_node.getGeomState(0)) # texture et matériau du bloc
+
+        vertex_data = geom.getVertexData()
+        columns = []
+        for contents, width in ((GeomEnums.C_point, 3), (GeomEnums.C_normal, 3), (GeomEnums.C_texcoord, 2)):
+            array_index, column = findColumn(vertex_data.getFormat(), contents)
+            array = np.frombuffer(vertex_data.getArray(array_index), dtype=np.float32)
+            array = array.reshape(vertex_data.getNumRows(), -1)
+            start = column.getStart() // 4
+            columns.append(array[:, start:start + width].copy())
+        vertices, normals, uvs = columns
+
+        triangles = geom.getPrimitive(0).decompose()
+        indices = [triangles.getVertex(i) for i in range(triangles.getNumVertices())]
+        indices = [tuple(indices[i:i + 3]) for i in range(0, len(indices), 3)]
+        flat.removeNode()
+
+        # regrouper les triangles par face selon leur normale dominante
+        self.faces = {}
+        for face in FACES:
+            self.faces[face] = {'vertices': [], 'normals': [], 'uvs': [], 'indices': []}
+        remap = {face: {} for face in FACES} # indice dans le modèle -> indice local à la face
+        for triangle in indices:
+            normal = normals[list(triangle)].mean(axis=0)
+            axis = int(np.argmax(np.abs(normal)))
+            face = ('+' if normal[axis] > 0 else '-') + 'xyz'[axis]
+            entry = self.faces[face]
+            for index in triangle:
+                if index not in remap[face]:
+                    remap[face][index] = len(entry['vertices'])
+                    entry['vertices'].append(vertices[index])
+                    entry['normals'].append(normals[index])
+                    entry['uvs'].append(uvs[index])
+            entry['indices'].append([remap[face][index] for index in triangle])
+        for face, entry in self.faces.items():
+            self.faces[face] = {
+                'vertices': np.array(entry['vertices'], dtype=np.float32).reshape(-1, 3),
+                'normals': np.array(entry['normals'], dtype=np.float32).reshape(-1, 3),
+                'uvs': np.array(entry['uvs'], dtype=np.float32).reshape(-1, 2),
+                'indices': np.array(entry['indices'], dtype=np.uint32).reshape(-1, 3),
+            }
+
+
+def visibleFaces(levels):
+    """Masques des faces visibles d'un chunk.
+    Une face latérale est cachée quand la colonne voisine a la même hauteur : les deux blocs se touchent.
+    Args:
+        levels (np.ndarray): hauteurs en blocs du chunk avec une bordure d'une cellule, -1 si pas de voisin
+    Returns:
+        dict: masque booléen (N x N) par face
+    """
+    inner = levels[1:-1, 1:-1]
+    exists = inner >= 0
+    masks = {'+z': exists, '-z': exists}
+    for face, (dx, dy) in NEIGHBOURS.items():
+        neighbour = levels[1 + dx:levels.shape[0] - 1 + dx, 1 + dy:levels.shape[1] - 1 + dy]
+        masks[face] = exists & (neighbour != inner)
+    return masks
+
+
+def buildChunkArrays(faces, levels, origin_x, origin_y, block_size):
+    """Tableaux de sommets et d'indices d'un chunk, sans objet Panda3D (utilisable hors du thread principal).
+    Args:
+        faces (dict): géométrie du bloc par face (BlockTemplate.faces)
+        levels (np.ndarray): hauteurs en blocs du chunk avec une bordure d'une cellule
+        origin_x, origin_y (int): indice de la première cellule du chunk
+        block_size (float): taille d'un bloc
+    Returns:
+        tuple: (sommets float32 [x y z nx ny nz u v], indices uint32 des triangles)
+    """
+    masks = visibleFaces(levels)
+    inner = levels[1:-1, 1:-1]
+    vertex_blocks = []
+    index_blocks = []
+    vertex_count = 0
+    for face in FACES:
+        cells_x, cells_y = np.nonzero(masks[face])
+        if len(cells_x) == 0:
+            continue
+        shape = faces[face]
+        offsets = np.stack([(cells_x + origin_x) * block_size,
+                            (cells_y + origin_y) * block_size,
+                            inner[cells_x, cells_y] * block_size], axis=1).astype(np.float32)
+        count = len(offsets)
+        per_face = len(shape['vertices'])
+        positions = (shape['vertices'][None, :, :] + offsets[:, None, :]).reshape(-1, 3)
+        normals = np.broadcast_to(shape['normals'], (count, per_face, 3)).reshape(-1, 3)
+        uvs = np.broadcast_to(shape['uvs'], (count, per_face, 2)).reshape(-1, 2)
+        vertex_blocks.append(np.hstack([positions, normals, uvs]))
+        bases = vertex_count + np.arange(count, dtype=np.uint32) * per_face
+        index_blocks.append((shape['indices'][None, :, :] + bases[:, None, None]).reshape(-1, 3))
+        vertex_count += count * per_face
+    if not vertex_blocks:
+        return np.zeros((0, 8), dtype=np.float32), np.zeros((0, 3), dtype=np.uint32)
+    return np.vstack(vertex_blocks).astype(np.float32), np.vstack(index_blocks).astype(np.uint32)
+
+
+def generateChunk(faces, key, chunk_size, block_size, seed, max_height, octaves, scale):
+    """Génère toutes les données d'un chunk du monde infini : hauteurs, maillage et collision.
+    Fonction de module sans objet Panda3D pour pouvoir tourner dans un thread ou un autre processus.
+    Args:
+        faces (dict): géométrie du bloc par face (BlockTemplate.faces)
+        key (tuple): indices (chunk_x, chunk_y) du chunk
+        chunk_size (int): nombre de colonnes par côté d'un chunk
+        block_size (float): taille d'un bloc
+        seed, max_height, octaves, scale: paramètres du bruit du terrain
+    Returns:
+        tuple: (hauteurs avec bordure, sommets, indices, quadrilatères de collision)
+    """
+    origin_x, origin_y = key[0] * chunk_size, key[1] * chunk_size # première cellule du chunk
+    levels = TerrainNoise.generateHeights(seed, chunk_size + 2, chunk_size + 2, max_height,
+                                          octaves, scale, origin_x - 1, origin_y - 1) # avec les voisins
+    vertices, indices = buildChunkArrays(faces, levels, origin_x, origin_y, block_size)
+    quads = buildCollisionQuads(levels, origin_x, origin_y, block_size)
+    return levels, vertices, indices, quads
+
+
+def makeGeomNode(name, vertices, indices, state):
+    """Crée le GeomNode d'un chunk à partir des tableaux de buildChunkArrays.
+    Args:
+        name (str): nom du noeud
+        vertices (np.ndarray): sommets float32 [x y z nx ny nz u v]
+        indices (np.ndarray): indices uint32 des triangles
+        state (RenderState): état de rendu du bloc (texture, matériau)
+    Returns:
+        GeomNode: noeud contenant un seul Geom pour tout le chunk
+    """
+    vertex_data = GeomVertexData(name, GeomVertexFormat.getV3n3t2(), Geom.UHStatic)
+    vertex_data.uncleanSetNumRows(len(vertices))
+    memoryview(vertex_data.modifyArray(0)).cast('B')[:] = np.ascontiguousarray(vertices, dtype=np.float32).tobytes()
+
+    triangles = GeomTriangles(Geom.UHStatic)
+    triangles.setIndexType(Geom.NTUint32)
+    index_array = triangles.modifyVertices()
+    index_array.uncleanSetNumRows(indices.size)
+    memoryview(index_array).cast('B')[:] = np.ascontiguousarray(indices, dtype=np.uint32).tobytes()
+
+    geom = Geom(vertex_data)
+    geom.addPrimitive(triangles)
+    node = GeomNode(name)
+    node.addGeom(geom, state)
+    return node
+
+
+def mergeRuns(mask, levels):
+    """Découpe glouton d'un masque 2D en rectangles de même hauteur.
+    Args:
+        mask (np.ndarray): cellules à couvrir
+        levels (np.ndarray): hauteur de chaque cellule, un rectangle ne mélange pas les hauteurs
+    Returns:
+        list: rectangles (x, y, largeur en x, largeur en y, hauteur)
+    """
+    todo = mask.copy()
+    rectangles = []
+    size_x, size_y = mask.shape
+    for x in range(size_x):
+        for y in range(size_y):
+            if not todo[x, y]:
+                continue
+            level = levels[x, y]
+            end_y = y + 1 # étendre en y
+            while end_y < size_y and todo[x, end_y] and levels[x, end_y] == level:
+                end_y += 1
+            end_x = x + 1 # puis étendre en x tant que toute la ligne correspond
+            while end_x < size_x and todo[end_x, y:end_y].all() and (levels[end_x, y:end_y] == level).all():
+                end_x += 1
+            todo[x:end_x, y:end_y] = False
+            rectangles.append((x, y, end_x - x, end_y - y, level))
+    return rectangles
+
+
+def buildCollisionQuads(levels, origin_x, origin_y, block_size):
+    """Quadrilatères de collision d'un chunk : faces visibles, fusionnées quand elles sont coplanaires.
+    Les sommets sont dans le sens trigonométrique vu de l'extérieur du bloc.
+    Args:
+        levels (np.ndarray): hauteurs en blocs du chunk avec une bordure d'une cellule
+        origin_x, origin_y (int): indice de la première cellule du chunk
+        block_size (float): taille d'un bloc
+    Returns:
+        np.ndarray: quadrilatères de forme (M, 4, 3)
+    """
+    masks = visibleFaces(levels)
+    inner = levels[1:-1, 1:-1]
+    half = block_size / 2
+    quads = []
+    for face in FACES:
+        for x, y, size_x, size_y, level in mergeRuns(masks[face], inner):
+            # boîte englobant le rectangle de colonnes
+            x0 = (x + origin_x) * block_size - half
+            x1 = (x + origin_x + size_x - 1) * block_size + half
+            y0 = (y + origin_y) * block_size - half
+            y1 = (y + origin_y + size_y - 1) * block_size + half
+            z0 = level * block_size - half
+            z1 = level * block_size + half
+            if face == '+z':
+                quads.append(((x0, y0, z1), (x1, y0, z1), (x1, y1, z1), (x0, y1, z1)))
+            elif face == '-z':
+                quads.append(((x0, y0, z0), (x0, y1, z0), (x1, y1, z0), (x1, y0, z0)))
+            elif face == '+x':
+                quads.append(((x1, y0, z0), (x1, y1, z0), (x1, y1, z1), (x1, y0, z1)))
+            elif face == '-x':
+                quads.append(((x0, y0, z0), (x0, y0, z1), (x0, y1, z1), (x0, y1, z0)))
+            elif face == '+y':
+                quads.append(((x0, y1, z0), (x0, y1, z1), (x1, y1, z1), (x1, y1, z0)))
+            else:
+                quads.append(((x0, y0, z0), (x1, y0, z0), (x1, y0, z1), (x0, y0, z1)))
+    return np.array(quads, dtype=np.float32).reshape(-1, 4, 3)
+
+
+def makeCollisionNode(name, quads, mask):
+    """Crée le CollisionNode d'un chunk à partir des quadrilatères de buildCollisionQuads.
+    Args:
+        name (str): nom du noeud
+        quads (np.ndarray): quadrilatères de forme (M, 4, 3)
+        mask (BitMask32): masque "into" des collisions
+    Returns:
+        CollisionNode: un seul noeud de collision pour tout le chunk
+    """
+    node = CollisionNode(name)
+    for quad in quads.tolist():
+        node.addSolid(CollisionPolygon(*[Point3(*corner) for corner in quad]))
+    node.setIntoCollideMask(mask)
+    node.setFromCollideMask(BitMask32.allOff()) # le terrain ne fait que recevoir les collisions
+    return node
@@ -0,0 +1,92 @@
+#librairies
+import random
+import numpy as np
+
+# Génération vectorisée du bruit Perlin utilisé par le terrain.
+# Reproduit l'algorithme de la librairie perlin_noise (mêmes vecteurs de gradient,
+# même lissage) mais calcule toute la grille en quelques opérations numpy
+# au lieu d'un appel Python par cellule.
+
+
+def gradientVector(seed, lattice_x, lattice_y):
+    """Vecteur de gradient d'un point du réseau, identique à perlin_noise.
+    Args:
+        seed (int): seed du bruit
+        lattice_x (int): coordonnée x du point du réseau
+        lattice_y (int): coordonnée y du point du réseau
+    Returns:
+        tuple: composantes (gx, gy) du gradient
+    """
+    point_hash = max(1, int(abs(lattice_x + 10 * lattice_y + 1))) # même hash que perlin_noise.tools.hasher
+    rng = random.Random(seed * point_hash) # générateur local, l'état global de random n'est pas touché
+    return rng.uniform(-1, 1), rng.uniform(-1, 1)
+
+
+def gradientTable(seed, min_x, min_y, max_x, max_y):
+    """Table des gradients pour un rectangle du réseau.
+    Args:
+        seed (int): seed du bruit
+        min_x, min_y (int): premier point du réseau
+        max_x, max_y (int): dernier point du réseau (inclus)
+    Returns:
+        np.ndarray: gradients de forme (max_x - min_x + 1, max_y - min_y + 1, 2)
+    """
+    table = np.empty((max_x - min_x + 1, max_y - min_y + 1, 2), dtype=np.float64)
+    for lattice_x in range(min_x, max_x + 1):
+        for lattice_y in range(min_y, max_y + 1):
+            table[lattice_x - min_x, lattice_y - min_y] = gradientVector(seed, lattice_x, lattice_y)
+    return table
+
+
+def fade(t):
+    """Courbe de lissage 6t^5 - 15t^4 + 10t^3."""
+    return 6 * t ** 5 - 15 * t ** 4 + 10 * t ** 3
+
+
+def noiseField(seed, width, length, octaves=0.6, scale=0.1, origin_x=0, origin_y=0):
+    """Bruit Perlin 2D sur une grille de cellules.
+    Args:
+        seed (int): seed du bruit (strictement positif, comme perlin_noise)
+        width (int): nombre de cellules en x
+        length (int): nombre de cellules en y
+        octaves (float): octaves du bruit
+        scale (float): facteur entre indice de cellule et coordonnée du bruit
+        origin_x, origin_y (int): indice de la première cellule
+    Returns:
+        np.ndarray: valeurs du bruit de forme (width, length), indexées par [x, y]
+    """
+    # mêmes opérations flottantes que PerlinNoise([x * scale, y * scale])
+    coord_x = (np.arange(origin_x, origin_x + width, dtype=np.float64) * scale * octaves)[:, None]
+    coord_y = (np.arange(origin_y, origin_y + length, dtype=np.float64) * scale * octaves)[None, :]
+    floor_x = np.floor(coord_x).astype(np.int64)
+    floor_y = np.floor(coord_y).astype(np.int64)
+
+    min_x, min_y = int(floor_x.min()), int(floor_y.min())
+    table = gradientTable(seed, min_x, min_y, int(floor_x.max()) + 1, int(floor_y.max()) + 1)
+
+    noise = np.zeros((width, length), dtype=np.float64)
+    for corner_x, corner_y in ((0, 0), (0, 1), (1, 0), (1, 1)): # même ordre de somme que perlin_noise
+        dist_x = coord_x - (floor_x + corner_x)
+        dist_y = coord_y - (floor_y + corner_y)
+        gradients = table[floor_x - min_x + corner_x, floor_y - min_y + corner_y] # (width, length, 2)
+        weight = fade(1 - np.abs(dist_x)) * fade(1 - np.abs(dist_y))
+        noise += weight * (gradients[..., 0] * dist_x + gradients[..., 1] * dist_y)
+    return noise
+
+
+def generateHeights(seed, width, length, max_height, octaves=0.6, scale=0.1, origin_x=0, origin_y=0):
+    """Hauteurs entières du terrain (en nombre de blocs) pour une grille de cellules.
+    Args:
+        seed (int): seed du bruit
+        width (int): nombre de cellules en x
+        length (int): nombre de cellules en y
+        max_height (int): hauteur maximale en blocs
+        octaves (float): octaves du bruit
+        scale (float): facteur entre indice de cellule et coordonnée du bruit
+        origin_x, origin_y (int): indice de la première cellule
+    Returns:
+        np.ndarray: hauteurs de forme (width, length), indexées par [x, y]
+    """
+    noise = noiseField(seed, width, length, octaves, scale, origin_x, origin_y)
+    heights = np.trunc((noise + 1) / 2 * max_height) # même conversion que int(...)
+    return np.clip(heights, 0, max_height).astype(np.int32)
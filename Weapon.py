@@ -1,19 +1,38 @@
-
 class Weapon():
-    def __init__(self, name, description, degats, range, cooldown):
+    """Arme du joueur : ses statistiques sont celles de son type (Archetypes), l'arme ne garde que son cooldown."""
+    __slots__ = ('archetype', 'cooldown')
+
+    def __init__(self, archetype):
         """Initialisation de l'arme.
         Args:
-            name (str): nom de l'arme
-            description (str): description de l'arme
-            degats (int): degats infligés par l'arme
-            range (float): portée de l'arme
-            cooldown (float): temps de recharge entre les attaques
+            archetype (WeaponArchetype): type de l'arme (game.archetypes)
         Returns:
             None
         """
-        self.name = name  # nom de l'arme
-        self.description = description  # description de l'arme
-        self.degats = degats  # degats infligés par l'arme
-        self.range = range  # portée de l'arme
-        self.initialCooldown = cooldown # temps de recharge initial entre les attaques
-        self.cooldown = cooldown  # temps de recharge entre les attaques
+        self.archetype = archetype # nom, description, degats, portée et recharge du type
+        self.cooldown = archetype.cooldown  # temps de recharge entre les attaques
+
+    @property
+    def name(self):
+        """nom de l'arme"""
+        return self.archetype.name
+
+    @property
+    def description(self):
+        """description de l'arme"""
+        return self.archetype.description
+
+    @property
+    def degats(self):
+        """degats infligés par l'arme"""
+        return self.archetype.degats
+
+    @property
+    def range(self):
+        """portée de l'arme"""
+        return self.archetype.range
+
+    @property
+    def initialCooldown(self):
+        """temps de recharge initial entre les attaques"""
+        return self.archetype.cooldown
@@ -0,0 +1,119 @@
+"""Benchmark : registre des types de monstres et d'armes (Archetypes.Registry).
+D'abord le temps de lecture, validation et compilation au lancement : le fichier du jeu (ressources/archetypes.json)
+puis des fichiers générés de plus en plus gros. Un fichier invalide doit donner toutes ses erreurs en une fois.
+Ensuite la mémoire par monstre : octets des tableaux de la horde par emplacement (avant : six statistiques fixes
+copiées dans chaque monstre, maintenant : le numéro de son type) et mémoire Python mesurée (tracemalloc) en créant
+--monsters monstres d'un seul type puis répartis sur --types types.
+
+    python benchmarks/bench_archetypes.py [--counts 10 100 1000] [--monsters 2000] [--types 50]
+"""
+#librairies
+import argparse
+import json
+import os
+import tempfile
+import tracemalloc
+from types import SimpleNamespace
+import numpy as np
+
+import common # racine du dépôt et Panda3D, avant les modules du jeu
+import Archetypes
+import MonsterHorde
+
+OLD_FIELDS = {'speed': np.float64, 'attack_power': np.float64, 'attack_range': np.float64, 'size': np.float64,
+              'gravity': np.float64, 'initialTimeToReload': np.float64} # statistiques fixes copiées dans chaque monstre avant
+
+
+def generated(count, seed=0):
+    """Contenu d'un fichier de count types de monstres et count types d'armes."""
+    rng = np.random.default_rng(seed)
+    monsters = {f"monstre_{i}": {'health': int(rng.integers(50, 500)), 'speed': float(rng.uniform(1, 4)),
+                                 'attack_power': int(rng.integers(5, 30)), 'attack_range': float(rng.uniform(1, 3)),
+                                 'xp_value': int(rng.integers(10, 100)), 'reload': float(rng.uniform(1, 4)),
+                                 'size': float(rng.uniform(2, 5)), 'gravity': -20} for i in range(count)}
+    weapons = {f"arme_{i}": {'name': f"Arme {i}", 'description': "Une arme générée.", 'degats': int(rng.integers(10, 200)),
+                             'range': float(rng.uniform(2, 6)), 'cooldown': float(rng.uniform(0.3, 2))} for i in range(count)}
+    return {'monsters': monsters, 'weapons': weapons}
+
+
+def write(data, folder, name):
+    """Écrit un fichier de types, renvoie son chemin."""
+    path = os.path.join(folder, name)
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(data, file)
+    return path
+
+
+def parseTime(path, repeat=7):
+    """Médiane du temps de chargement d'un fichier (ms)."""
+    return float(np.median([Archetypes.Registry(path).parse_time for _ in range(repeat)])) * 1000
+
+
+def bytesPerSlot(fields):
+    """Octets des tableaux de la horde pour un emplacement."""
+    return sum(np.dtype(dtype).itemsize for dtype in fields.values()) + 2 * 3 * 8 # plus position et position précédente
+
+
+def spawnMemory(base, registry, count, types):
+    """Mémoire Python (octets par monstre) pour count monstres répartis sur les types donnés."""
+    game = common.makeGame(base, renderer=SimpleNamespace(), archetypes=registry, capacity=count)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for index in range(count):
+        game.monsters.append(game.monsterPool.acquire(types[index % len(types)], [index * 4.0, 0.0, 10.0]))
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    monster = game.monsters[0]
+    attributes = len(vars(monster))
+    for monster in game.monsters:
+        monster.stash()
+        monster.monster.removeNode()
+    return used / count, attributes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--counts", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--monsters", type=int, default=2000)
+    parser.add_argument("--types", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'fichier':>24} {'types':>6} {'chargement (ms)':>16} {'par type (µs)':>14}")
+    registry = Archetypes.Registry()
+    count = len(registry.monsters) + len(registry.weapons)
+    duration = parseTime(Archetypes.ARCHETYPES_FILE)
+    print(f"{'archetypes.json':>24} {count:>6} {duration:>16.3f} {duration / count * 1000:>14.2f}")
+    folder = tempfile.TemporaryDirectory()
+    for size in args.counts:
+        duration = parseTime(write(generated(size), folder.name, f"types_{size}.json"))
+        print(f"{f'généré ({size} + {size})':>24} {2 * size:>6} {duration:>16.3f} {duration / (2 * size) * 1000:>14.2f}")
+
+    invalid = generated(3)
+    invalid['monsters']['monstre_0']['speed'] = "vite"
+    invalid['monsters']['monstre_1']['size'] = -1
+    del invalid['weapons']['arme_2']['cooldown']
+    invalid['weapons']['arme_0']['couleur'] = "rouge"
+    try:
+        Archetypes.Registry(write(invalid, folder.name, "invalide.json"))
+        print("\nfichier invalide accepté !")
+    except Archetypes.ArchetypeError as error:
+        print(f"\nfichier invalide : {len(str(error).splitlines())} erreurs signalées en une fois")
+        for line in str(error).splitlines():
+            print(f"    {line}")
+
+    fields = MonsterHorde.MonsterHorde.FIELDS
+    old = {name: dtype for name, dtype in fields.items() if name != 'archetype'} | OLD_FIELDS
+    print(f"\ntableaux de la horde : {bytesPerSlot(old)} octets par monstre avant, {bytesPerSlot(fields)} maintenant "
+          f"(statistiques fixes : {len(registry.table.dtype.names) * 8} octets par type, dans Registry.table)")
+
+    base = common.startBase()
+    many = Archetypes.Registry(write(generated(args.types), folder.name, "types_jeu.json"))
+    folder.cleanup()
+    print(f"\n{'types en jeu':>13} {'octets Python par monstre':>26} {'attributs du monstre':>21}")
+    for label, types in (("1", ["monstre_0"]), (str(args.types), list(many.monsters))):
+        per_monster, attributes = spawnMemory(base, many, args.monsters, types)
+        print(f"{label:>13} {per_monster:>26.0f} {attributes:>21}")
+
+
+if __name__ == "__main__":
+    main()
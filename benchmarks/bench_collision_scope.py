@@ -0,0 +1,106 @@
+"""Benchmark : parcours du CollisionTraverser limité à la racine des collisions (Game.collisionRoot) plutôt qu'à render.
+Une partie sans fenêtre est jouée avec les collisions du joueur (--collisions), puis le joueur est placé en
+plusieurs points du terrain. En chaque point, les collisions de sa sphère et de son rayon de sol sont calculées
+en parcourant : render avec les collisions de tous les chunks, render avec celles des chunks proches, et la racine
+des collisions seule. On compare le temps d'un parcours, les solides de collision parcourus et les contacts trouvés
+(ils doivent être identiques dans les trois cas), et on vérifie le compte des solides actifs tenu à jour par
+Terrain et MonsterHorde (compteur 'solids' du profileur) contre une recherche dans le graphe.
+
+    python benchmarks/bench_collision_scope.py [--ticks 600] [--monsters 200] [--points 25] [--repeat 50]
+"""
+#librairies
+import argparse
+import time
+import numpy as np
+
+import common # racine du dépôt et Panda3D, avant les modules du jeu
+
+#librairies panda3d
+from panda3d.core import CollisionTraverser, CollisionHandlerQueue
+
+import Game
+import Headless
+
+
+def contacts(traverser, queue, root):
+    """Contacts trouvés en parcourant root : (solide touché, point de contact arrondi), triés."""
+    traverser.traverse(root)
+    found = []
+    for entry in queue.entries:
+        point = entry.getSurfacePoint(root.getTop())
+        found.append((entry.getFromNodePath().getName(), entry.getIntoNode().getName(),
+                      tuple(round(value, 4) for value in point)))
+    return sorted(found)
+
+
+def timed(traverser, root, repeat):
+    """Médiane du temps d'un parcours (ms)."""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        traverser.traverse(root)
+        durations.append(time.perf_counter() - start)
+    return float(np.median(durations)) * 1000
+
+
+def activateAll(terrain):
+    """Collisions de tous les chunks actives, comme si rien n'était limité autour du joueur."""
+    for key, collider in terrain.chunk_colliders.items():
+        collider.reparentTo(terrain.collision_root)
+    terrain.active_colliders = set(terrain.chunk_colliders)
+    terrain.active_solids = sum(terrain.collider_solids.values())
+    terrain.collision_center = None # la prochaine mise à jour recalcule les chunks proches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ticks", type=int, default=600)
+    parser.add_argument("--monsters", type=int, default=200)
+    parser.add_argument("--points", type=int, default=25)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    Game.ANALYTIC_PLAYER_PHYSICS = False # le joueur a sa sphère et son rayon de sol
+    common.configure()
+    base = Headless.HeadlessGame()
+    game = Headless.run(base, args.seed, args.ticks, monsters=args.monsters)['game']
+    terrain, camera, render = game.terrain, base.camera, base.render
+    probe = CollisionTraverser() # mêmes colliders que le joueur, contacts gardés dans une file
+    queue = CollisionHandlerQueue()
+    probe.addCollider(game.player.playerCollider, queue)
+    probe.addCollider(game.player.floorRayNP, queue)
+
+    side = int(np.ceil(np.sqrt(args.points)))
+    size = terrain.terrain_width * terrain.block_size
+    cells = np.linspace(size * 0.05, size * 0.95, side)
+    modes = ("render, tous les chunks", "render, chunks proches", "racine des collisions")
+    durations = {mode: [] for mode in modes}
+    solids = {mode: [] for mode in modes}
+    different = 0
+    miscounted = 0 # positions où le compte tenu à jour (Terrain, MonsterHorde) diffère de la recherche dans le graphe
+    for x in cells:
+        for y in cells:
+            camera.setPos(x, y, terrain.getSurfaceLevel(x, y) + 3)
+            activateAll(terrain)
+            reference = contacts(probe, queue, render)
+            durations[modes[0]].append(timed(probe, render, args.repeat))
+            solids[modes[0]].append(game.countCollisionSolids(render))
+            terrain.updateCollisions(x, y)
+            miscounted += terrain.active_solids + game.horde.solids != game.countCollisionSolids()
+            for mode, root in zip(modes[1:], (render, game.collisionRoot)):
+                different += contacts(probe, queue, root) != reference
+                durations[mode].append(timed(probe, root, args.repeat))
+                solids[mode].append(game.countCollisionSolids(root))
+
+    print(f"{game.horde.count} monstres, {len(terrain.chunk_colliders)} chunks, {side * side} positions du joueur\n")
+    print(f"{'parcours':>24} {'ms p50':>8} {'ms max':>8} {'solides p50':>12}")
+    for mode in modes:
+        print(f"{mode:>24} {np.median(durations[mode]):>8.4f} {np.max(durations[mode]):>8.4f} "
+              f"{np.median(solids[mode]):>12.0f}")
+    print(f"\ncontacts identiques dans les trois parcours : {'oui' if different == 0 else f'non ({different} positions)'}")
+    print(f"solides comptés au fil du jeu = solides trouvés dans le graphe : {'oui' if miscounted == 0 else f'non ({miscounted} positions)'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Benchmark : séparation des monstres (MonsterHorde.separate) selon la taille de la horde.
+D'abord la répartition : --monsters monstres poursuivent le joueur immobile pendant --seconds secondes, sans puis
+avec séparation ; on compte les paires de monstres superposés (à moins d'une unité) et la distance moyenne de
+chaque monstre à son plus proche voisin. Ensuite le coût : temps d'un calcul de séparation pour des hordes de plus
+en plus grandes (le temps par monstre doit rester constant, O(n·k)), comparé à toutes les paires (O(n²)).
+
+    python benchmarks/bench_crowd.py [--monsters 300] [--seconds 20] [--counts 500 2000 5000 10000]
+"""
+#librairies
+import argparse
+import random
+import time
+from types import SimpleNamespace
+import numpy as np
+
+import common # racine du dépôt et Panda3D, avant les modules du jeu
+import Game
+
+DT = 1 / 30 # un pas de simulation
+BRUTE_LIMIT = 3000 # au-delà, la matrice de toutes les paires ne tient plus raisonnablement en mémoire
+
+
+def makeGame(base, terrain, count, seed, separation):
+    """Horde de count monstres répartis sur le terrain, joueur immobile au milieu.
+    Les monstres n'ont qu'un noeud nu (comme avec MonsterRenderer), pour pouvoir en créer beaucoup."""
+    size = terrain.terrain_width * terrain.block_size
+    game = common.makeGame(base, terrain, player=(size / 2, size / 2), renderer=SimpleNamespace(), separation=separation)
+    rng = random.Random(seed)
+    for _ in range(count):
+        x, y = rng.uniform(0, size), rng.uniform(0, size)
+        game.monsters.append(game.monsterPool.acquire("normal", [x, y, terrain.getSurfaceLevel(x, y) + 4]))
+    return game
+
+
+def clear(game):
+    """Retire la horde de la scène."""
+    for monster in list(game.monsters):
+        monster.stash()
+        monster.monster.removeNode()
+
+
+def spread(horde):
+    """Paires de monstres superposés (à moins d'une unité) et distance moyenne au plus proche voisin."""
+    points = horde.position[np.flatnonzero(horde.used), :2]
+    distance = np.hypot(*(points[:, None, :] - points[None, :, :]).transpose(2, 0, 1))
+    np.fill_diagonal(distance, np.inf)
+    return int((distance < 1).sum() // 2), float(distance.min(axis=1).mean())
+
+
+def brute(points, radius):
+    """Même poussée que MonsterHorde.separate en comparant toutes les paires (sans limite de voisins)."""
+    away = points[:, None, :] - points[None, :, :]
+    distance = np.hypot(away[:, :, 0], away[:, :, 1])
+    valid = (distance < radius) & (distance > 0)
+    weight = np.where(valid, (radius - distance) / (radius * np.where(valid, distance, 1)), 0)
+    return np.einsum('ij,ijk->ik', weight, away)
+
+
+def timed(function, repeat=5):
+    """Médiane de repeat appels (ms)."""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    return float(np.median(durations)) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--monsters", type=int, default=300)
+    parser.add_argument("--seconds", type=float, default=20)
+    parser.add_argument("--counts", type=int, nargs="+", default=[500, 2000, 5000, 10000])
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    base = common.startBase()
+    random.seed(args.seed)
+    terrain = common.makeTerrain(base)
+    radius = Game.MONSTER_SEPARATION
+
+    print(f"{'séparation':>10} {'superposés':>11} {'plus proche voisin':>19} {'pas (ms)':>9}")
+    for separation in (None, radius):
+        game = makeGame(base, terrain, args.monsters, args.seed, separation)
+        start = time.perf_counter()
+        for _ in range(round(args.seconds / DT)):
+            game.horde.update(DT)
+        elapsed = (time.perf_counter() - start) / round(args.seconds / DT) * 1000
+        overlapping, nearest = spread(game.horde)
+        print(f"{'non' if separation is None else 'oui':>10} {overlapping:>11} {nearest:>19.2f} {elapsed:>9.3f}")
+        clear(game)
+
+    print(f"\n{'monstres':>9} {'séparation (ms)':>16} {'par monstre (µs)':>17} {'toutes paires (ms)':>19}")
+    for count in args.counts:
+        game = makeGame(base, terrain, count, args.seed, radius)
+        horde = game.horde
+        slots = np.flatnonzero(horde.used)
+        # horde resserrée autour du joueur, comme en fin de poursuite
+        angle = np.random.default_rng(0).uniform(0, 2 * np.pi, count)
+        distance = np.sqrt(np.random.default_rng(1).uniform(0, 1, count)) * np.sqrt(count) * 2
+        horde.position[slots, 0] = game.player.position[0] + distance * np.cos(angle)
+        horde.position[slots, 1] = game.player.position[1] + distance * np.sin(angle)
+        duration = timed(lambda: horde.separate(slots, slots))
+        pairs = timed(lambda: brute(horde.position[slots, :2], radius), 3) if count <= BRUTE_LIMIT else None
+        print(f"{count:>9} {duration:>16.3f} {duration / count * 1000:>17.3f} {'-' if pairs is None else f'{pairs:.3f}':>19}")
+        clear(game)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Indépendance au rendu : la même horde simulée sous plusieurs rythmes de frames.
+"variable" avance les monstres du temps de chaque frame (ancien MyGame.update), "fixe" passe par
+SimulationClock. Les positions finales sont comparées à la référence (pas fixes à 30 FPS) après
+--seconds secondes de jeu ; le temps abandonné par la limite de rattrapage (le jeu ralentit au lieu
+de sauter) est aussi affiché.
+
+    python benchmarks/bench_fixed_step.py [--monsters 100] [--seconds 10]
+"""
+#librairies
+import argparse
+import random
+import numpy as np
+
+import common # racine du dépôt et Panda3D, avant les modules du jeu
+import SimulationClock
+
+TICK_RATE = 30
+PATTERNS = { # durées de frame (s), répétées
+    "30 FPS": [1 / 30],
+    "144 FPS": [1 / 144],
+    "60 FPS + saccade 150 ms": [1 / 60] * 59 + [0.150],
+    "60 FPS + saccade 500 ms": [1 / 60] * 59 + [0.500],
+}
+
+
+def makeGame(base, terrain, count, seed):
+    """Partie réduite à ce qu'utilisent les monstres, avec count monstres placés au hasard."""
+    center = terrain.terrain_width * terrain.block_size / 2
+    game = common.makeGame(base, terrain, player=(center, center))
+    rng = random.Random(seed)
+    for _ in range(count):
+        x, y = rng.uniform(0, 2 * center), rng.uniform(0, 2 * center)
+        game.monsters.append(game.monsterPool.acquire("normal", [x, y, rng.uniform(20, 100)]))
+    return game
+
+
+def frames(pattern, seconds):
+    """Durées des frames jusqu'à seconds secondes, la dernière est raccourcie pour tomber juste."""
+    elapsed = 0
+    while True:
+        for dt in pattern:
+            dt = min(dt, seconds - elapsed)
+            if dt <= 1e-12:
+                return
+            elapsed += dt
+            yield dt
+
+
+def run(game, pattern, seconds, fixed):
+    """Simule seconds secondes de jeu, renvoie [positions finales, temps réel abandonné (s)]."""
+    if not fixed:
+        for dt in frames(pattern, seconds):
+            game.horde.update(dt)
+        return game.horde.position[game.horde.used].copy(), 0
+    clock = SimulationClock.SimulationClock(TICK_RATE)
+    ticks = round(seconds * TICK_RATE) # même temps de jeu, même si des frames lentes ont fait abandonner du temps
+    index = 0
+    while clock.ticks < ticks:
+        clock.advance(pattern[index % len(pattern)], lambda dt: game.horde.update(dt) if clock.ticks < ticks else None)
+        index += 1
+    return game.horde.position[game.horde.used].copy(), clock.dropped
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--monsters", type=int, default=100)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    base = common.startBase()
+    random.seed(args.seed)
+    terrain = common.makeTerrain(base)
+
+    reference, _ = run(makeGame(base, terrain, args.monsters, args.seed), PATTERNS["30 FPS"], args.seconds, True)
+    print(f"{'rythme':>24} {'variable : écart max':>21} {'fixe : écart max':>17} {'abandonné (s)':>14}")
+    for label, pattern in PATTERNS.items():
+        variable, _ = run(makeGame(base, terrain, args.monsters, args.seed), pattern, args.seconds, False)
+        fixed, dropped = run(makeGame(base, terrain, args.monsters, args.seed), pattern, args.seconds, True)
+        print(f"{label:>24} {np.abs(variable - reference).max():>21.4f} {np.abs(fixed - reference).max():>17.4f} {dropped:>14.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Benchmark : monstres qui foncent tout droit vers le joueur contre FlowField.
+Un mur de --wall blocs de haut, ouvert d'un passage à une extrémité, sépare la horde du joueur. Après --seconds
+secondes de jeu on compte les monstres arrivés au contact du joueur et ceux restés bloqués contre le mur.
+Ensuite, coût du champ quand le joueur se déplace : temps d'un pas (relaxations), temps d'un calcul complet
+et temps de lecture des directions selon le nombre de monstres.
+
+    python benchmarks/bench_flow_field.py [--monsters 200] [--seconds 150] [--wall 6]
+"""
+#librairies
+import argparse
+import random
+import time
+import numpy as np
+
+import common # racine du dépôt et Panda3D, avant les modules du jeu
+import FlowField
+
+DT = 1 / 30 # un pas de simulation
+
+
+def buildWall(terrain, height):
+    """Mur au milieu du terrain en x, sur toute la longueur sauf un passage de 4 cellules en bas."""
+    grid = terrain.surfaceGrid.copy()
+    middle = grid.shape[0] // 2
+    grid[middle:middle + 2, 4:] += height * terrain.block_size
+    terrain.surfaceGrid = grid
+
+
+def makeGame(base, terrain, count, seed, flow):
+    """Horde de count monstres d'un côté du mur, joueur de l'autre."""
+    size = terrain.terrain_width * terrain.block_size
+    game = common.makeGame(base, terrain, player=(size * 0.2, size * 0.6), flowField=FlowField.FlowField(terrain) if flow else None)
+    rng = random.Random(seed)
+    for _ in range(count):
+        x, y = rng.uniform(size * 0.65, size * 0.95), rng.uniform(size * 0.3, size * 0.95)
+        game.monsters.append(game.monsterPool.acquire("normal", [x, y, terrain.getSurfaceLevel(x, y) + 4]))
+    return game
+
+
+def chase(game, seconds):
+    """Simule la poursuite, renvoie [arrivés, bloqués, temps moyen d'un pas (ms)]."""
+    horde = game.horde
+    ticks = round(seconds / DT)
+    last_second = None
+    start = time.perf_counter()
+    for tick in range(ticks):
+        if game.flowField is not None:
+            game.flowField.update(game.player.position[0], game.player.position[1])
+        horde.update(DT)
+        if tick == ticks - round(1 / DT):
+            last_second = horde.position.copy()
+    elapsed = (time.perf_counter() - start) / ticks * 1000
+    slots = np.flatnonzero(horde.used)
+    arrived = horde.is_attacking[slots] | (np.abs(horde.position[slots, :2] - game.player.position[:2]).max(axis=1) <= 3)
+    moved = np.abs(horde.position[slots] - last_second[slots]).max(axis=1) > 1e-6
+    return int(arrived.sum()), int((~arrived & ~moved).sum()), elapsed
+
+
+def fieldCost(terrain, counts):
+    """Coût du champ pendant que le joueur traverse le terrain en diagonale."""
+    field = FlowField.FlowField(terrain)
+    size = terrain.terrain_width * terrain.block_size
+    start = time.perf_counter()
+    field.update(size / 2, size / 2)
+    while not field.converged:
+        field.update(size / 2, size / 2)
+    full = (time.perf_counter() - start) * 1000
+    steps = []
+    for tick in range(600): # 10 unités/s, un changement de cellule tous les 6 pas environ
+        position = 5 + tick * DT * 10
+        start = time.perf_counter()
+        field.update(position, position)
+        steps.append(time.perf_counter() - start)
+    steps = np.array(steps) * 1000
+    rng = np.random.default_rng(0)
+    lookups = {}
+    for count in counts:
+        xs, ys = rng.uniform(0, size, count), rng.uniform(0, size, count)
+        start = time.perf_counter()
+        for _ in range(100):
+            field.headings(xs, ys)
+        lookups[count] = (time.perf_counter() - start) / 100 * 1000
+    return full, steps, field.recomputes, lookups
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--monsters", type=int, default=200)
+    parser.add_argument("--seconds", type=float, default=150)
+    parser.add_argument("--wall", type=int, default=6, help="hauteur du mur en blocs")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    base = common.startBase()
+    random.seed(args.seed)
+    terrain = common.makeTerrain(base)
+    buildWall(terrain, args.wall)
+
+    print(f"{'déplacement':>12} {'arrivés':>8} {'bloqués':>8} {'pas (ms)':>9}")
+    for flow in (False, True):
+        arrived, stuck, elapsed = chase(makeGame(base, terrain, args.monsters, args.seed, flow), args.seconds)
+        print(f"{'FlowField' if flow else 'tout droit':>12} {arrived:>8} {stuck:>8} {elapsed:>9.3f}")
+
+    full, steps, recomputes, lookups = fieldCost(terrain, [100, 1000, 10000])
+    print(f"\ncalcul complet du champ : {full:.2f} ms")
+    print(f"pas du champ, joueur en mouvement ({recomputes} champs terminés) : moyenne {steps.mean():.3f} ms, "
+          f"p95 {np.percentile(steps, 95):.3f} ms, max {steps.max():.3f} ms")
+    print(f"{'monstres':>9} {'lecture des directions (ms)':>28}")
+    for count, duration in lookups.items():
+        print(f"{count:>9} {duration:>28.4f}")
+
+
+if __name__ == "__main__":
+    main()
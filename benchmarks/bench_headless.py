@@ -0,0 +1,44 @@
+"""Débit de la partie complète sans fenêtre (python main.py --headless) selon le nombre de monstres.
+Chaque taille de horde est jouée deux fois, dans deux processus, avec la même seed et les mêmes entrées
+(Replay.patrol) : les empreintes de l'état final doivent être identiques.
+
+    python benchmarks/bench_headless.py [--counts 0 100 300 500] [--ticks 1500] [--seed 1]
+"""
+#librairies
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+from common import ROOT
+
+
+def measure(count, ticks, seed):
+    """Lance une partie sans fenêtre et renvoie son résultat (dernière ligne JSON)."""
+    process = subprocess.run([sys.executable, os.path.join(ROOT, 'main.py'), '--headless', '--json', '--monsters', str(count),
+                              '--ticks', str(ticks), '--seed', str(seed)],
+                             cwd=ROOT, capture_output=True, text=True)
+    if process.returncode != 0:
+        sys.exit(process.stderr.strip().splitlines()[-1]) # ex : joueur sorti du terrain, mesures sans valeur
+    return json.loads(process.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--counts", type=int, nargs="+", default=[0, 100, 300, 500])
+    parser.add_argument("--ticks", type=int, default=1500)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"{'monstres':>9} {'pas/s':>8} {'p50 (ms)':>9} {'p95 (ms)':>9} {'p99 (ms)':>9} {'max (ms)':>9} {'déterministe':>13}")
+    for count in args.counts:
+        first = measure(count, args.ticks, args.seed)
+        second = measure(count, args.ticks, args.seed)
+        same = "oui" if first['digest'] == second['digest'] else "NON"
+        print(f"{count:>9} {first['ticks/s']:>8.0f} {first['p50']:>9.2f} {first['p95']:>9.2f} {first['p99']:>9.2f} "
+              f"{first['max']:>9.2f} {same:>13}")
+
+
+if __name__ == "__main__":
+    main()
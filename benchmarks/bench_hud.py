@@ -0,0 +1,86 @@
+"""Benchmark : HUD mis à jour une fois par frame, textes régénérés seulement quand leur valeur change.
+Une partie sans fenêtre est jouée avec le profileur : textes régénérés par frame (compteur hudRebuilds) et temps
+de l'étape hud. Ensuite le coût d'une frame du HUD : flush avec les changements d'une frame de combat ordinaire,
+comparé à un HUD qui recrée ses OnscreenText à chaque frame et à un HUD qui redonne tous ses textes (setText)
+à chaque frame. Sans fenêtre rien n'est rendu : la géométrie des
+textes modifiés est demandée à la main (TextNode.getInternalGeom), comme le ferait le rendu.
+
+    python benchmarks/bench_hud.py [--ticks 3000] [--monsters 100] [--frames 2000]
+"""
+#librairies
+import argparse
+import time
+import numpy as np
+
+import common # racine du dépôt et Panda3D, avant les modules du jeu
+import HUD
+import Headless
+
+
+def perFrame(function, frames, hud):
+    """Temps moyen d'une frame du HUD (µs), géométrie des textes comprise."""
+    start = time.perf_counter()
+    for frame in range(frames):
+        function(frame)
+        for text in hud.texts.values():
+            text.textNode.getInternalGeom() # géométrie générée seulement si le texte a changé
+    return (time.perf_counter() - start) / frames * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ticks", type=int, default=3000)
+    parser.add_argument("--monsters", type=int, default=100)
+    parser.add_argument("--frames", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    common.configure()
+    base = Headless.HeadlessGame()
+    game = Headless.run(base, args.seed, args.ticks, monsters=args.monsters, profile=True)['game']
+    profiler = game.profiler
+    rebuilds = profiler.counterSamples[:profiler.count, profiler.counterIndex['hudRebuilds']]
+    stage = profiler.percentiles()['hud']
+    print(f"partie : {args.ticks} frames, score {game.GameManager.score}, {game.hud.totalRebuilds} textes régénérés "
+          f"({game.hud.totalRebuilds / args.ticks:.4f} par frame)")
+    print(f"{'textes régénérés par frame':>28} : sur les {profiler.count} dernières frames, moyenne {rebuilds.mean():.3f}, "
+          f"max {rebuilds.max():.0f}, frames sans aucun {np.mean(rebuilds == 0) * 100:.1f} %")
+    print(f"{'étape hud (ms)':>28} : p50 {stage['p50']:.4f}, p95 {stage['p95']:.4f}, p99 {stage['p99']:.4f}")
+
+    hud = HUD.HUD(base)
+    health = [100 - frame % 50 for frame in range(args.frames)]
+
+    def batched(frame):
+        """Une frame de combat : le joueur est touché, le nombre de monstres bouge une frame sur dix."""
+        hud.set('health', health[frame])
+        hud.set('monsters', frame // 10)
+        hud.set('score', game.GameManager.score)
+        hud.flush()
+
+    def values(frame):
+        """Valeurs des textes à une frame, les mêmes que dans batched."""
+        return {'score': game.GameManager.score, 'wave': 0, 'monsters': frame // 10, 'remaining': 0, 'kills': 0}
+
+    def recreated(frame):
+        """OnscreenText détruits et recréés à chaque frame."""
+        hud.barre.setScale(health[frame] / 100, 1, 1)
+        for name, value in values(frame).items():
+            old = hud.texts[name]
+            hud.texts[name] = HUD.OnscreenText(text=HUD.TEXTS[name][0].format(value), parent=base.a2dTopRight,
+                                               pos=old.getPos(), scale=0.06, align=HUD.TextNode.ARight, mayChange=True)
+            old.destroy()
+
+    def everything(frame):
+        """Tous les textes redonnés à chaque frame (régénérés par Panda seulement si le texte a changé)."""
+        hud.barre.setScale(health[frame] / 100, 1, 1)
+        for name, value in values(frame).items():
+            hud.texts[name].setText(HUD.TEXTS[name][0].format(value))
+
+    print(f"\n{'HUD':>28} {'µs par frame':>13}")
+    print(f"{'OnscreenText recréés':>28} {perFrame(recreated, args.frames, hud):>13.1f}")
+    print(f"{'tous les textes (setText)':>28} {perFrame(everything, args.frames, hud):>13.1f}")
+    print(f"{'valeurs modifiées (flush)':>28} {perFrame(batched, args.frames, hud):>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""Benchmark : mise à jour des monstres objet par objet contre MonsterHorde.update.
+La mise à jour objet par objet est l'ancien Monster.update, gardé ici comme référence (objectUpdate).
+Les deux méthodes partent du même état (même seed) et doivent aboutir au même résultat :
+positions, vies, attaques en recharge, vie du joueur et score sont comparés à la fin.
+
+    python benchmarks/bench_monster_horde.py [--counts 10 100 500] [--frames 120]
+"""
+#librairies
+import argparse
+import random
+import time
+from math import sin, cos, atan2, degrees, radians
+import numpy as np
+
+import common # racine du dépôt et Panda3D, avant les modules du jeu
+import FlowField
+
+DT = 1 / 30 # une frame à 30 FPS
+
+
+def makeGame(base, terrain, count, seed):
+    """Partie réduite à ce qu'utilisent les monstres, avec count monstres placés au hasard."""
+    center = terrain.terrain_width * terrain.block_size / 2
+    game = common.makeGame(base, terrain, player=(center, center),
+                           flowField=FlowField.FlowField(terrain)) # chemins vers le joueur, qui ne bouge pas
+    while not game.flowField.converged or game.flowField.goal is None:
+        game.flowField.update(center, center)
+    rng = random.Random(seed)
+    for _ in range(count):
+        x, y = rng.uniform(0, 2 * center), rng.uniform(0, 2 * center)
+        game.monsters.append(game.monsterPool.acquire("normal", [x, y, rng.uniform(20, 100)]))
+    return game
+
+
+def objectUpdate(monster, dt):
+    """Ancien Monster.update : un monstre vivant attaque le joueur à portée, sinon avance vers lui."""
+    if not monster.is_alive: # mort et recharge arrivent par les événements et minuteries de Combat
+        return
+    game = monster.game
+    distance = monster.getDistanceToPlayer()
+    monster.monster.setH(objectHeading(monster, distance))
+    if all(abs(elt) <= monster.attack_range * monster.size // 2 for elt in distance): # joueur à portée
+        if not monster.is_attacking:
+            game.combat.post('hit', monster, game.player) # dégâts appliqués à la fin du pas
+            game.combat.startReload(monster)
+        if monster.is_walking:
+            monster.stopWalkAnimation()
+        return
+    x, y = monster.position[0], monster.position[1]
+    if game.terrain.getSurfaceLevel(x, y) <= monster.position[2] + monster.size: # pas de mur devant
+        objectStep(monster, dt)
+    else: # contourner le mur en suivant le champ de directions, sinon rester bloqué
+        heading = None if game.flowField is None else game.flowField.headingAt(x, y)
+        if heading is not None:
+            monster.monster.setH(heading)
+            objectStep(monster, dt)
+    monster.monster.setPos(*monster.position)
+    game.monsterGrid.move(monster, monster.position[0], monster.position[1])
+    if not monster.is_attacking:
+        monster.playWalkAnimation()
+
+
+def objectHeading(monster, distance):
+    """Direction du monstre : le champ de directions loin du joueur, tout droit vers lui sinon."""
+    field = monster.game.flowField
+    if field is not None and distance[0] ** 2 + distance[1] ** 2 > field.direct_radius ** 2:
+        heading = field.headingAt(monster.position[0], monster.position[1])
+        if heading is not None:
+            return heading
+    return degrees(atan2(distance[1], distance[0]))
+
+
+def objectStep(monster, dt):
+    """Avance le monstre dans la direction de son noeud, puis gravité et maintien au niveau du sol."""
+    heading = radians(monster.monster.getH())
+    monster.position[0] += dt * monster.speed * cos(heading)
+    monster.position[1] += dt * monster.speed * sin(heading)
+    ground = monster.game.terrain.getSurfaceLevel(monster.position[0] - 0.5 * monster.size, monster.position[1]) + monster.size
+    if monster.position[2] > ground: # au-dessus du sol : gravité
+        monster.position[2] = max(monster.position[2] + monster.gravity * dt, ground)
+    if monster.position[2] <= ground:
+        monster.position[2] = ground
+
+
+def run(game, frames, batched):
+    """Avance la partie de frames frames, temps moyen (ms) d'une mise à jour de tous les monstres."""
+    elapsed = 0
+    for frame in range(frames):
+        if frame == frames // 2:
+            for monster in game.monsters[::7]:
+                game.combat.post('damage', monster, 100) # quelques monstres meurent en cours de route
+        start = time.perf_counter()
+        game.combat.advance(DT) # recharges
+        if batched:
+            game.horde.update(DT)
+            game.horde.syncNodes() # noeuds placés une fois par frame
+        else:
+            for monster in list(game.monsters):
+                objectUpdate(monster, DT)
+        game.combat.flush() # coups, morts et retraits du pas
+        elapsed += time.perf_counter() - start
+    return elapsed / frames * 1000
+
+
+def snapshot(game):
+    """État final comparable entre les deux méthodes."""
+    monsters = sorted(game.monsters, key=lambda monster: monster.slot)
+    return {
+        'position': np.array([monster.position for monster in monsters]),
+        'health': np.array([monster.health for monster in monsters]),
+        'is_attacking': np.array([monster.is_attacking for monster in monsters]),
+        'player': game.player.health,
+        'score': game.GameManager.score,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--counts", type=int, nargs="+", default=[10, 100, 500])
+    parser.add_argument("--frames", type=int, default=120)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    base = common.startBase() # modèles partagés, comme Menu
+    random.seed(args.seed)
+    terrain = common.makeTerrain(base)
+
+    print(f"{'monstres':>9} {'objets (ms)':>12} {'horde (ms)':>11} {'gain':>6} {'écart max position':>19} {'identiques':>11}")
+    for count in args.counts:
+        results = []
+        for batched in (False, True):
+            game = makeGame(base, terrain, count, args.seed)
+            results.append((run(game, args.frames, batched), snapshot(game)))
+            for monster in game.monsters + game.monsterPool.free.get("normal", []):
+                monster.monster.cleanup()
+                monster.monster.removeNode()
+        (objects, reference), (horde, batched) = results
+        gap = np.abs(reference['position'] - batched['position']).max() if len(reference['position']) else 0
+        same = (gap < 1e-9 and np.array_equal(reference['health'], batched['health'])
+                and np.array_equal(reference['is_attacking'], batched['is_attacking'])
+                and reference['player'] == batched['player'] and reference['score'] == batched['score'])
+        print(f"{count:>9} {objects:>12.3f} {horde:>11.3f} {objects / horde:>5.1f}x {gap:>19.2e} {'oui' if same else 'NON':>11}")
+
+
+if __name__ == "__main__":
+    main()
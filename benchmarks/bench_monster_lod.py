@@ -0,0 +1,94 @@
+"""Benchmark : coût d'un pas de la horde avec et sans niveaux de détail (Game.MONSTER_LOD) selon le nombre de monstres.
+Les monstres sont répartis au hasard sur le terrain, le joueur au milieu. Un pas comprend la mise à jour de la horde,
+le placement des noeuds (syncNodes) et une traversée des collisions autour du joueur. Le temps par pas doit rester
+à peu près plat quand la horde grandit, les monstres éloignés n'étant mis à jour que tous les k pas.
+
+    python benchmarks/bench_monster_lod.py [--counts 100 500 1000] [--ticks 150]
+"""
+#librairies
+import argparse
+import random
+import time
+import numpy as np
+
+import common # racine du dépôt et Panda3D, avant les modules du jeu
+
+#librairies panda3d
+from panda3d.core import BitMask32, CollisionTraverser, CollisionHandlerQueue
+from panda3d.core import CollisionNode, CollisionSphere
+
+import Game
+
+DT = 1 / 30 # un pas de simulation
+
+
+def makeGame(base, terrain, count, seed, tiers):
+    """Horde de count monstres répartis sur le terrain, joueur au milieu."""
+    size = terrain.terrain_width * terrain.block_size
+    game = common.makeGame(base, terrain, player=(size / 2, size / 2), tiers=tiers)
+    # collisions du joueur contre les monstres, comme le pusher de Player
+    sphere = CollisionNode('player')
+    sphere.addSolid(CollisionSphere(0, 0, 0, 1.5))
+    sphere.setFromCollideMask(game.worldMask)
+    sphere.setIntoCollideMask(BitMask32.allOff())
+    game.playerNode = base.render.attachNewNode(sphere)
+    game.playerNode.setPos(*game.player.position)
+    game.cTrav = CollisionTraverser()
+    game.cTrav.addCollider(game.playerNode, CollisionHandlerQueue())
+    rng = random.Random(seed)
+    for _ in range(count):
+        x, y = rng.uniform(0, size), rng.uniform(0, size)
+        game.monsters.append(game.monsterPool.acquire("normal", [x, y, terrain.getSurfaceLevel(x, y) + 4]))
+    return game
+
+
+def play(game, ticks):
+    """Joue ticks pas, renvoie le temps de chaque pas (ms)."""
+    durations = []
+    for _ in range(ticks):
+        start = time.perf_counter()
+        game.horde.update(DT)
+        game.horde.syncNodes()
+        game.cTrav.traverse(game.screen.render)
+        durations.append(time.perf_counter() - start)
+    return np.array(durations) * 1000
+
+
+def clear(game):
+    """Retire la horde et le joueur de la scène."""
+    for monster in list(game.monsters):
+        monster.stash()
+        if hasattr(monster.monster, 'cleanup'): # Actor
+            monster.monster.cleanup()
+        monster.monster.removeNode()
+    game.playerNode.removeNode()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--counts", type=int, nargs="+", default=[100, 500, 1000])
+    parser.add_argument("--ticks", type=int, default=150)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    base = common.startBase()
+    random.seed(args.seed)
+    terrain = common.makeTerrain(base)
+
+    print(f"niveaux de détail : {Game.MONSTER_LOD}")
+    print(f"{'monstres':>9} {'sans (ms)':>10} {'avec (ms)':>10} {'gain':>6} {'p95 sans':>9} {'p95 avec':>9} {'par niveau':>16}")
+    for count in args.counts:
+        results = []
+        for tiers in (None, Game.MONSTER_LOD):
+            game = makeGame(base, terrain, count, args.seed, tiers)
+            durations = play(game, args.ticks)
+            slots = np.flatnonzero(game.horde.used)
+            results.append((durations, np.bincount(game.horde.tier[slots], minlength=len(Game.MONSTER_LOD))))
+            clear(game)
+        (without, _), (with_lod, tiers) = results
+        print(f"{count:>9} {without.mean():>10.3f} {with_lod.mean():>10.3f} {without.mean() / with_lod.mean():>5.1f}x "
+              f"{np.percentile(without, 95):>9.3f} {np.percentile(with_lod, 95):>9.3f} {'/'.join(map(str, tiers)):>16}")
+
+
+if __name__ == "__main__":
+    main()
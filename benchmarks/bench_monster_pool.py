@@ -0,0 +1,70 @@
+"""Benchmark : spawns et morts en rafale, monstres recréés à chaque spawn contre MonsterPool.
+Chaque vague fait apparaître --wave monstres puis les tue tous ; on mesure le temps moyen et le pire
+temps d'un spawn, et le temps des morts, avec un Actor par monstre (rendu sans instanciation).
+
+    python benchmarks/bench_monster_pool.py [--waves 10] [--wave 30]
+"""
+#librairies
+import argparse
+import gc
+import time
+
+import common # racine du dépôt et Panda3D, avant les modules du jeu
+from Monster import Monster
+
+
+class NoPool():
+    """Ancien comportement : un nouveau monstre à chaque spawn, détruit à sa mort."""
+    def __init__(self, game):
+        self.game = game
+
+    def prewarm(self, monster_type, count):
+        pass
+
+    def acquire(self, monster_type, position):
+        return Monster(self.game, position, self.game.archetypes.monster(monster_type))
+
+    def release(self, monster):
+        monster.stash()
+        monster.monster.cleanup()
+        monster.monster.removeNode()
+
+
+def run(base, pooled, waves, wave):
+    """Joue waves vagues, renvoie [spawn moyen (ms), pire spawn (ms), morts par vague (ms), pool]."""
+    game = common.makeGame(base)
+    if not pooled:
+        game.monsterPool = NoPool(game)
+    game.monsterPool.prewarm("normal", wave) # au lancement de la partie, hors mesure
+    spawns = []
+    deaths = 0
+    for _ in range(waves):
+        for index in range(wave):
+            start = time.perf_counter()
+            game.monsters.append(game.monsterPool.acquire("normal", [index * 4, 0, 10]))
+            spawns.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        for monster in list(game.monsters):
+            game.combat.post('damage', monster, 100)
+        game.combat.flush() # morts, puis retrait de tous les monstres en une fois
+        deaths += time.perf_counter() - start
+        gc.collect() # hors mesure : même point de départ pour la vague suivante
+    return sum(spawns) / len(spawns) * 1000, max(spawns) * 1000, deaths / waves * 1000, game.monsterPool
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--waves", type=int, default=10)
+    parser.add_argument("--wave", type=int, default=30, help="monstres par vague")
+    args = parser.parse_args()
+
+    base = common.startBase() # modèles partagés, comme Menu
+    print(f"{'mode':>7} {'spawn moyen (ms)':>17} {'pire spawn (ms)':>16} {'morts / vague (ms)':>19} {'hits':>6} {'misses':>7} {'pic':>5}")
+    for pooled in (False, True):
+        mean, worst, deaths, pool = run(base, pooled, args.waves, args.wave)
+        counters = (f"{pool.hits:>6} {pool.misses:>7} {pool.peak:>5}" if pooled else f"{'-':>6} {'-':>7} {'-':>5}")
+        print(f"{'pool' if pooled else 'new':>7} {mean:>17.3f} {worst:>16.3f} {deaths:>19.3f} {counters}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Rendu des monstres hors écran : un Actor par monstre contre MonsterRenderer (instanciation).
+Pour chaque taille de horde : temps de création des monstres, appels de dessin (Geoms dessinés,
+une instance de plus ne coûte pas d'appel) et temps moyen d'une frame animée.
+
+    python benchmarks/bench_monster_render.py [--counts 50 200 500] [--frames 60]
+"""
+#librairies
+import argparse
+import random
+import sys
+import time
+
+import common # racine du dépôt et Panda3D, avant les modules du jeu
+
+#librairies panda3d
+from panda3d.core import DirectionalLight, AmbientLight
+
+import MonsterRenderer
+from Monster import Monster
+
+AREA = 100 # côté de la zone où sont placés les monstres
+
+
+def setupScene(base):
+    """Caméra qui voit toute la zone et lumières du jeu."""
+    base.disableMouse()
+    base.camera.setPos(0, -AREA * 1.2, AREA * 0.6)
+    base.camera.lookAt(0, 0, 0)
+    light = base.render.attachNewNode(DirectionalLight('mainLight'))
+    light.setHpr(30, -60, 0)
+    base.render.setLight(light)
+    ambient = AmbientLight('ambient light')
+    ambient.setColor((0.3, 0.3, 0.3, 1))
+    base.render.setLight(base.render.attachNewNode(ambient))
+
+
+def drawCalls(base):
+    """Geoms visibles sous render : un appel de dessin chacun, quel que soit son nombre d'instances."""
+    return sum(path.node().getNumGeoms() for path in base.render.findAllMatches('**/+GeomNode')
+               if not path.isHidden())
+
+
+def run(base, count, instanced, frames, seed):
+    """Crée count monstres et mesure les frames, renvoie [création (s), appels de dessin, frame (ms)]."""
+    game = common.makeGame(base)
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    game.monsterRenderer = MonsterRenderer.MonsterRenderer(game) if instanced else None
+    for _ in range(count):
+        monster = Monster(game, [rng.uniform(-AREA / 2, AREA / 2), rng.uniform(-AREA / 2, AREA / 2), 0], game.archetypes.monster("normal"))
+        monster.playWalkAnimation()
+        game.monsters.append(monster)
+    creation = time.perf_counter() - start
+
+    def frame():
+        """Une frame : les monstres tournent sur eux-mêmes, puis animation et rendu."""
+        horde = game.horde
+        horde.heading[:] += 3
+        horde.syncNodes()
+        if game.monsterRenderer is not None:
+            game.monsterRenderer.update(horde)
+        base.taskMgr.step()
+
+    frame() # première frame : préparation des Geoms et des shaders
+    calls = drawCalls(base)
+    start = time.perf_counter()
+    for _ in range(frames):
+        frame()
+    frame_time = (time.perf_counter() - start) / frames * 1000
+
+    for monster in game.monsters:
+        if game.monsterRenderer is None:
+            monster.monster.cleanup()
+        monster.monster.removeNode()
+    if game.monsterRenderer is not None:
+        game.monsterRenderer.unload()
+    return creation, calls, frame_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--counts", type=int, nargs="+", default=[50, 200, 500])
+    parser.add_argument("--frames", type=int, default=60)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    base = common.startBase("offscreen") # modèles partagés, comme Menu
+    if base.win is None:
+        sys.exit("pas de tampon hors écran disponible")
+    setupScene(base)
+
+    print(f"{'monstres':>9} {'mode':>10} {'création (s)':>13} {'appels de dessin':>17} {'frame (ms)':>11}")
+    for count in args.counts:
+        for instanced in (False, True):
+            creation, calls, frame_time = run(base, count, instanced, args.frames, args.seed)
+            mode = "instances" if instanced else "actors"
+            print(f"{count:>9} {mode:>10} {creation:>13.3f} {calls:>17} {frame_time:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Benchmark : physique du joueur par le CollisionTraverser contre PlayerPhysics (grille des hauteurs).
+D'abord une partie sans fenêtre jouée dans chaque mode (même seed, mêmes entrées) : temps des étapes collisions
+et joueur du profileur, et du pas entier. Ensuite des cas simples sur une grille construite à la main :
+marche d'un bloc (le joueur monte), mur de deux blocs (il s'arrête), mur de biais (il glisse le long).
+
+    python benchmarks/bench_player_physics.py [--ticks 3000] [--monsters 100] [--seed 1]
+"""
+#librairies
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from types import SimpleNamespace
+import numpy as np
+
+from common import ROOT # racine du dépôt, avant les modules du jeu
+import PlayerPhysics
+
+
+def measure(ticks, monsters, seed, collisions):
+    """Partie sans fenêtre dans un processus, renvoie [résultat, percentiles du profileur]."""
+    with tempfile.TemporaryDirectory() as folder:
+        profile = os.path.join(folder, 'profil.json')
+        command = [sys.executable, os.path.join(ROOT, 'main.py'), '--headless', '--json', '--ticks', str(ticks),
+                   '--monsters', str(monsters), '--seed', str(seed), '--profile', profile]
+        if collisions:
+            command.append('--collisions')
+        process = subprocess.run(command, cwd=ROOT, capture_output=True, text=True)
+        if process.returncode != 0:
+            sys.exit(process.stderr.strip().splitlines()[-1]) # ex : joueur sorti du terrain, mesures sans valeur
+        output = process.stdout
+        with open(profile) as file:
+            percentiles = json.load(file)['percentiles']
+    return json.loads(output.strip().splitlines()[-1]), percentiles
+
+
+def walk(levels, start, direction, seconds=1, speed=10, dt=1 / 30, height=3.5):
+    """Le joueur avance tout droit sur une grille de niveaux (en blocs), renvoie sa position finale [x, y, z]."""
+    terrain = SimpleNamespace(block_size=2, surfaceGrid=np.array(levels) * 2)
+    terrain.getCellLevel = lambda x, y: (int(terrain.surfaceGrid[x, y]) if 0 <= x < terrain.surfaceGrid.shape[0]
+                                         and 0 <= y < terrain.surfaceGrid.shape[1] else None)
+    physics = PlayerPhysics.PlayerPhysics(terrain)
+    x, y = start
+    z = physics.floorUnder(x, y, 100) + height
+    for _ in range(round(seconds / dt)):
+        x, y = physics.move(x, y, direction[0] * speed * dt, direction[1] * speed * dt, z - physics.radius)
+        z = physics.floorUnder(x, y, z + height) + height # toujours au sol (pas de gravité ici)
+    return x, y, z
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ticks", type=int, default=3000)
+    parser.add_argument("--monsters", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"{'physique':>18} {'collisions p50':>15} {'p95':>6} {'joueur p50':>11} {'p95':>6} {'pas p50':>8} {'pas p95':>8}")
+    for collisions in (True, False):
+        result, percentiles = measure(args.ticks, args.monsters, args.seed, collisions)
+        print(f"{'CollisionTraverser' if collisions else 'PlayerPhysics':>18} {percentiles['collisions']['p50']:>15.3f} "
+              f"{percentiles['collisions']['p95']:>6.3f} {percentiles['player']['p50']:>11.3f} {percentiles['player']['p95']:>6.3f} "
+              f"{result['p50']:>8.3f} {result['p95']:>8.3f}")
+
+    flat = np.zeros((12, 12), dtype=int)
+    step = flat.copy()
+    step[6:, :] = 1 # marche d'un bloc à x = 11
+    wall = flat.copy()
+    wall[6:, :] = 2 # mur de deux blocs à x = 11
+    print(f"\n{'cas':>22} {'position finale':>22}  attendu")
+    cases = [("marche d'un bloc", step, (1, 0), "monte sur la marche (z = 6.5)"),
+             ("mur de deux blocs", wall, (1, 0), "arrêté contre le mur (x = 10.5)"),
+             ("mur de biais", wall, (0.8, 0.6), "arrêté en x, glisse en y")]
+    for name, levels, direction, expected in cases:
+        x, y, z = walk(levels, (4, 4), direction)
+        print(f"{name:>22} {f'({x:.2f}, {y:.2f}, {z:.2f})':>22}  {expected}")
+
+
+if __name__ == "__main__":
+    main()
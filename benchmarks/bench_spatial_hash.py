@@ -0,0 +1,73 @@
+"""Benchmark : recherche des monstres proches du joueur, parcours de toute la liste contre SpatialHash.
+Pour chaque taille de horde : temps d'une recherche (attaque du joueur) et temps de mise à jour
+de la grille quand tous les monstres bougent pendant une frame.
+
+    python benchmarks/bench_spatial_hash.py [--counts 10 100 1000] [--radius 19.8]
+"""
+#librairies
+import argparse
+import random
+import time
+
+import common # racine du dépôt, avant les modules du jeu
+import SpatialHash
+
+WORLD = 150 # côté de la carte (75 blocs de 2)
+
+
+class Entity():
+    """Monstre réduit à sa position."""
+    def __init__(self, x, y):
+        self.position = [x, y, 0]
+
+
+def linearQuery(entities, x, y, radius):
+    """Ancienne méthode : distance à chaque monstre de la liste."""
+    found = []
+    for entity in entities:
+        dx = entity.position[0] - x
+        dy = entity.position[1] - y
+        if dx * dx + dy * dy <= radius * radius:
+            found.append(entity)
+    return found
+
+
+def perCall(function, repeat):
+    """Temps moyen (µs) d'un appel."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--counts", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--radius", type=float, default=4 * 3.5 * 2 ** 0.5, help="rayon de recherche (attaque sans arme)")
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    print(f"{'monstres':>9} {'liste (µs)':>11} {'grille (µs)':>12} {'trouvés':>8} {'màj grille / frame (µs)':>24}")
+    for count in args.counts:
+        entities = [Entity(rng.uniform(0, WORLD), rng.uniform(0, WORLD)) for _ in range(count)]
+        grid = SpatialHash.SpatialHash()
+        for entity in entities:
+            grid.insert(entity, entity.position[0], entity.position[1], 3.5)
+        x, y = WORLD / 2, WORLD / 2
+        assert set(grid.queryRadius(x, y, args.radius)) == set(linearQuery(entities, x, y, args.radius))
+
+        linear = perCall(lambda: linearQuery(entities, x, y, args.radius), args.repeat)
+        hashed = perCall(lambda: grid.queryRadius(x, y, args.radius), args.repeat)
+
+        def moveAll():
+            for entity in entities: # déplacement d'une frame à 2 unités/s et 30 FPS
+                entity.position[0] += 2 / 30
+                grid.move(entity, entity.position[0], entity.position[1])
+        update = perCall(moveAll, max(1, args.repeat // 10))
+        found = len(grid.queryRadius(x, y, args.radius))
+        print(f"{count:>9} {linear:>11.1f} {hashed:>12.1f} {found:>8} {update:>24.1f}")
+
+
+if __name__ == "__main__":
+    main()
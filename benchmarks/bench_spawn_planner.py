@@ -0,0 +1,97 @@
+"""Benchmark : apparitions des monstres programmées par SpawnPlanner au début de chaque vague.
+D'abord la qualité des positions : --spawns apparitions tirées comme avant (random.randint sur la taille du terrain)
+puis par le planificateur, le joueur au milieu du terrain ; on compte celles trop près du joueur, celles sur une
+cellule non praticable et la part du terrain où un monstre peut apparaître. Ensuite le coût : table des cellules,
+programme d'une vague selon sa taille, et sortie des apparitions échues pendant la vague. Enfin un programme
+rejoué (replay) doit redonner exactement les mêmes apparitions.
+
+    python benchmarks/bench_spawn_planner.py [--spawns 10000] [--counts 10 100 1000 10000] [--seed 1]
+"""
+#librairies
+import argparse
+import random
+import time
+import numpy as np
+
+import common # racine du dépôt et Panda3D, avant les modules du jeu
+import SpawnPlanner
+
+DT = 1 / 30 # un pas de simulation
+
+
+def quality(planner, points, player):
+    """Apparitions trop près du joueur, sur une cellule non praticable, et cellules du terrain atteintes (%)."""
+    terrain = planner.terrain
+    cells_x = np.ceil(points[:, 0] / terrain.block_size).astype(np.int64) # comme Terrain.getSurfaceLevels
+    cells_y = np.ceil(points[:, 1] / terrain.block_size).astype(np.int64)
+    walkable = planner.walkable(terrain.surfaceGrid)
+    close = int((np.hypot(points[:, 0] - player[0], points[:, 1] - player[1]) < planner.min_distance).sum())
+    blocked = int((~walkable[cells_x, cells_y]).sum())
+    reached = len(set(zip(cells_x.tolist(), cells_y.tolist()))) / walkable.size * 100
+    return close, blocked, reached
+
+
+def timed(function, repeat=5):
+    """Médiane de repeat appels (ms)."""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    return float(np.median(durations)) * 1000
+
+
+def drain(planner):
+    """Joue la vague pas à pas jusqu'à la dernière apparition, renvoie les apparitions et le nombre de pas."""
+    spawned, steps = [], 0
+    while len(planner):
+        planner.advance(DT)
+        steps += 1
+        while planner.isDue():
+            spawned.append(planner.pop())
+    return spawned, steps
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--spawns", type=int, default=10000)
+    parser.add_argument("--counts", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    base = common.startBase()
+    random.seed(args.seed)
+    terrain = common.makeTerrain(base)
+    size = terrain.terrain_width * terrain.block_size
+    player = (size / 2, size / 2)
+    planner = SpawnPlanner.SpawnPlanner(terrain, seed=args.seed)
+
+    before = np.array([(random.randint(0, terrain.terrain_width), random.randint(0, terrain.terrain_length))
+                       for _ in range(args.spawns)], dtype=np.float64) # ancien GameManagement.spawn_monster
+    after = np.array([position for _, _, position in planner.plan(args.spawns, 0, ["normal"], player)])
+    print(f"{planner.buildCells().shape[0]} cellules praticables sur {terrain.surfaceGrid.size}, "
+          f"joueur en ({player[0]:.0f}, {player[1]:.0f}), distance minimale {planner.min_distance}\n")
+    print(f"{'positions':>14} {'près du joueur':>15} {'non praticables':>16} {'terrain atteint (%)':>20}")
+    for name, points in (("randint", before), ("SpawnPlanner", after)):
+        close, blocked, reached = quality(planner, points, player)
+        print(f"{name:>14} {close:>15} {blocked:>16} {reached:>20.1f}")
+
+    print(f"\ntable des cellules : {timed(lambda: planner.cellPositions(terrain.surfaceGrid, 0, 0)):.3f} ms (une fois par terrain)")
+    print(f"\n{'monstres':>9} {'programme (ms)':>15} {'pas de vague':>13} {'sortie par pas (µs)':>20}")
+    for count in args.counts:
+        plan = timed(lambda: planner.plan(count, 10, ["normal"], player))
+        planner.plan(count, 10, ["normal"], player)
+        start = time.perf_counter()
+        _, steps = drain(planner)
+        per_step = (time.perf_counter() - start) / steps * 1e6
+        print(f"{count:>9} {plan:>15.3f} {steps:>13} {per_step:>20.2f}")
+
+    schedule = planner.plan(1000, 10, ["normal"], player)
+    played, _ = drain(planner)
+    planner.replay(schedule)
+    replayed, _ = drain(planner)
+    print(f"\nprogramme rejoué identique : {'oui' if played == replayed else 'non'}")
+
+
+if __name__ == "__main__":
+    main()
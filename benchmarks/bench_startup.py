@@ -0,0 +1,72 @@
+"""Temps de démarrage, de l'import du menu (comme main.py) jusqu'à la première frame de la partie.
+Chaque mesure tourne dans un nouveau processus, hors écran, en cliquant sur "Jouer" dès l'ouverture du menu.
+"froid" vide d'abord les caches (ressources/cache/models et ressources/cache/terrain), "chaud" les réutilise.
+
+    python benchmarks/bench_startup.py [--runs 3]
+"""
+#librairies
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+import common
+from common import ROOT
+CACHES = [os.path.join(ROOT, 'ressources', 'cache', name) for name in ('models', 'terrain')]
+
+
+def child():
+    """Démarre le jeu et affiche en JSON les temps jusqu'au menu, aux modèles chargés et à la première frame."""
+    start = time.perf_counter()
+    common.configure("offscreen")
+    import Menu
+
+    menu = Menu.Menu()
+    times = {'menu': time.perf_counter() - start}
+    loaded = menu.demarrer_partie
+
+    def demarrer_partie(echecs=None):
+        times['modèles'] = time.perf_counter() - start
+        loaded(echecs)
+
+    menu.demarrer_partie = demarrer_partie
+    menu.lancer_partie()
+    while not menu.taskMgr.hasTaskNamed('update'): # la partie est créée à la fin du préchargement
+        menu.taskMgr.step()
+    menu.taskMgr.step() # première frame de la partie
+    times['première frame'] = time.perf_counter() - start
+    times['cache'] = [menu.assets.hits, menu.assets.misses]
+    print(json.dumps(times))
+
+
+def measure():
+    """Lance un processus de démarrage et renvoie ses temps."""
+    output = subprocess.run([sys.executable, os.path.abspath(__file__), '--child'],
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child()
+        return
+
+    print(f"{'démarrage':>10} {'menu (s)':>9} {'modèles (s)':>12} {'première frame (s)':>19} {'hits/misses':>12}")
+    for _ in range(args.runs):
+        for cache in CACHES:
+            shutil.rmtree(cache, ignore_errors=True)
+        for label in ("froid", "chaud"):
+            times = measure()
+            hits, misses = times['cache']
+            print(f"{label:>10} {times['menu']:>9.2f} {times['modèles']:>12.2f} {times['première frame']:>19.2f} {f'{hits}/{misses}':>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Benchmark : génération de la carte des hauteurs.
+Compare l'ancienne boucle (un appel PerlinNoise par cellule) avec TerrainNoise.generateHeights.
+
+    python benchmarks/bench_terrain_noise.py [--sizes 75 256 1024] [--seed 42]
+"""
+#librairies
+import argparse
+import time
+import numpy as np
+from perlin_noise import PerlinNoise
+
+import common # racine du dépôt, avant les modules du jeu
+import TerrainNoise
+
+MAX_HEIGHT = 10
+OCTAVES = 0.6
+SCALE = 0.1
+
+
+def loopHeights(seed, width, length):
+    """Ancienne génération, cellule par cellule (copie de Terrain.generateTerrain avant vectorisation)."""
+    noise = PerlinNoise(octaves=OCTAVES, seed=seed)
+    heights = np.zeros((width, length), dtype=np.int32)
+    for y in range(length):
+        for x in range(width):
+            noise_value = noise([x * SCALE, y * SCALE])
+            height = int((noise_value + 1) / 2 * MAX_HEIGHT)
+            heights[x, y] = max(0, min(height, MAX_HEIGHT))
+    return heights
+
+
+def vectorizedHeights(seed, width, length):
+    """Nouvelle génération vectorisée."""
+    return TerrainNoise.generateHeights(seed, width, length, MAX_HEIGHT, OCTAVES, SCALE)
+
+
+def timeIt(function, *args):
+    """Temps d'exécution (s) et résultat d'un appel."""
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[75, 256, 1024])
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"{'taille':>11} {'boucle (s)':>12} {'numpy (s)':>12} {'gain':>8} {'cellules différentes':>22}")
+    for size in args.sizes:
+        loop_time, loop_result = timeIt(loopHeights, args.seed, size, size)
+        numpy_time, numpy_result = timeIt(vectorizedHeights, args.seed, size, size)
+        mismatches = int(np.count_nonzero(loop_result != numpy_result))
+        print(f"{size:>5}x{size:<5} {loop_time:>12.4f} {numpy_time:>12.4f} {loop_time / numpy_time:>7.0f}x {mismatches:>22}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Statistiques de rendu du terrain en mode "blocks" et "chunks", sans fenêtre.
+Compte les noeuds, GeomNodes et Geoms (un Geom = un appel de dessin) sous le terrain,
+et mesure le temps de génération et d'une frame si un tampon hors écran est disponible.
+
+    python benchmarks/bench_terrain_render.py [--seed 42] [--frames 30]
+"""
+#librairies
+import argparse
+import random
+import time
+
+import common # racine du dépôt et Panda3D, avant les modules du jeu
+
+
+def sceneStats(root):
+    """Compte les noeuds, GeomNodes et Geoms sous un noeud."""
+    geom_nodes = root.findAllMatches('**/+GeomNode')
+    return {
+        'noeuds': root.findAllMatches('**').getNumPaths(),
+        'geom_nodes': geom_nodes.getNumPaths(),
+        'geoms': sum(path.node().getNumGeoms() for path in geom_nodes),
+    }
+
+
+def frameTime(base, frames):
+    """Temps moyen (ms) d'une frame rendue hors écran, None sans tampon graphique."""
+    if base.win is None:
+        return None
+    base.graphicsEngine.renderFrame() # première frame : préparation des Geoms
+    start = time.perf_counter()
+    for _ in range(frames):
+        base.graphicsEngine.renderFrame()
+    return (time.perf_counter() - start) / frames * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--frames", type=int, default=30)
+    args = parser.parse_args()
+
+    base = common.startBase("offscreen")
+
+    print(f"{'mode':>7} {'noeuds':>8} {'geom_nodes':>11} {'geoms':>7} {'génération (s)':>15} {'frame (ms)':>11}")
+    for mode in ("blocks", "chunks"):
+        random.seed(args.seed) # même seed de terrain pour les deux modes
+        start = time.perf_counter()
+        terrain = common.makeTerrain(base, mode=mode)
+        build_time = time.perf_counter() - start
+        stats = sceneStats(terrain.terrain_node)
+        frame = frameTime(base, args.frames)
+        frame = "-" if frame is None else f"{frame:.2f}"
+        print(f"{mode:>7} {stats['noeuds']:>8} {stats['geom_nodes']:>11} {stats['geoms']:>7} {build_time:>15.3f} {frame:>11}")
+        terrain.unloadTerrain()
+
+
+if __name__ == "__main__":
+    main()
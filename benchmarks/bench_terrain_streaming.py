@@ -0,0 +1,64 @@
+"""Benchmark : temps de frame du monde infini pendant que le joueur sprinte à travers les chunks.
+Compare la génération dans la boucle de rendu (worker_mode None) avec les workers thread et process.
+Chaque frame est cadencée à FPS comme dans le jeu, pour laisser travailler les workers.
+
+    python benchmarks/bench_terrain_streaming.py [--frames 600] [--speed 20] [--modes none thread process]
+"""
+#librairies
+import argparse
+import random
+import time
+import numpy as np
+
+import common # racine du dépôt et Panda3D, avant les modules du jeu
+
+FPS = 30
+
+
+def sprint(base, mode, frames, speed):
+    """Fait courir le joueur en diagonale et mesure chaque frame : update du terrain (thread principal) et frame complète avec rendu."""
+    random.seed(42)
+    terrain = common.makeTerrain(base, streaming=True)
+    terrain.worker_mode = mode
+    updates = []
+    frames_times = []
+    missing = 0 # frames où le chunk du joueur n'était pas encore chargé
+    x, y = 0.0, 0.0
+    for _ in range(frames):
+        start = time.perf_counter()
+        terrain.update(x, y)
+        updates.append(time.perf_counter() - start)
+        if base.win is not None:
+            base.graphicsEngine.renderFrame()
+        elapsed = time.perf_counter() - start
+        frames_times.append(elapsed)
+        if terrain.chunkAt(x, y) not in terrain.chunk_surfaces:
+            missing += 1
+        x += speed / FPS * 0.8
+        y += speed / FPS * 0.6
+        time.sleep(max(0.0, 1 / FPS - elapsed)) # cadence du jeu
+    forced = terrain.ground_loads
+    terrain.unloadTerrain()
+    # la première seconde (chargement initial) est ignorée
+    return np.array(updates[FPS:]) * 1000, np.array(frames_times[FPS:]) * 1000, missing, forced
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--speed", type=float, default=20.0, help="vitesse du joueur (sprint = 20)")
+    parser.add_argument("--modes", nargs="+", default=["none", "thread", "process"])
+    args = parser.parse_args()
+
+    base = common.startBase("offscreen") # sans contexte graphique : update du terrain seulement
+
+    print("temps en ms ; update = Terrain.update sur le thread principal, frame = update + rendu")
+    print(f"{'workers':>8} {'update moy':>11} {'update p99':>11} {'update pire':>12} {'frame p99':>10} {'frame pire':>11} {'frames sans sol':>16} {'chunks forcés':>14}")
+    for mode in args.modes:
+        updates, frames, missing, forced = sprint(base, None if mode == "none" else mode, args.frames, args.speed)
+        print(f"{mode:>8} {updates.mean():>11.2f} {np.percentile(updates, 99):>11.2f} {updates.max():>12.2f} "
+              f"{np.percentile(frames, 99):>10.2f} {frames.max():>11.2f} {missing:>16} {forced:>14}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Démarrage commun des benchmarks : chemins, configuration de Panda3D et partie réduite.
+À importer avant les modules du jeu : ajoute la racine du dépôt au chemin des modules et s'y place
+(modèles, shaders et caches sont chargés depuis la racine, comme avec main.py).
+
+    import common
+    base = common.startBase()
+    terrain = common.makeTerrain(base)
+    game = common.makeGame(base, terrain, player=(x, y))
+"""
+#librairies
+import os
+import sys
+from types import SimpleNamespace
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT) # modules du jeu à la racine
+os.chdir(ROOT) # modèles, shaders et caches chargés depuis la racine
+# Panda3D et les modules du jeu ne sont importés qu'à l'appel des fonctions : bench_startup mesure aussi leur import
+
+
+def configure(window="none"):
+    """Configuration de Panda3D, à appeler avant de créer la ShowBase.
+    Args:
+        window (str): type de fenêtre ('none' sans contexte graphique, 'offscreen' pour mesurer le rendu)
+    Returns:
+        None
+    """
+    from panda3d.core import loadPrcFileData
+    loadPrcFileData("", f"model-path {ROOT}") # comme $MAIN_DIR quand le jeu est lancé par main.py
+    loadPrcFileData("", f"window-type {window}\naudio-library-name null")
+    if window != "none":
+        loadPrcFileData("", "sync-video false") # frames non limitées par l'écran
+
+
+def startBase(window="none"):
+    """ShowBase avec les modèles partagés chargés, comme le menu du jeu.
+    Sans contexte graphique, une base 'offscreen' est recréée sans fenêtre (base.win vaut alors None).
+    Args:
+        window (str): type de fenêtre, voir configure
+    Returns:
+        ShowBase: base avec son AssetManager (base.assets)
+    """
+    configure(window)
+    from direct.showbase.ShowBase import ShowBase
+    import AssetManager
+    try:
+        base = ShowBase()
+    except Exception:
+        if window == "none":
+            raise
+        configure("none") # pas de contexte graphique : statistiques seulement
+        base = ShowBase()
+    base.assets = AssetManager.AssetManager(base.loader)
+    return base
+
+
+def makeTerrain(base, **options):
+    """Terrain du jeu, hors partie.
+    Args:
+        base (ShowBase): base créée par startBase
+        options: arguments de Terrain.Terrain (seed, mode, streaming...)
+    Returns:
+        Terrain: terrain généré
+    """
+    from panda3d.core import BitMask32
+    import Terrain
+    return Terrain.Terrain(SimpleNamespace(screen=base, worldMask=BitMask32.bit(1)),
+                           {'grassBlock': base.assets.get('grassBlock')}, **options)
+
+
+def makeGame(base, terrain=None, player=None, flowField=None, renderer=None, archetypes=None, **horde):
+    """Partie réduite à ce qu'utilisent les monstres : horde, pool, combat, HUD et grille de voisinage.
+    Args:
+        base (ShowBase): base créée par startBase
+        terrain (Terrain): terrain de la partie (optionnel)
+        player (tuple): position (x, y) du joueur, posé 3 unités au-dessus du terrain ; None pour une partie sans joueur
+        flowField (FlowField): champ de chemins vers le joueur (optionnel)
+        renderer: MonsterRenderer, ou un objet quelconque pour des monstres à noeud nu ; None pour les modèles complets
+        archetypes (Registry): types de monstres, ceux du jeu par défaut
+        horde: arguments de MonsterHorde.MonsterHorde (separation, tiers...)
+    Returns:
+        SimpleNamespace: partie réduite
+    """
+    from panda3d.core import BitMask32
+    import Archetypes
+    import Combat
+    import HUD
+    import MonsterHorde
+    import MonsterPool
+    import SpatialHash
+    game = SimpleNamespace(screen=base, assets=base.assets, worldMask=BitMask32.bit(1), terrain=terrain, monsters=[],
+                           monsterRenderer=renderer, monsterGrid=SpatialHash.SpatialHash(), flowField=flowField,
+                           GameManager=SimpleNamespace(score=0), player=None)
+    game.archetypes = archetypes if archetypes is not None else Archetypes.Registry() # types de monstres du jeu
+    game.horde = MonsterHorde.MonsterHorde(game, **horde)
+    game.combat = Combat.Combat(game)
+    game.hud = HUD.HUD(base)
+    game.monsterPool = MonsterPool.MonsterPool(game)
+    if player is not None:
+        x, y = player
+        game.player = SimpleNamespace(position=[x, y, terrain.getSurfaceLevel(x, y) + 3], health=10 ** 9) # immortel
+    return game
@@ -0,0 +1,256 @@
+"""Suite de benchmarks sans fenêtre, résultats en JSON pour suivre les performances d'un commit à l'autre.
+"run" mesure le code actuel (médiane de --repeat mesures) : génération du terrain, requêtes getSurfaceLevel,
+physique du joueur (PlayerPhysics), mise à jour des monstres pour plusieurs tailles de horde, apparition des
+monstres sur --waves vagues et pas complet de la partie. "compare" échoue (code de sortie 1) si une mesure se dégrade
+de plus de --threshold % ou si une mesure de la référence est absente. Les autres scripts de benchmarks/ comparent deux implémentations entre elles.
+
+    python benchmarks/suite.py run [--output resultats.json] [--counts 50 200 500] [--repeat 5] [--waves 5]
+    python benchmarks/suite.py compare reference.json resultats.json [--threshold 10]
+"""
+#librairies
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime
+import numpy as np
+
+import common
+from common import ROOT # racine du dépôt, avant les modules du jeu
+
+
+def median(function, repeat):
+    """Médiane de repeat appels chronométrés (s)."""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    return float(np.median(durations))
+
+
+def machine():
+    """Machine, versions et commit mesurés."""
+    from panda3d.core import PandaSystem
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = None
+    return {'platform': platform.platform(), 'processor': platform.processor() or platform.machine(),
+            'cpus': os.cpu_count(), 'python': platform.python_version(), 'panda3d': PandaSystem.getVersionString(),
+            'numpy': np.__version__, 'commit': commit or None}
+
+
+class Suite():
+    """Mesures de la suite, sur une seule partie sans fenêtre (Headless)."""
+    def __init__(self, repeat, seed):
+        """Initialisation de la partie mesurée.
+        Args:
+            repeat (int): nombre de mesures par métrique (la médiane est gardée)
+            seed (int): seed de la partie
+        Returns:
+            None
+        """
+        common.configure()
+        import Headless
+        import Game
+        self.base = Headless.HeadlessGame()
+        self.game = Game.MyGame(self.base, seed)
+        self.repeat = repeat # mesures par métrique
+        self.rng = random.Random(seed) # positions des monstres
+        self.metrics = {} # résultats, par nom
+
+    def record(self, name, value, unit, better="lower"):
+        """Ajoute une métrique aux résultats et l'affiche."""
+        self.metrics[name] = {'value': value, 'unit': unit, 'better': better}
+        print(f"{name:<32} {value:>14.4f} {unit}")
+
+    def terrain(self):
+        """Génération complète d'un terrain (bruit, maillages, collisions) sans le cache disque, puis requêtes de surface."""
+        terrain = common.makeTerrain(self.base, seed=self.game.terrain.seed)
+        terrain.cache = None
+
+        def generate():
+            terrain.unloadTerrain()
+            terrain.generateTerrain()
+        self.record('terrain.generate', median(generate, self.repeat) * 1000, 'ms')
+
+        size = terrain.terrain_width * terrain.block_size
+        xs = np.random.default_rng(0).uniform(0, size, 10000)
+        ys = np.random.default_rng(1).uniform(0, size, 10000)
+        points = list(zip(xs.tolist(), ys.tolist()))
+
+        def single():
+            for x, y in points:
+                terrain.getSurfaceLevel(x, y)
+        self.record('surface.getSurfaceLevel', len(points) / median(single, self.repeat), 'requêtes/s', "higher")
+        self.record('surface.getSurfaceLevels', len(points) / median(lambda: terrain.getSurfaceLevels(xs, ys), self.repeat),
+                    'requêtes/s', "higher")
+        terrain.unloadTerrain()
+
+    def spawn(self, count):
+        """Fait apparaître count monstres au hasard sur le terrain."""
+        game = self.game
+        size = game.terrain.terrain_width * game.terrain.block_size
+        for _ in range(count):
+            x, y = self.rng.uniform(0, size), self.rng.uniform(0, size)
+            game.monsters.append(game.monsterPool.acquire("normal", [x, y, game.terrain.getSurfaceLevel(x, y) + 2]))
+
+    def clear(self):
+        """Retire tous les monstres de la partie."""
+        for monster in list(self.game.monsters):
+            monster.unloadMonster()
+
+    def player(self, steps=3000, height=3.5):
+        """Physique du joueur (PlayerPhysics.move puis floorUnder) par pas, en marchant au hasard sur le terrain.
+        Avec la physique par défaut (Game.ANALYTIC_PLAYER_PHYSICS) cTrav n'a aucun collider : c'est tout le coût
+        des collisions du joueur."""
+        import PlayerPhysics
+        physics = PlayerPhysics.PlayerPhysics(self.game.terrain)
+        size = self.game.terrain.terrain_width * self.game.terrain.block_size
+        headings = np.random.default_rng(0).uniform(0, 2 * np.pi, steps)
+        moves = list(zip((np.cos(headings) * 10 / 30).tolist(), (np.sin(headings) * 10 / 30).tolist())) # vitesse du joueur, un pas
+
+        def walk():
+            x = y = size / 2
+            z = physics.floorUnder(x, y, 10 ** 6) + height
+            for dx, dy in moves:
+                x, y = physics.move(x, y, dx, dy, z - physics.radius)
+                floor = physics.floorUnder(x, y, z + height)
+                z = (floor if floor is not None else 0) + height # toujours au sol (pas de gravité ici)
+        self.record('player.physics', median(walk, self.repeat) / steps * 1000, 'ms')
+
+    def monsters(self, counts, frames=30):
+        """Mise à jour de la horde pour chaque taille de horde."""
+        game = self.game
+        game.player.health = 10 ** 9 # le joueur survit à toutes les hordes
+        for count in counts:
+            self.spawn(count)
+
+            def update():
+                for _ in range(frames):
+                    game.horde.update(1 / 30)
+            self.record(f'monsters.update@{count}', median(update, self.repeat) / frames * 1000, 'ms')
+            game.horde.syncNodes()
+            self.clear()
+
+    def waves(self, waves):
+        """Apparition des monstres sur plusieurs vagues (GameManagement), les monstres meurent dès que la vague est complète."""
+        import GameManager
+        game = self.game
+        spawns = [] # durée des mises à jour qui ont fait apparaître un monstre
+
+        def play():
+            manager = game.GameManager = GameManager.GameManagement(game)
+            started = 0
+            while started <= waves:
+                vague, alive = manager.vague, len(game.monsters)
+                start = time.perf_counter()
+                manager.update(0.1)
+                game.combat.flush() # le monstre apparu rejoint game.monsters à la fin du pas
+                duration = time.perf_counter() - start
+                if manager.vague != vague: # nouvelle vague (monstres de la vague préparés dans le pool)
+                    started += 1
+                elif len(game.monsters) > alive:
+                    spawns.append(duration)
+                if game.monsters and (manager.enemyVague == 0 or len(game.monsters) >= manager.maxMonsters):
+                    self.clear()
+            self.clear()
+        self.record(f'waves.total@{waves}', median(play, self.repeat) * 1000, 'ms')
+        if spawns: # aucune apparition mesurée avec --waves 0 : pas de médiane
+            self.record('waves.spawn', float(np.median(spawns)) * 1000, 'ms')
+
+    def ticks(self, count, ticks=150):
+        """Pas complet de la partie (terrain, collisions, joueur, vagues, monstres, affichage)."""
+        game = self.game
+        self.spawn(count)
+        while game.gametime <= 3: # les monstres ne bougent qu'après 3 s de jeu
+            game.step(game.clock.step)
+
+        def play():
+            for _ in range(ticks):
+                game.step(game.clock.step)
+        self.record(f'game.tick@{count}', median(play, self.repeat) / ticks * 1000, 'ms')
+        self.clear()
+
+
+def run(args):
+    """Mesure toutes les métriques et écrit le fichier de résultats."""
+    suite = Suite(args.repeat, args.seed)
+    suite.terrain()
+    suite.player()
+    suite.monsters(args.counts)
+    suite.waves(args.waves)
+    suite.ticks(args.counts[len(args.counts) // 2])
+    results = {'date': datetime.now().isoformat(timespec='seconds'), 'machine': machine(),
+               'settings': {'repeat': args.repeat, 'seed': args.seed, 'counts': args.counts, 'waves': args.waves},
+               'metrics': suite.metrics}
+    with open(args.output, 'w') as file:
+        json.dump(results, file, indent=2)
+    print(f"résultats écrits dans {args.output}")
+
+
+def compare(args):
+    """Compare deux fichiers de résultats, renvoie le code de sortie (1 si une mesure se dégrade au-delà du seuil
+    ou si une mesure de la référence manque dans les résultats)."""
+    with open(args.reference) as file:
+        reference = json.load(file)
+    with open(args.results) as file:
+        results = json.load(file)
+    machines = [{key: value for key, value in data['machine'].items() if key != 'commit'} for data in (reference, results)]
+    if machines[0] != machines[1]:
+        print("attention : machines ou versions différentes, les écarts ne viennent peut-être pas du code")
+    print(f"{'métrique':<32} {'référence':>12} {'mesure':>12} {'écart':>8}  ")
+    regressions = 0
+    for name, metric in results['metrics'].items():
+        if name not in reference['metrics']:
+            print(f"{name:<32} {'-':>12} {metric['value']:>12.4f} {'nouveau':>8}")
+            continue
+        before = reference['metrics'][name]['value']
+        if not np.isfinite(before) or not np.isfinite(metric['value']): # ancien fichier avec une mesure vide (NaN)
+            print(f"{name:<32} {before:>12.4f} {metric['value']:>12.4f} {'ignoré':>8}")
+            continue
+        change = (metric['value'] - before) / before * 100 if before else 0 # en %, positif = valeur plus grande
+        worse = change if metric['better'] == "lower" else -change # en %, positif = plus lent
+        status = ""
+        if worse > args.threshold:
+            status = "RÉGRESSION"
+            regressions += 1
+        elif worse < -args.threshold:
+            status = "amélioration"
+        print(f"{name:<32} {before:>12.4f} {metric['value']:>12.4f} {change:>+7.1f}%  {status}")
+    missing = 0
+    for name, metric in reference['metrics'].items():
+        if name not in results['metrics']: # mesure disparue (benchmark cassé, taille de horde retirée...)
+            print(f"{name:<32} {metric['value']:>12.4f} {'-':>12} {'absent':>8}")
+            missing += 1
+    print(f"{regressions} régression(s) au-delà de {args.threshold:g} %, {missing} mesure(s) absente(s)")
+    return 1 if regressions or missing else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="mesurer le code actuel")
+    run_parser.add_argument("--output", default="benchmarks/resultats.json")
+    run_parser.add_argument("--counts", type=int, nargs="+", default=[50, 200, 500])
+    run_parser.add_argument("--repeat", type=int, default=5)
+    run_parser.add_argument("--waves", type=int, default=5)
+    run_parser.add_argument("--seed", type=int, default=42)
+    compare_parser = commands.add_parser("compare", help="comparer deux fichiers de résultats")
+    compare_parser.add_argument("reference")
+    compare_parser.add_argument("results")
+    compare_parser.add_argument("--threshold", type=float, default=10, help="dégradation tolérée (%%)")
+    args = parser.parse_args()
+    if args.command == "run":
+        run(args)
+    else:
+        sys.exit(compare(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,10 @@
+import sys
 import Menu
 
 if __name__ == "__main__":
-    menu = Menu.Menu()
-    menu.run()
\ No newline at end of file
+    if "--headless" in sys.argv: # partie sans fenêtre pour les tests de charge (voir Headless.py)
+        import Headless
+        Headless.main()
+    else:
+        menu = Menu.Menu()
+        menu.run()
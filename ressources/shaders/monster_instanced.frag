@@ -0,0 +1,31 @@
+#version 140
+
+// Éclairage du jeu (lumière ambiante + lumières directionnelles) sur la couleur du matériau.
+
+uniform struct {
+    vec4 ambient;
+} p3d_LightModel;
+
+uniform struct {
+    vec4 baseColor;
+} p3d_Material;
+
+uniform struct {
+    vec4 color;
+    vec4 position;
+} p3d_LightSource[2];
+
+uniform vec4 p3d_ColorScale;
+
+in vec3 normal_view;
+
+out vec4 p3d_FragColor;
+
+void main() {
+    vec3 normal = normalize(normal_view);
+    vec3 light = p3d_LightModel.ambient.rgb;
+    for (int i = 0; i < 2; ++i) {
+        light += p3d_LightSource[i].color.rgb * max(dot(normal, p3d_LightSource[i].position.xyz), 0.0);
+    }
+    p3d_FragColor = vec4(p3d_Material.baseColor.rgb * light, p3d_Material.baseColor.a) * p3d_ColorScale;
+}
@@ -0,0 +1,30 @@
+#version 140
+
+// Monstres dessinés en instances : une transformation (x, y, z, heading) par instance
+// lue dans un buffer texture, appliquée après la transformation animée du modèle partagé.
+
+uniform mat4 p3d_ModelMatrix;
+uniform mat4 p3d_ModelMatrixInverseTranspose;
+uniform mat4 p3d_ViewMatrix;
+uniform mat4 p3d_ViewProjectionMatrix;
+uniform samplerBuffer instances;
+
+in vec4 p3d_Vertex;
+in vec3 p3d_Normal;
+
+out vec3 normal_view;
+
+void main() {
+    vec4 instance = texelFetch(instances, gl_InstanceID);
+    float heading = radians(instance.w);
+    mat3 rotation = mat3(cos(heading), sin(heading), 0.0,
+                         -sin(heading), cos(heading), 0.0,
+                         0.0, 0.0, 1.0); // comme NodePath.setH
+
+    vec4 world = p3d_ModelMatrix * p3d_Vertex;
+    world.xyz = rotation * world.xyz + instance.xyz;
+    gl_Position = p3d_ViewProjectionMatrix * world;
+
+    vec3 normal = rotation * (mat3(p3d_ModelMatrixInverseTranspose) * p3d_Normal);
+    normal_view = mat3(p3d_ViewMatrix) * normal;
+}